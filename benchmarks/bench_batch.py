@@ -0,0 +1,55 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.catalog_factory import write_csv_catalog, write_json_catalog
+from movie.data import movie_storage
+from movie.utility import constant, data_util
+
+"""
+Compares N single rating updates with one `update_movies` batch.
+
+Every single update rewrites the catalog, while the batch stages all N
+updates and writes once, so its cost should stay close to that of one
+single update.
+
+Usage:
+    python -m benchmarks.bench_batch
+    python -m benchmarks.bench_batch --rows 100000 --updates 100
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--updates", type=int, default=50)
+    arguments = parser.parse_args()
+
+    print(f"{'format':<6} {'single x N':>11} {'batch':>9} {'one write':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, writer in (("csv", write_csv_catalog),
+                             ("json", write_json_catalog)):
+            file_path = writer(Path(directory) / f"bench.{name}",
+                               arguments.rows)
+            titles = list(data_util.fetch_data(file_path)[constant.PAYLOAD])[
+                     :arguments.updates]
+
+            start = time.perf_counter()
+            for title in titles:
+                movie_storage.update_movie(title, "1.0", file_path)
+            single = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = movie_storage.update_movies(
+                {title: "2.0" for title in titles}, file_path)
+            batch = time.perf_counter() - start
+            assert result[constant.RESULT], result[constant.MESSAGE]
+
+            print(f"{name:<6} {single:>10.3f}s {batch:>8.3f}s "
+                  f"{single / len(titles):>9.3f}s")
+            data_util.cached_data.pop(file_path, None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.catalog_factory import build_catalog
+from movie.utility import constant, data_util
+
+"""
+Measures what compressing a catalog costs and saves: file size, write time
+and parse time of CSV and JSON catalogs, uncompressed and with gzip, LZMA
+and bzip2 at the given compression levels.
+
+The parse time is that of `load_data`, without the snapshot sidecar, and
+includes decompression; the bytes read from disk shrink by the ratio.
+
+Usage:
+    python -m benchmarks.bench_compression
+    python -m benchmarks.bench_compression --rows 500000 --levels 1 6 9
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 6])
+    arguments = parser.parse_args()
+
+    catalog = build_catalog(arguments.rows)
+    print(f"{'file':<16} {'level':>5} {'size':>9} {'ratio':>6} "
+          f"{'write':>8} {'load':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("data.csv", "data.json"):
+            plain_size = None
+            for suffix, levels in (("", [None]),
+                                   (".gz", arguments.levels),
+                                   (".xz", arguments.levels),
+                                   (".bz2", arguments.levels)):
+                for level in levels:
+                    if level is not None:
+                        constant.COMPRESSION_LEVEL = level
+                    file_path = Path(directory) / (name + suffix)
+
+                    start = time.perf_counter()
+                    result = data_util.write_data(catalog, file_path)
+                    write = time.perf_counter() - start
+                    assert result[constant.RESULT], result[constant.MESSAGE]
+
+                    start = time.perf_counter()
+                    result = data_util.load_data(file_path)
+                    load = time.perf_counter() - start
+                    assert len(result[constant.PAYLOAD]) == arguments.rows
+
+                    size = file_path.stat().st_size
+                    plain_size = plain_size or size
+                    print(f"{file_path.name:<16} "
+                          f"{'-' if level is None else level:>5} "
+                          f"{size / 1e6:>7.1f}MB {plain_size / size:>5.1f}x "
+                          f"{write:>7.2f}s {load:>7.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.catalog_factory import write_csv_catalog
+from movie.data import movie_storage
+from movie.utility import constant, data_util
+
+"""
+Measures the latency of adding a movie to CSV catalogs of growing size.
+
+"rewrite" adds the movie with appends disabled, i.e. with a full rewrite
+of the file as every add did before; "append" is the append-only fast
+path of `movie_storage.add_movie`. Both include the fsync of the write.
+
+Usage:
+    python -m benchmarks.bench_csv_append
+    python -m benchmarks.bench_csv_append --rows 10000 100000 --adds 50
+"""
+
+
+def add_rewrite(file_path: Path, title: str) -> None:
+    encode_appends = data_util.encode_appends
+    data_util.encode_appends = lambda overlay, path: None
+    try:
+        add_append(file_path, title)
+    finally:
+        data_util.encode_appends = encode_appends
+
+
+def add_append(file_path: Path, title: str) -> None:
+    result = movie_storage.add_movie(title, "2024", "7.0", "", "", "",
+                                     file_path)
+    assert result[constant.RESULT], result[constant.MESSAGE]
+
+
+def median_latency(function, file_path: Path, adds: int) -> float:
+    data_util.fetch_data(file_path)
+    timings = []
+    for index in range(adds):
+        start = time.perf_counter()
+        function(file_path, f"{function.__name__} {index}")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+",
+                        default=[1_000, 10_000, 100_000])
+    parser.add_argument("--adds", type=int, default=20)
+    arguments = parser.parse_args()
+
+    print(f"{'rows':>9} {'rewrite':>10} {'append':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in arguments.rows:
+            file_path = write_csv_catalog(Path(directory) / "bench.csv", rows)
+            rewrite = median_latency(add_rewrite, file_path, arguments.adds)
+            append = median_latency(add_append, file_path, arguments.adds)
+            print(f"{rows:>9} {rewrite * 1000:>8.2f}ms "
+                  f"{append * 1000:>8.2f}ms {rewrite / append:>7.1f}x")
+            data_util.cached_data.pop(file_path, None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import csv
+import io
+import time
+
+from benchmarks.catalog_factory import build_catalog
+from movie.utility import constant, data_util
+
+"""
+Microbenchmark of CSV row decoding, in rows per second.
+
+"before" is the previous decoder (`csv.DictReader`, `build_dict` and a
+`payload.update` per row), "after" is `data_util.decode_csv_rows`. Both
+decode the same in-memory CSV text, so no file I/O is measured.
+
+Usage:
+    python -m benchmarks.bench_csv_decode --rows 200000
+"""
+
+
+def build_csv_text(rows: int) -> str:
+    handle = io.StringIO(newline='')
+    csv_writer = csv.writer(handle)
+    csv_writer.writerow([constant.TITLE_KEY, constant.RATING_KEY,
+                         constant.YEAR_KEY, constant.POSTER_KEY,
+                         constant.NOTES_KEY, constant.IMDBID_KEY])
+    for title, value in build_catalog(rows).items():
+        csv_writer.writerow([title, value[constant.RATING_KEY],
+                             value[constant.YEAR_KEY],
+                             value[constant.POSTER_KEY],
+                             value[constant.NOTES_KEY],
+                             value[constant.IMDBID_KEY]])
+    return handle.getvalue()
+
+
+def decode_before(text: str) -> dict:
+    payload = {}
+    for row in csv.DictReader(io.StringIO(text, newline='')):
+        payload.update(data_util.build_dict(row[constant.TITLE_KEY],
+                                            row[constant.YEAR_KEY],
+                                            row[constant.RATING_KEY],
+                                            row[constant.POSTER_KEY]))
+    return payload
+
+
+def decode_after(text: str) -> dict:
+    csv_reader = csv.reader(io.StringIO(text, newline=''))
+    return data_util.decode_csv_rows(next(csv_reader), csv_reader, {})
+
+
+def best_of(function, text: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+
+    text = build_csv_text(arguments.rows)
+    before = best_of(decode_before, text, arguments.repeat)
+    after = best_of(decode_after, text, arguments.repeat)
+
+    print(f"before  {arguments.rows / before:>12,.0f} rows/s")
+    print(f"after   {arguments.rows / after:>12,.0f} rows/s "
+          f"({before / after:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.catalog_factory import build_catalog, write_csv_catalog
+from movie.utility import constant, data_util, index_util
+
+"""
+Measures a cold point lookup through the title index against loading the
+whole catalog, for CSV and JSON Lines catalogs.
+
+"build" is the one-off cost of indexing the catalog from scratch, "lookup"
+a lookup with an up-to-date index, "load" a full parse of the catalog.
+
+Usage:
+    python -m benchmarks.bench_index
+    python -m benchmarks.bench_index --rows 100000 1000000
+"""
+
+
+def timed(function, *arguments) -> float:
+    start = time.perf_counter()
+    function(*arguments)
+    return time.perf_counter() - start
+
+
+def write_jsonl_catalog(file_path: Path, rows: int) -> Path:
+    result = data_util.write_data(build_catalog(rows), file_path)
+    assert result[constant.RESULT], result[constant.MESSAGE]
+    return file_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+",
+                        default=[100_000, 1_000_000])
+    arguments = parser.parse_args()
+
+    print(f"{'format':<6} {'rows':>9} {'build':>9} {'lookup':>10} "
+          f"{'load':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in arguments.rows:
+            for name, writer in (("csv", write_csv_catalog),
+                                 ("jsonl", write_jsonl_catalog)):
+                file_path = writer(Path(directory) / f"bench.{name}", rows)
+                title = next(reversed(build_catalog(1)))
+                build = timed(index_util.refresh_index, file_path)
+                lookup = timed(index_util.find_title, file_path, title)
+                load = timed(data_util.load_data, file_path)
+                print(f"{name:<6} {rows:>9} {build:>8.3f}s "
+                      f"{lookup * 1000:>8.3f}ms {load:>8.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import random
+import time
+
+from benchmarks.catalog_factory import build_catalog
+from movie.utility.neighbor_util import NeighborIndex, distance, \
+    get_features, similar_movies
+from movie.utility.snapshot_util import CatalogSnapshot
+
+"""
+Compares similar movie lookups through the k-d tree with a brute-force scan
+that measures the distance to every movie.
+
+k-NN and radius queries are timed for random movies of a synthetic catalog,
+along with the tree build.
+
+Usage:
+    python -m benchmarks.bench_neighbors
+    python -m benchmarks.bench_neighbors --rows 500000 --k 20 --radius 0.2
+"""
+
+
+def brute_force(catalog: dict, title: str, count: int = None,
+                radius: float = None) -> list:
+    target = get_features(catalog[title])
+    found = sorted((distance(target, get_features(entry)), other)
+                   for other, entry in catalog.items() if other != title)
+    if radius is not None:
+        found = [pair for pair in found if pair[0] <= radius]
+    return found[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--radius", type=float, default=0.1)
+    arguments = parser.parse_args()
+
+    catalog = build_catalog(arguments.rows)
+    snapshot = CatalogSnapshot(catalog, 1)
+    titles = random.Random(1).sample(list(catalog), arguments.queries)
+    brute_titles = titles[:5]
+
+    start = time.perf_counter()
+    snapshot.derive("neighbors", NeighborIndex)
+    build = time.perf_counter() - start
+
+    print(f"{'query':<7} {'k-d tree':>10} {'brute force':>12} {'speed-up':>9}")
+    for name, options in (("k-NN", {"count": arguments.k}),
+                          ("radius", {"radius": arguments.radius})):
+        start = time.perf_counter()
+        for title in titles:
+            similar_movies(snapshot, title, **options)
+        tree = (time.perf_counter() - start) / len(titles)
+
+        start = time.perf_counter()
+        for title in brute_titles:
+            brute_force(catalog, title, **options)
+        scan = (time.perf_counter() - start) / len(brute_titles)
+
+        print(f"{name:<7} {tree * 1000:>8.3f}ms {scan * 1000:>10.1f}ms "
+              f"{scan / tree:>8.0f}x")
+    print(f"tree build: {build:.2f}s for {arguments.rows} movies")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.catalog_factory import write_csv_catalog
+from movie.utility import constant, data_util, parallel_util
+
+"""
+Compares the serial CSV loader against the multi-core chunked loader.
+
+Usage:
+    python -m benchmarks.bench_parallel_load
+    python -m benchmarks.bench_parallel_load --rows 2000000 --workers 2 4 8
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({2, os.cpu_count() or 1}))
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = write_csv_catalog(Path(directory) / "bench.csv",
+                                      arguments.rows)
+        size = file_path.stat().st_size / 1024 / 1024
+        print(f"{arguments.rows} rows, {size:.0f} MiB, "
+              f"{os.cpu_count()} CPUs")
+
+        constant.PARALLEL_LOAD_THRESHOLD = float("inf")
+        start = time.perf_counter()
+        serial = data_util.load_data(file_path)
+        serial_time = time.perf_counter() - start
+        print(f"serial      {serial_time:8.3f}s")
+
+        for workers in arguments.workers:
+            start = time.perf_counter()
+            parallel = parallel_util.load_csv_parallel(file_path, workers)
+            parallel_time = time.perf_counter() - start
+            assert parallel[constant.PAYLOAD] == serial[constant.PAYLOAD]
+            print(f"{workers:>2} workers  {parallel_time:8.3f}s "
+                  f"{serial_time / parallel_time:6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.catalog_factory import write_json_catalog
+from movie.movie_services import movie_service
+from movie.utility import constant, data_util
+
+"""
+Measures the query cache of the movie service: the search, sort and filter
+commands run once on a fresh catalog version (miss) and then repeated
+(hit).
+
+Usage:
+    python -m benchmarks.bench_query_cache
+    python -m benchmarks.bench_query_cache --rows 500000 --repeats 1000
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=200)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = write_json_catalog(Path(directory) / "bench.json",
+                                       arguments.rows)
+        data_util.fetch_data(file_path)
+        queries = [
+            ("search", lambda: movie_service.service_find_movie(
+                False, "movie 12", file_path)),
+            ("by rating", lambda: movie_service.service_list_movies(
+                constant.RATING_KEY, file_path)),
+            ("by year", lambda: movie_service.service_list_movies(
+                constant.YEAR_KEY, file_path)),
+            ("filter", lambda: movie_service.service_filter_movies(
+                8.0, 1990, 2000, file_path))]
+
+        print(f"{'query':<10} {'miss':>10} {'hit':>10}")
+        for name, query in queries:
+            start = time.perf_counter()
+            query()
+            miss = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(arguments.repeats):
+                query()
+            hit = (time.perf_counter() - start) / arguments.repeats
+
+            print(f"{name:<10} {miss * 1000:>8.1f}ms {hit * 1e6:>8.1f}us")
+        print(movie_service.query_cache.stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import random
+import time
+
+from benchmarks.catalog_factory import build_catalog
+from movie.utility import constant
+from movie.utility.search_util import search_movies, tokenize
+from movie.utility.snapshot_util import CatalogSnapshot
+
+"""
+Measures the ranked notes search: building the inverted index, carrying it
+over a write, and top-10 queries, before (cold) and after (warm) the
+scores of their words are cached, against a scan that tokenizes every
+note.
+
+Notes are drawn from a vocabulary with a skewed word frequency, so queries
+mix common and rare words.
+
+Usage:
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --rows 500000 --queries 200
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    arguments = parser.parse_args()
+
+    generator = random.Random(42)
+    words = [f"word{index}" for index in range(arguments.vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(arguments.vocabulary)]
+    catalog = build_catalog(arguments.rows)
+    for entry in catalog.values():
+        entry[constant.NOTES_KEY] = " ".join(
+            generator.choices(words, weights, k=generator.randint(0, 12)))
+    snapshot = CatalogSnapshot(catalog, 1)
+    queries = [" ".join(generator.choices(words, weights, k=2))
+               for _ in range(arguments.queries)]
+
+    start = time.perf_counter()
+    search_movies(snapshot, "", 10)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    evolved = snapshot.evolve({"Movie 0": {**catalog["Movie 0"],
+                                           constant.NOTES_KEY: "word1"}})
+    search_movies(evolved, "", 10)
+    evolve = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for query in queries:
+        search_movies(snapshot, query, 10)
+    cold = (time.perf_counter() - start) / len(queries)
+
+    start = time.perf_counter()
+    for query in queries:
+        search_movies(snapshot, query, 10)
+    warm = (time.perf_counter() - start) / len(queries)
+
+    start = time.perf_counter()
+    for query in queries[:5]:
+        wanted = set(tokenize(query))
+        [title for title, entry in catalog.items()
+         if wanted.intersection(tokenize(entry[constant.NOTES_KEY]))]
+    scan = (time.perf_counter() - start) / min(5, len(queries))
+
+    print(f"{'rows':>8} {'build':>9} {'evolve':>9} {'cold query':>11} "
+          f"{'warm query':>11} {'scan':>9}")
+    print(f"{arguments.rows:>8} {build * 1000:>7.0f}ms "
+          f"{evolve * 1000:>7.1f}ms {cold * 1000:>9.2f}ms "
+          f"{warm * 1000:>9.2f}ms {scan * 1000:>7.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
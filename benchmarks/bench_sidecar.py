@@ -0,0 +1,61 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.catalog_factory import write_csv_catalog, write_json_catalog
+from movie.utility import constant, data_util
+
+"""
+Measures cold (parse) against warm (snapshot sidecar) catalog loads, and
+the size of the sidecar, whose posters are dictionary-encoded, against
+that of the catalog.
+
+Usage:
+    python -m benchmarks.bench_sidecar
+    python -m benchmarks.bench_sidecar --rows 100000 1000000
+"""
+
+
+def load_cold(file_path: Path) -> float:
+    data_util.cached_data.pop(file_path, None)
+    data_util.get_sidecar_path(file_path).unlink(missing_ok=True)
+    start = time.perf_counter()
+    result = data_util.fetch_data(file_path)
+    assert result[constant.RESULT], result[constant.MESSAGE]
+    return time.perf_counter() - start
+
+
+def load_warm(file_path: Path) -> float:
+    data_util.cached_data.pop(file_path, None)
+    start = time.perf_counter()
+    result = data_util.fetch_data(file_path)
+    assert result[constant.RESULT], result[constant.MESSAGE]
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+",
+                        default=[100_000, 1_000_000])
+    arguments = parser.parse_args()
+
+    print(f"{'format':<6} {'rows':>9} {'parse':>9} {'sidecar':>9} "
+          f"{'speedup':>8} {'file':>9} {'sidecar':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in arguments.rows:
+            for name, writer in (("csv", write_csv_catalog),
+                                 ("json", write_json_catalog)):
+                file_path = writer(Path(directory) / f"bench.{name}", rows)
+                cold = load_cold(file_path)
+                warm = load_warm(file_path)
+                sidecar_path = data_util.get_sidecar_path(file_path)
+                print(f"{name:<6} {rows:>9} {cold:>8.3f}s {warm:>8.3f}s "
+                      f"{cold / warm:>7.1f}x "
+                      f"{file_path.stat().st_size / 1e6:>7.1f}MB "
+                      f"{sidecar_path.stat().st_size / 1e6:>7.1f}MB")
+                data_util.cached_data.pop(file_path, None)
+
+
+if __name__ == '__main__':
+    main()
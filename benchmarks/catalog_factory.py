@@ -0,0 +1,83 @@
+import csv
+import json
+import random
+from pathlib import Path
+
+from movie.utility import constant
+
+"""
+Generates synthetic movie catalogs for the benchmarks.
+
+The catalogs mimic what the application stores: OMDb poster URLs with the
+usual Amazon prefix and suffix, short notes and IMDb ids.
+"""
+
+POSTER_PREFIX = "https://m.media-amazon.com/images/M/"
+POSTER_SUFFIX = "._V1_SX300.jpg"
+
+
+def build_catalog(rows: int, seed: int = 42) -> dict:
+    """
+    Builds a catalog payload with `rows` movies.
+
+    Parameters:
+        rows (int): Number of movies.
+        seed (int): Seed of the random generator, for repeatable catalogs.
+
+    Returns:
+        dict: Mapping of movie titles to movie entries.
+    """
+    generator = random.Random(seed)
+    return {
+        f"Movie {index}": {
+            constant.RATING_KEY: round(generator.uniform(1, 10), 1),
+            constant.YEAR_KEY: generator.randint(1920, 2024),
+            constant.POSTER_KEY: f"{POSTER_PREFIX}MV5B{index:012d}"
+                                 f"XkEyXkFqcGc@{POSTER_SUFFIX}",
+            constant.NOTES_KEY: generator.choice(["", "watch again",
+                                                  "with friends",
+                                                  "classic"]),
+            constant.IMDBID_KEY: f"tt{index:07d}"}
+        for index in range(rows)}
+
+
+def write_csv_catalog(file_path: Path, rows: int) -> Path:
+    """
+    Writes a synthetic catalog in the CSV layout used by `write_data`.
+
+    Parameters:
+        file_path (Path): Where to write the catalog.
+        rows (int): Number of movies.
+
+    Returns:
+        Path: `file_path`.
+    """
+    with open(file_path, "w", newline="") as handle:
+        csv_writer = csv.writer(handle)
+        csv_writer.writerow([constant.TITLE_KEY, constant.RATING_KEY,
+                             constant.YEAR_KEY, constant.POSTER_KEY,
+                             constant.NOTES_KEY, constant.IMDBID_KEY])
+        for title, value in build_catalog(rows).items():
+            csv_writer.writerow([title,
+                                 value[constant.RATING_KEY],
+                                 value[constant.YEAR_KEY],
+                                 value[constant.POSTER_KEY],
+                                 value[constant.NOTES_KEY],
+                                 value[constant.IMDBID_KEY]])
+    return file_path
+
+
+def write_json_catalog(file_path: Path, rows: int) -> Path:
+    """
+    Writes a synthetic catalog in the JSON layout used by `write_data`.
+
+    Parameters:
+        file_path (Path): Where to write the catalog.
+        rows (int): Number of movies.
+
+    Returns:
+        Path: `file_path`.
+    """
+    with open(file_path, "w") as handle:
+        json.dump(build_catalog(rows), handle)
+    return file_path
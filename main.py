@@ -32,6 +32,7 @@ def main():
                 f"The file at {file_path} does not exist.")
         if arguments == 2:
             storage = StorageCsv(constant.PRODUCTION_FILE_PATH / sys.argv[1])
+            storage.prefetch()
             movie_app = MovieApp(storage)
             movie_app.run()
         else:
@@ -1,8 +1,19 @@
+import threading
+from contextlib import contextmanager
 from pathlib import WindowsPath
 
+from movie.utility import change_util
 from movie.utility import data_util
 from movie.utility import constant
+from movie.utility import index_util
+from movie.utility import lock_util
 from movie.utility import misc_util
+from movie.utility import neighbor_util
+from movie.utility import search_util
+from movie.utility import stats_util
+from movie.utility.snapshot_util import CatalogOverlay
+
+transactions = threading.local()
 
 
 def list_movies(file_path: WindowsPath) -> misc_util.result_message:
@@ -14,7 +25,119 @@ def list_movies(file_path: WindowsPath) -> misc_util.result_message:
 
     Return: A result_message object
     """
-    return data_util.fetch_data(file_path)
+    return fetch_movies(file_path)
+
+
+def find_movie(title: str, file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Looks up one movie by its title, compared in normalized form (see
+    `misc_util.normalize_title`).
+
+    If the catalog has not been loaded yet, the movie is looked up through
+    the title index of CSV and JSON Lines files instead, which only reads
+    the records the index points to.
+
+    Parameters:
+        title: Title of the movie.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object whose payload is the movie entry, or
+            None if there is no such movie.
+    """
+    overlay = get_transaction(file_path)
+    if overlay is not None:
+        return misc_util.result_message(True,
+                                        "File loaded successfully.",
+                                        overlay.get(overlay.resolve_title(
+                                            title)))
+
+    details = data_util.get_cached_data(file_path)
+
+    if details is None:
+        try:
+            movies = index_util.find_title(file_path, title)
+        except (OSError, ValueError):
+            movies = None
+        if movies is not None:
+            return misc_util.result_message(True,
+                                            "File loaded successfully.",
+                                            next(iter(movies.values()),
+                                                 None))
+        details = data_util.fetch_data(file_path)
+
+    if not details[constant.RESULT]:
+        return details
+    stored_title = details[constant.PAYLOAD].resolve_title(title)
+    return misc_util.result_message(True, details[constant.MESSAGE],
+                                    details[constant.PAYLOAD].get(
+                                        stored_title))
+
+
+def find_movie_by_imdbid(imdbid: str,
+                         file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Looks up one movie by its IMDb ID.
+
+    Like `find_movie`, the title index is used instead of loading the
+    catalog if it has not been loaded yet.
+
+    Parameters:
+        imdbid: IMDb ID of the movie.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object whose payload maps the title to the
+            movie entry, or is empty if there is no such movie.
+    """
+    overlay = get_transaction(file_path)
+    if overlay is not None:
+        title = overlay.find_imdbid(imdbid)
+        return misc_util.result_message(True,
+                                        "File loaded successfully.",
+                                        {title: overlay.get(title)}
+                                        if title is not None else {})
+
+    details = data_util.get_cached_data(file_path)
+
+    if details is None:
+        try:
+            movies = index_util.find_imdbid(file_path, imdbid)
+        except (OSError, ValueError):
+            movies = None
+        if movies is not None:
+            return misc_util.result_message(True,
+                                            "File loaded successfully.",
+                                            dict(list(movies.items())[:1]))
+        details = data_util.fetch_data(file_path)
+
+    if not details[constant.RESULT]:
+        return details
+    title = details[constant.PAYLOAD].find_imdbid(imdbid)
+    return misc_util.result_message(True, details[constant.MESSAGE],
+                                    {title: details[constant.PAYLOAD][title]}
+                                    if title is not None else {})
+
+
+def prefetch_movies(file_path: WindowsPath) -> None:
+    """
+    Starts loading the movies of the storage file in the background.
+
+    Parameter:
+        file_path: Path to the storage file where movie data is stored.
+    """
+    data_util.prefetch_data(file_path)
+
+
+def load_status(file_path: WindowsPath) -> dict:
+    """
+    Reports the progress and duration of loading the storage file.
+
+    Parameter:
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A dictionary with the load state, rows, characters read,
+            file size and duration.
+    """
+    return data_util.get_load_status(file_path)
 
 
 def add_movie(title: str, year: str, rating: str, poster: str,
@@ -34,15 +157,8 @@ def add_movie(title: str, year: str, rating: str, poster: str,
 
     Return: A result_message object
     """
-    details: misc_util.result_message = data_util.fetch_data(file_path)
-
-    details[constant.PAYLOAD][title] = data_util.build_to_add_dict(year,
-                                                                   rating,
-                                                                   poster,
-                                                                   notes,
-                                                                   imdbid)
-
-    return data_util.write_data(details[constant.PAYLOAD], file_path)
+    return apply_staged(file_path, lambda overlay: stage_add_movie(
+        overlay, title, year, rating, poster, notes, imdbid))
 
 
 def delete_movie(title: str,
@@ -56,10 +172,347 @@ def delete_movie(title: str,
 
     Return: A result_message object
     """
-    details: misc_util.result_message = data_util.fetch_data(file_path)
-    del details[constant.PAYLOAD][title.title()]
+    return apply_staged(file_path, lambda overlay: stage_delete_movie(
+        overlay, title))
+
+
+def add_movies(movies: list,
+               file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Adds several movies to the storage with a single write.
+
+    Every movie is validated and staged in turn, so a movie may not repeat
+    the title or IMDb ID of one added before it in the same batch. Invalid
+    movies are skipped; the others are written together.
+
+    Parameters:
+        movies: Dictionaries with the title, year, rating, poster, notes and
+                imdbid of each movie.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object whose payload holds one result_message
+            per movie, in order.
+    """
+    return apply_staged_batch(file_path, lambda overlay: [
+        stage_add_movie(overlay, movie[constant.TITLE_KEY],
+                        movie[constant.YEAR_KEY], movie[constant.RATING_KEY],
+                        movie.get(constant.POSTER_KEY, ""),
+                        movie.get(constant.NOTES_KEY, ""),
+                        movie.get(constant.IMDBID_KEY, ""))
+        for movie in movies])
+
+
+def delete_movies(titles: list,
+                  file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Deletes several movies from the storage with a single write.
+
+    Parameters:
+        titles: Titles of the movies to delete.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object whose payload holds one result_message
+            per title, in order.
+    """
+    return apply_staged_batch(file_path, lambda overlay: [
+        stage_delete_movie(overlay, title) for title in titles])
+
+
+def update_movies(ratings: dict,
+                  file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Updates the rating of several movies with a single write.
+
+    Parameters:
+        ratings: New ratings by movie title.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object whose payload holds one result_message
+            per movie, in order.
+    """
+    return apply_staged_batch(file_path, lambda overlay: [
+        stage_update_movie(overlay, title, rating)
+        for title, rating in ratings.items()])
+
+
+def stage_add_movie(overlay: CatalogOverlay, title: str, year: str,
+                    rating: str, poster: str, notes: str,
+                    imdbid: str) -> misc_util.result_message:
+    """
+    Validates a new movie and stages adding it.
+
+    Parameters:
+        overlay: The overlay to stage the change in.
+        title: Title of the movie.
+        year: Release year of the movie.
+        rating: Rating of the movie.
+        poster: URL to the movie poster.
+        notes: Additional notes about the movie.
+        imdbid: IMDb ID of the movie.
+
+    Return: A result_message object
+    """
+    # Movies are keyed by their normalized title and by IMDb ID.
+    duplicate = overlay.resolve_title(title)
+    if duplicate is None and imdbid:
+        duplicate = overlay.find_imdbid(imdbid)
+    if duplicate is not None:
+        return misc_util.result_message(False,
+                                        f"The movie {duplicate} is "
+                                        f"already in the catalog.",
+                                        title)
+
+    try:
+        entry = data_util.build_to_add_dict(year, rating, poster, notes,
+                                            imdbid)
+    except ValueError:
+        return misc_util.result_message(False,
+                                        f"The year or rating of the movie "
+                                        f"{title} is not valid.",
+                                        title)
+
+    overlay.put(title, entry)
+    return misc_util.result_message(True, f"The movie {title} was added.",
+                                    title)
+
+
+def stage_delete_movie(overlay: CatalogOverlay,
+                       title: str) -> misc_util.result_message:
+    """
+    Stages deleting a movie.
+
+    Parameters:
+        overlay: The overlay to stage the change in.
+        title: Title of the movie to delete.
+
+    Return: A result_message object
+    """
+    stored_title = overlay.resolve_title(title)
+    if stored_title is None:
+        return misc_util.result_message(False,
+                                        "Searching for "
+                                        "the movie returned no results.",
+                                        title)
+
+    overlay.remove(stored_title)
+    return misc_util.result_message(True,
+                                    f"The movie {stored_title} was deleted.",
+                                    stored_title)
+
+
+def stage_update_movie(overlay: CatalogOverlay, title: str,
+                       rating: str) -> misc_util.result_message:
+    """
+    Validates a new rating and stages updating the movie.
+
+    Parameters:
+        overlay: The overlay to stage the change in.
+        title: Title of the movie to update.
+        rating: New rating for the movie.
+
+    Return: A result_message object
+    """
+    stored_title = overlay.resolve_title(title)
+    if stored_title is None:
+        return misc_util.result_message(False,
+                                        "Searching for "
+                                        "the movie returned no results.",
+                                        title)
+
+    try:
+        rating = float(rating)
+    except ValueError:
+        return misc_util.result_message(False,
+                                        f"The rating of the movie "
+                                        f"{stored_title} is not valid.",
+                                        stored_title)
+
+    # Replace the entry instead of mutating it, it is shared with the
+    # snapshots readers may still hold.
+    overlay.put(stored_title, {**overlay.get(stored_title),
+                               constant.RATING_KEY: rating})
+    return misc_util.result_message(True,
+                                    f"The movie {stored_title} was updated.",
+                                    stored_title)
+
+
+def apply_staged(file_path: WindowsPath, stage) -> misc_util.result_message:
+    """
+    Stages a single change on the current catalog and writes it.
 
-    return data_util.write_data(details[constant.PAYLOAD], file_path)
+    Parameters:
+        file_path: Path to the storage file where movie data is stored.
+        stage: Function staging the change in the overlay it is passed and
+               returning its result_message.
+
+    Inside a transaction the change is only staged in the transaction.
+
+    Return: The result_message of the staged change if it failed or is part
+            of a transaction, the result_message of the write otherwise.
+    """
+    overlay = get_transaction(file_path)
+    if overlay is not None:
+        return stage(overlay)
+
+    with (lock_util.get_lock(file_path).write_locked(),
+          lock_util.file_locked(file_path)):
+        details = data_util.fetch_current(file_path)
+        if not details[constant.RESULT]:
+            return details
+
+        overlay = CatalogOverlay(details[constant.PAYLOAD])
+        result = stage(overlay)
+        if not result[constant.RESULT]:
+            return result
+        return commit_overlay(overlay, file_path)
+
+
+def apply_staged_batch(file_path: WindowsPath,
+                       stage) -> misc_util.result_message:
+    """
+    Stages a batch of changes on the current catalog and writes them once.
+
+    Parameters:
+        file_path: Path to the storage file where movie data is stored.
+        stage: Function staging the changes in the overlay it is passed and
+               returning a list with the result_message of each change.
+
+    Inside a transaction the changes are only staged in the transaction.
+
+    Return: A result_message object whose payload is the list of results.
+    """
+    overlay = get_transaction(file_path)
+    if overlay is not None:
+        results = stage(overlay)
+        staged = sum(1 for result in results if result[constant.RESULT])
+        return misc_util.result_message(True,
+                                        f"{staged} of {len(results)} "
+                                        f"changes have been staged.",
+                                        results)
+
+    with (lock_util.get_lock(file_path).write_locked(),
+          lock_util.file_locked(file_path)):
+        details = data_util.fetch_current(file_path)
+        if not details[constant.RESULT]:
+            return details
+
+        overlay = CatalogOverlay(details[constant.PAYLOAD])
+        results = stage(overlay)
+        written = commit_overlay(overlay, file_path)
+
+    if not written[constant.RESULT]:
+        return misc_util.result_message(False, written[constant.MESSAGE],
+                                        results)
+    applied = sum(1 for result in results if result[constant.RESULT])
+    return misc_util.result_message(True,
+                                    f"{applied} of {len(results)} changes "
+                                    f"have been applied.",
+                                    results)
+
+
+def get_transaction(file_path: WindowsPath):
+    """
+    Returns the transaction the current thread has open on a storage file.
+
+    Parameter:
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: The CatalogOverlay of the transaction, or None.
+    """
+    return getattr(transactions, "overlays", {}).get(file_path)
+
+
+@contextmanager
+def transaction(file_path: WindowsPath):
+    """
+    Context manager grouping changes into one atomic write.
+
+    While the transaction is open, the changes made by this thread are
+    staged in a `CatalogOverlay` on the current catalog instead of being
+    written, and this thread's reads see them. Neither opening nor
+    committing the transaction copies the catalog, unless the commit has
+    to rewrite the file (see `data_util.publish_data`). Leaving the block
+    normally commits all staged changes with a single write; leaving it
+    with an exception rolls them back, so the file, the cache and every
+    other reader stay at the previous version. If the commit fails, the
+    block raises, so the lost write cannot go unnoticed. Other threads and
+    processes keep reading the previous version meanwhile, while their
+    writes wait for the transaction to end. A transaction opened inside
+    another one on the same file joins it.
+
+    Parameter:
+        file_path: Path to the storage file where movie data is stored.
+
+    Yields: The CatalogOverlay of the transaction; its `result` holds the
+            result_message of the commit after the block.
+
+    Raises:
+        OSError: If the catalog cannot be loaded, or the staged changes
+                 cannot be written.
+    """
+    overlay = get_transaction(file_path)
+    if overlay is not None:
+        yield overlay
+        return
+
+    with (lock_util.get_lock(file_path).write_locked(),
+          lock_util.file_locked(file_path)):
+        details = data_util.fetch_current(file_path)
+        if not details[constant.RESULT]:
+            raise OSError(details[constant.MESSAGE])
+
+        overlay = CatalogOverlay(details[constant.PAYLOAD])
+        if not hasattr(transactions, "overlays"):
+            transactions.overlays = {}
+        transactions.overlays[file_path] = overlay
+        try:
+            yield overlay
+        except BaseException:
+            overlay.discard()
+            raise
+        finally:
+            del transactions.overlays[file_path]
+            overlay.result = commit_overlay(overlay, file_path)
+        if not overlay.result[constant.RESULT]:
+            raise OSError(overlay.result[constant.MESSAGE])
+
+
+def fetch_movies(file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Fetches the current catalog, including the changes staged by this
+    thread's open transaction.
+
+    Parameter:
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object
+    """
+    overlay = get_transaction(file_path)
+    if overlay:
+        return misc_util.result_message(True, "File loaded successfully.",
+                                        overlay.snapshot())
+    return data_util.fetch_data(file_path)
+
+
+def commit_overlay(overlay: CatalogOverlay,
+                   file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Writes the changes staged in an overlay as the next catalog version.
+
+    Parameters:
+        overlay: The staged changes.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: The result_message of the write.
+    """
+    if not overlay:
+        return misc_util.result_message(True, "There was nothing to write.",
+                                        "")
+    result = data_util.publish_data(overlay, file_path)
+    if result[constant.RESULT]:
+        change_util.record_events(file_path, change_util.diff_events(
+            overlay.base, overlay.changes, overlay.deletions))
+    return result
 
 
 def search_movies(file_path: WindowsPath) -> misc_util.result_message:
@@ -71,7 +524,7 @@ def search_movies(file_path: WindowsPath) -> misc_util.result_message:
 
     Return: A result_message object
     """
-    return data_util.fetch_data(file_path)
+    return fetch_movies(file_path)
 
 
 def stats_movies(file_path: WindowsPath) -> misc_util.result_message:
@@ -83,7 +536,55 @@ def stats_movies(file_path: WindowsPath) -> misc_util.result_message:
 
     Return: A result_message object
     """
-    return data_util.fetch_data(file_path)
+    return fetch_movies(file_path)
+
+
+def stats_file(file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Computes the statistics report of the storage file in one streaming
+    pass, without loading it into the cache.
+
+    Parameter:
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing the report.
+    """
+    try:
+        report = stats_util.file_stats(file_path)
+    except FileNotFoundError:
+        return misc_util.result_message(False,
+                                        "Error: The file was not found.", "")
+    except (OSError, ValueError, KeyError) as e:
+        return misc_util.result_message(False,
+                                        f"Error: Could not read the "
+                                        f"file: {e}", "")
+    return misc_util.result_message(True,
+                                    "Movie statistics have been generated.",
+                                    report)
+
+
+def group_movies(key: str, aggregates: tuple,
+                 file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Groups the movies and aggregates their ratings per group.
+
+    Parameters:
+        key: GROUP_YEAR, GROUP_DECADE or GROUP_RATING_BAND.
+        aggregates: The aggregates to compute, all if empty.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing the aggregates by group.
+    """
+    result = fetch_movies(file_path)
+    if not result[constant.RESULT]:
+        return result
+    try:
+        groups = stats_util.group_movies(result[constant.PAYLOAD], key,
+                                         aggregates)
+    except ValueError as e:
+        return misc_util.result_message(False, str(e), "")
+    return misc_util.result_message(True, f"Movies grouped by {key}.",
+                                    groups)
 
 
 def update_movie(title: str, rating: str,
@@ -99,12 +600,201 @@ def update_movie(title: str, rating: str,
     Return: A result_message object indicating success or failure after the update,
              including the updated rating.
     """
-    details = data_util.fetch_data(file_path)
+    result = None
+    if get_transaction(file_path) is None:
+        with (lock_util.get_lock(file_path).write_locked(),
+              lock_util.file_locked(file_path)):
+            result = update_movie_unloaded(title, rating, file_path)
+    if result is None:
+        result = apply_staged(file_path, lambda overlay: stage_update_movie(
+            overlay, title, rating))
 
-    details[constant.PAYLOAD][title][constant.RATING_KEY] = float(rating)
+    result["rating"] = rating
 
-    result = data_util.write_data(details[constant.PAYLOAD], file_path)
+    return result
 
-    result["rating"] = rating
 
+def update_movie_unloaded(title: str, rating: str,
+                          file_path: WindowsPath):
+    """
+    Updates the rating of a movie in a JSON Lines storage file that has not
+    been loaded, by looking it up through the title index and appending the
+    updated record. Must be called with the storage locks held.
+
+    Parameters:
+        title: Title of the movie to update.
+        rating: New rating for the movie.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object, or None if the catalog has to be
+            loaded for the update.
+    """
+    if ("jsonl" not in file_path.name
+            or data_util.is_cached(file_path)):
+        return None
+
+    try:
+        movies = index_util.find_title(file_path, title)
+    except (OSError, ValueError):
+        return None
+    if not movies:
+        return None
+
+    stored_title, entry = next(iter(movies.items()))
+    try:
+        rating = float(rating)
+    except ValueError:
+        return misc_util.result_message(False,
+                                        f"The rating of the movie "
+                                        f"{stored_title} is not valid.",
+                                        stored_title)
+
+    changes = {stored_title: {**entry, constant.RATING_KEY: rating}}
+    result = data_util.append_changes(file_path, changes)
+    if result[constant.RESULT]:
+        change_util.record_events(file_path, change_util.diff_events(
+            movies, changes, ()))
     return result
+
+
+def tail_movies(offset: int, file_id: int,
+                file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Reads the movies added, updated or deleted in a JSON Lines storage file
+    since a previous read.
+
+    Parameters:
+        offset: The offset returned by the previous read, 0 at first.
+        file_id: The file id returned by the previous read, None at first.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing the changes and the offset
+            and file id to resume from.
+    """
+    return data_util.tail_data(file_path, offset, file_id)
+
+
+def subscribe_movies(callback, file_path: WindowsPath) -> None:
+    """
+    Registers a function to call with the change events of every commit to
+    the storage file made in this process.
+
+    Parameters:
+        callback: Function taking the list of events of one commit.
+        file_path: Path to the storage file where movie data is stored.
+    """
+    change_util.subscribe(file_path, callback)
+
+
+def unsubscribe_movies(callback, file_path: WindowsPath) -> None:
+    """
+    Removes a function registered with `subscribe_movies`.
+
+    Parameters:
+        callback: The registered function.
+        file_path: Path to the storage file where movie data is stored.
+    """
+    change_util.unsubscribe(file_path, callback)
+
+
+def changes_since(version: int,
+                  file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Reads the change events committed after a version.
+
+    Parameters:
+        version: The last version the caller has processed, 0 at first.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing the events, the version to
+            resume from and whether the caller has to rebuild.
+    """
+    return change_util.changes_since(file_path, version)
+
+
+def query_movies(query, file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Runs a query on the catalog.
+
+    Parameters:
+        query: The query_util.MovieQuery to run.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing the matching
+            (title, entry) pairs.
+    """
+    result = fetch_movies(file_path)
+    if not result[constant.RESULT]:
+        return result
+    return misc_util.result_message(True, "The query was successful.",
+                                    query.execute(result[constant.PAYLOAD]))
+
+
+def explain_query(query, file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Runs a query on the catalog and reports how the planner ran it.
+
+    Parameters:
+        query: The query_util.MovieQuery to explain.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing the plan.
+    """
+    result = fetch_movies(file_path)
+    if not result[constant.RESULT]:
+        return result
+    return misc_util.result_message(True, "The query has been explained.",
+                                    query.explain(result[constant.PAYLOAD]))
+
+
+def search_text(text: str, limit: int,
+                file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Ranks the movies whose notes or title match a text.
+
+    Parameters:
+        text: The search text.
+        limit: The maximum number of results.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing (title, entry, score)
+            triples, best first.
+    """
+    result = fetch_movies(file_path)
+    if not result[constant.RESULT]:
+        return result
+    return misc_util.result_message(True, "The search was successful.",
+                                    search_util.search_movies(
+                                        result[constant.PAYLOAD], text,
+                                        limit))
+
+
+def similar_movies(title: str, count: int, radius: float,
+                   file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Finds the movies closest to a movie in year and rating.
+
+    Parameters:
+        title: The title of the movie, in any case or spacing.
+        count: The number of similar movies wanted, or None.
+        radius: The maximum distance, or None.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing (title, entry, distance)
+            triples, closest first.
+    """
+    result = fetch_movies(file_path)
+    if not result[constant.RESULT]:
+        return result
+    snapshot = result[constant.PAYLOAD]
+
+    stored_title = snapshot.resolve_title(title)
+    if stored_title is None:
+        return misc_util.result_message(False,
+                                        f"The movie {title} does not exist.",
+                                        "")
+    return misc_util.result_message(True,
+                                    f"Movies similar to {stored_title}.",
+                                    neighbor_util.similar_movies(
+                                        snapshot, stored_title, count,
+                                        radius))
@@ -1,11 +1,49 @@
 from pathlib import WindowsPath
-import random
 
 from movie.data import movie_storage
+from movie.utility import cache_util
 from movie.utility import misc_util
 from movie.utility import constant
+from movie.utility import stats_util
 
 from movie.utility.misc_util import result_message
+from movie.utility.query_util import MovieQuery
+
+query_cache = cache_util.QueryCache(constant.QUERY_CACHE_SIZE)
+
+
+def cached_query(params: tuple, file_path: WindowsPath,
+                 compute) -> result_message:
+    """
+    Serves a read-only query from the query cache, or computes and caches
+    it on a miss.
+
+    Results are cached per catalog version, so a write drops them. Queries
+    inside an open transaction bypass the cache, since they see changes
+    that are not a committed version yet.
+
+    Parameters:
+        params: The hashable query name and parameters.
+        file_path: Path to the storage file where movie data is stored.
+        compute: Function without arguments running the query.
+
+    Return: The result_message of the query, shared with later hits.
+    """
+    if movie_storage.get_transaction(file_path) is not None:
+        return compute()
+    current = movie_storage.fetch_movies(file_path)
+    if not current[constant.RESULT]:
+        return current
+
+    snapshot = current[constant.PAYLOAD]
+    result = query_cache.lookup(file_path, params, snapshot)
+    if result is None:
+        result = compute()
+        # A write may have published a newer version while computing.
+        if movie_storage.fetch_movies(file_path)[
+                constant.PAYLOAD] is snapshot:
+            query_cache.store(file_path, params, snapshot, result)
+    return result
 
 
 def service_list_movies(option: str,
@@ -22,32 +60,20 @@ def service_list_movies(option: str,
 
     Return: A result_message object containing the sorted or unsorted movies.
     """
-    if option == constant.RATING_KEY:
-        result = movie_storage.list_movies(file_path)
-
-        return misc_util.result_message(True,
-                                        "Movies sorted by rating",
-                                        dict(sorted(
-                                            result[constant.PAYLOAD].items(),
-                                            key=lambda x: x[1][
-                                                constant.RATING_KEY],
-                                            reverse=True)
-                                        ))
+    if option not in (constant.RATING_KEY, constant.YEAR_KEY):
+        return movie_storage.list_movies(file_path)
 
-    elif option == constant.YEAR_KEY:
-        result = movie_storage.list_movies(file_path)
+    def compute():
+        result = movie_storage.query_movies(
+            MovieQuery().order_by(option, descending=True), file_path)
+        if not result[constant.RESULT]:
+            return result
 
         return misc_util.result_message(True,
-                                        "Movies sorted by year",
-                                        dict(sorted(
-                                            result[constant.PAYLOAD].items(),
-                                            key=lambda x: x[1][
-                                                constant.YEAR_KEY],
-                                            reverse=True)
-                                        ))
+                                        f"Movies sorted by {option}",
+                                        dict(result[constant.PAYLOAD]))
 
-    else:
-        return movie_storage.list_movies(file_path)
+    return cached_query(("sorted", option), file_path, compute)
 
 
 def service_filter_movies(minimum_rating: float,
@@ -65,19 +91,21 @@ def service_filter_movies(minimum_rating: float,
 
     Return: A result_message object containing movies matching the criteria.
     """
-    result = movie_storage.list_movies(file_path)
+    def compute():
+        result = movie_storage.query_movies(
+            MovieQuery().rating_between(minimum_rating)
+            .year_between(start_year, end_year), file_path)
+        if not result[constant.RESULT]:
+            return result
 
-    return misc_util.result_message(True,
-                                    "Movies sorted by year",
-                                    [{key: value}
-                                     for key, value in
-                                     result[constant.PAYLOAD].items()
-                                     if (value[constant.RATING_KEY]
-                                         >= minimum_rating)
-                                     and
-                                     (start_year <= value[
-                                         constant.YEAR_KEY] <= end_year)]
-                                    )
+        return misc_util.result_message(True,
+                                        "Movies sorted by year",
+                                        [{key: value}
+                                         for key, value in
+                                         result[constant.PAYLOAD]])
+
+    return cached_query(("filter", minimum_rating, start_year, end_year),
+                        file_path, compute)
 
 
 def service_search_movies(file_path: WindowsPath) -> result_message:
@@ -104,11 +132,10 @@ def service_find_movie(is_exact: bool, title: str,
 
     Return: A result_message object containing the search results or an error message.
     """
-    result = movie_storage.search_movies(file_path)
-
     if is_exact:
 
-        has_movie = result[constant.PAYLOAD][title]
+        has_movie = movie_storage.find_movie(title, file_path)[
+            constant.PAYLOAD]
 
         if not bool(has_movie):
             return misc_util.result_message(False,
@@ -122,40 +149,170 @@ def service_find_movie(is_exact: bool, title: str,
                                             f"returned results.",
                                             "")
     else:
-        return misc_util.result_message(True,
-                                        "The search for "
-                                        "movies was successful.",
-                                        [{key: value} for key, value in
-                                         result[constant.PAYLOAD].items()
-                                         if title.lower() in key.lower()])
+        def compute():
+            result = movie_storage.query_movies(
+                MovieQuery().title_contains(title), file_path)
+            if not result[constant.RESULT]:
+                return result
+
+            return misc_util.result_message(True,
+                                            "The search for "
+                                            "movies was successful.",
+                                            [{key: value} for key, value in
+                                             result[constant.PAYLOAD]])
+
+        return cached_query(("search", title), file_path, compute)
+
+
+def service_add_movies(movies: list, file_path: WindowsPath) -> result_message:
+    """
+    Adds several movies to the storage, writing it once.
+
+    Parameters:
+        movies: Dictionaries with the title, year, rating, poster, notes and
+                imdbid of each movie.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing one result per movie.
+    """
+    return movie_storage.add_movies(movies, file_path)
+
+
+def service_delete_movies(titles: list,
+                          file_path: WindowsPath) -> result_message:
+    """
+    Deletes several movies from the storage, writing it once.
+
+    Parameters:
+        titles: Titles of the movies to delete.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing one result per title.
+    """
+    return movie_storage.delete_movies(titles, file_path)
+
+
+def service_update_movies(ratings: dict,
+                          file_path: WindowsPath) -> result_message:
+    """
+    Updates the rating of several movies, writing the storage once.
+
+    Parameters:
+        ratings: New ratings by movie title.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing one result per movie.
+    """
+    return movie_storage.update_movies(ratings, file_path)
+
+
+def service_transaction(file_path: WindowsPath):
+    """
+    Opens a transaction on the storage: the changes made inside the `with`
+    block are written together when it ends, or not at all if it raises.
+
+    Parameter:
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A context manager yielding the transaction, whose `result`
+            holds the result_message of the commit after the block. The
+            block raises an OSError if the commit fails.
+    """
+    return movie_storage.transaction(file_path)
+
+
+def service_find_movie_by_imdbid(imdbid: str,
+                                 file_path: WindowsPath) -> result_message:
+    """
+    Searches for a movie by its IMDb ID.
+
+    Parameters:
+        imdbid: The IMDb ID to search for.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing the movie keyed by its title,
+            or an error message if there is none.
+    """
+    result = movie_storage.find_movie_by_imdbid(imdbid, file_path)
+
+    if not result[constant.RESULT]:
+        return result
+    if not result[constant.PAYLOAD]:
+        return misc_util.result_message(False,
+                                        "Searching for "
+                                        "the movie returned no results.",
+                                        "")
+    return misc_util.result_message(True,
+                                    f"Searching for the movie with the "
+                                    f"IMDb ID {imdbid} returned results.",
+                                    result[constant.PAYLOAD])
 
 
 def service_stat_movies(file_path: WindowsPath) -> result_message:
     """
-    Generates statistical data about the movies, including:
+    Generates statistical data about the movies in a single pass, including:
         - Average rating
         - Median rating
         - Best-rated movie(s)
         - Worst-rated movie(s)
+        - The extended report of `stats_util.StatsAccumulator`: standard
+          deviation, percentiles, a rating histogram and counts per year
 
     Parameter:
         file_path: Path to the storage file where movie data is stored.
 
-    Return: A result_message object containing the statistics and all movies.
+    Return: A result_message object containing the statistics, all movies
+            and the extended report.
     """
     result = movie_storage.stats_movies(file_path)
+    if not result[constant.RESULT]:
+        return result
 
-    (average_rating,
-     best_movie,
-     median_rating,
-     worst_movie) = misc_util.get_stat_details(result)
+    report = stats_util.catalog_stats(result[constant.PAYLOAD])
 
     return misc_util.result_message(True,
                                     "Movie statistics "
                                     "have been generated.",
-                                    [average_rating, median_rating,
-                                     best_movie, worst_movie,
-                                     result[constant.PAYLOAD]])
+                                    [report[constant.STATS_MEAN],
+                                     report[constant.STATS_MEDIAN],
+                                     report[constant.BEST_MOVIE],
+                                     report[constant.WORST_MOVIE],
+                                     result[constant.PAYLOAD],
+                                     report])
+
+
+def service_stat_file(file_path: WindowsPath) -> result_message:
+    """
+    Generates the extended statistics report while streaming the storage
+    file, without loading the catalog into memory.
+
+    Parameter:
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing the report.
+    """
+    return movie_storage.stats_file(file_path)
+
+
+def service_group_movies(key: str, aggregates: tuple,
+                         file_path: WindowsPath) -> result_message:
+    """
+    Groups the movies by year, decade or rating band and aggregates the
+    ratings of every group, e.g. the average rating per decade.
+
+    The groups are merged from per-year rating buckets that are kept up to
+    date as the catalog changes, so no pass over the movies is needed.
+
+    Parameters:
+        key: One of constant.GROUP_KEYS.
+        aggregates: Any of constant.GROUP_AGGREGATES (count, mean, min, max,
+                    median), all if empty.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing {aggregate: value} by group,
+            in group order.
+    """
+    return movie_storage.group_movies(key, aggregates, file_path)
 
 
 def service_random_movie(file_path: WindowsPath):
@@ -167,6 +324,8 @@ def service_random_movie(file_path: WindowsPath):
 
     Return: A result_message object containing a randomly selected movie.
     """
+    import random
+
     generate_random_movie = movie_storage.list_movies(file_path)[
         constant.PAYLOAD]
 
@@ -222,3 +381,185 @@ def service_update_movie(title: str, rating: str, file_path: WindowsPath):
     Return: A result_message object indicating success or failure.
     """
     return movie_storage.update_movie(title, rating, file_path)
+
+
+def service_prefetch_movies(file_path: WindowsPath) -> None:
+    """
+    Starts loading the movies in the background, so the first command does
+    not have to wait for the whole file to be parsed.
+
+    Parameter:
+        file_path: Path to the storage file where movie data is stored.
+    """
+    movie_storage.prefetch_movies(file_path)
+
+
+def service_load_status(file_path: WindowsPath) -> result_message:
+    """
+    Reports how far loading the movies has progressed.
+
+    Parameter:
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing the load state, rows and
+            characters read, the file size and the load duration in seconds.
+    """
+    return misc_util.result_message(True,
+                                    "The load status has been retrieved.",
+                                    movie_storage.load_status(file_path))
+
+
+def service_tail_movies(offset: int, file_id: int,
+                        file_path: WindowsPath) -> result_message:
+    """
+    Returns the changes appended to a JSON Lines storage since a previous
+    call, so a follower can keep up without reloading the whole catalog.
+
+    Parameters:
+        offset: The offset returned by the previous call, 0 at first.
+        file_id: The file id returned by the previous call, None at first.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing the (title, entry) changes,
+            where entry is None for a deleted movie, the offset and file id
+            to pass to the next call, and whether the follower had to start
+            over because the file was compacted.
+    """
+    return movie_storage.tail_movies(offset, file_id, file_path)
+
+
+def service_subscribe_movies(callback, file_path: WindowsPath) -> None:
+    """
+    Registers a function to call with the change events (added, deleted,
+    rating updated, updated) of every commit to the storage, so derived
+    data can be updated incrementally.
+
+    Parameters:
+        callback: Function taking the list of events of one commit.
+        file_path: Path to the storage file where movie data is stored.
+    """
+    movie_storage.subscribe_movies(callback, file_path)
+
+
+def service_unsubscribe_movies(callback, file_path: WindowsPath) -> None:
+    """
+    Removes a function registered with `service_subscribe_movies`.
+
+    Parameters:
+        callback: The registered function.
+        file_path: Path to the storage file where movie data is stored.
+    """
+    movie_storage.unsubscribe_movies(callback, file_path)
+
+
+def service_changes_since(version: int,
+                          file_path: WindowsPath) -> result_message:
+    """
+    Returns the change events committed after a version, so a consumer can
+    catch up after a restart without rebuilding from the whole catalog.
+
+    Parameters:
+        version: The last version the consumer has processed, 0 at first.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing the events, the version to
+            resume from next time and whether the consumer has to rebuild
+            because events it missed are no longer retained.
+    """
+    return movie_storage.changes_since(version, file_path)
+
+
+def service_query_movies(query: MovieQuery,
+                         file_path: WindowsPath) -> result_message:
+    """
+    Runs a query built with `MovieQuery` on the storage; the planner reads
+    the movies through the most selective index the query can use.
+
+    Parameters:
+        query: The query to run.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing the matching movies as
+            (title, entry) pairs.
+    """
+    return movie_storage.query_movies(query, file_path)
+
+
+def service_explain_query(query: MovieQuery,
+                          file_path: WindowsPath) -> result_message:
+    """
+    Runs a query and reports the plan: the chosen access path, the
+    candidate count of every usable one, the ordering and the timings.
+
+    Parameters:
+        query: The query to explain.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing the plan.
+    """
+    return movie_storage.explain_query(query, file_path)
+
+
+def service_search_notes(text: str, limit: int,
+                         file_path: WindowsPath) -> result_message:
+    """
+    Searches the notes and titles of all movies for the words of a text and
+    ranks the matches by relevance (BM25).
+
+    Parameters:
+        text: The words to search for.
+        limit: The maximum number of results.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing the best matches as
+            (title, entry, score) triples, best first.
+    """
+    def compute():
+        result = movie_storage.search_text(text, limit, file_path)
+        if not result[constant.RESULT]:
+            return result
+        if not result[constant.PAYLOAD]:
+            return misc_util.result_message(False,
+                                            "Searching for "
+                                            "the movie returned no results.",
+                                            [])
+        return misc_util.result_message(True,
+                                        "The search for "
+                                        "movies was successful.",
+                                        result[constant.PAYLOAD])
+
+    return cached_query(("notes", text, limit), file_path, compute)
+
+
+def service_similar_movies(title: str, count: int, radius: float,
+                           file_path: WindowsPath) -> result_message:
+    """
+    Finds the movies most similar to a movie, i.e. closest in release year
+    and rating (see constant.NEIGHBOR_FEATURES), with a k-d tree.
+
+    Parameters:
+        title: The title of the movie.
+        count: The number of similar movies wanted; NEIGHBOR_COUNT if None
+               and no radius is given.
+        radius: If given, only movies within this distance are returned.
+        file_path: Path to the storage file where movie data is stored.
+
+    Return: A result_message object containing (title, entry, distance)
+            triples, closest first, or an error message if the movie does
+            not exist.
+    """
+    return movie_storage.similar_movies(title, count, radius, file_path)
+
+
+def service_query_cache_stats() -> result_message:
+    """
+    Reports the hits and misses of the query cache serving the search,
+    sort and filter commands.
+
+    Return: A result_message object containing the hit and miss counts,
+            the number of results cached and the capacity.
+    """
+    return misc_util.result_message(True,
+                                    "The query cache statistics "
+                                    "have been retrieved.",
+                                    query_cache.stats())
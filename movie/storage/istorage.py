@@ -23,14 +23,62 @@ class IStorage(ABC):
     def update_movie(self, title, rating):
         pass
 
+    @abstractmethod
+    def add_movies(self, movies):
+        pass
+
+    @abstractmethod
+    def delete_movies(self, titles):
+        pass
+
+    @abstractmethod
+    def update_movies(self, ratings):
+        pass
+
+    @abstractmethod
+    def prefetch(self):
+        pass
+
+    @abstractmethod
+    def transaction(self):
+        pass
+
+    @abstractmethod
+    def subscribe(self, callback):
+        pass
+
+    @abstractmethod
+    def unsubscribe(self, callback):
+        pass
+
+    @abstractmethod
+    def changes_since(self, version):
+        pass
+
     @abstractmethod
     def find_movie(self, title):
         pass
 
+    @abstractmethod
+    def find_movie_by_imdbid(self, imdbid):
+        pass
+
     @abstractmethod
     def stats_movie(self):
         pass
 
+    @abstractmethod
+    def stats_file(self):
+        pass
+
+    @abstractmethod
+    def group_movies(self, key, aggregates):
+        pass
+
+    @abstractmethod
+    def similar_movies(self, title, count, radius):
+        pass
+
     @abstractmethod
     def random_movie(self):
         pass
@@ -39,6 +87,10 @@ class IStorage(ABC):
     def search_movie(self, title):
         pass
 
+    @abstractmethod
+    def search_notes(self, text, limit):
+        pass
+
     @abstractmethod
     def search_movie_sorted_by_rating(self, option):
         pass
@@ -50,3 +102,15 @@ class IStorage(ABC):
     @abstractmethod
     def search_filter_movies(self, minimum_rating, start_year, end_year):
         pass
+
+    @abstractmethod
+    def query_movies(self, query):
+        pass
+
+    @abstractmethod
+    def explain_query(self, query):
+        pass
+
+    @abstractmethod
+    def query_cache_stats(self):
+        pass
@@ -1,23 +1,34 @@
 from pathlib import WindowsPath
 
 from movie.storage.istorage import IStorage
+from movie.utility import constant
 from movie.movie_services.movie_service import service_list_movies, \
     service_add_movie, service_delete_movie, service_update_movie, \
     service_find_movie, service_stat_movies, service_random_movie, \
-    service_filter_movies
+    service_filter_movies, service_prefetch_movies, service_load_status, \
+    service_find_movie_by_imdbid, service_add_movies, \
+    service_delete_movies, service_update_movies, service_transaction, \
+    service_subscribe_movies, service_unsubscribe_movies, \
+    service_changes_since, service_query_movies, service_explain_query, \
+    service_search_notes, service_stat_file, service_group_movies, \
+    service_similar_movies, service_query_cache_stats
 
 
 class StorageCsv(IStorage):
     """
     A class to handle movie data stored in a CSV file.
     Implements the IStorage interface for standardized storage operations.
+    Instances may be shared across threads: reads work on immutable catalog
+    snapshots and never wait for writers, while writes to the same file are
+    serialized by a lock.
     """
     def __init__(self, file_path: WindowsPath):
         """
-        Initializes the StorageJson class with a file path.
+        Initializes the StorageCsv class with a file path. The movies are
+        loaded on first use, or in the background after `prefetch`.
 
         Parameter:
-            file_path (WindowsPath): Path to the JSON file.
+            file_path (WindowsPath): Path to the CSV file.
         """
         self.__file_path = file_path
 
@@ -45,6 +56,25 @@ class StorageCsv(IStorage):
         else:
             raise ValueError("File path should be valid.")
 
+    def prefetch(self):
+        """
+        Starts loading the movies in the background, so the first command
+        does not have to wait for the whole file to be parsed. Meant for
+        interactive startup; a storage used for single lookups is better
+        left to the title index.
+        """
+        service_prefetch_movies(self.get_file_path())
+
+    def get_load_status(self):
+        """
+        Reports the progress of loading the movies, which starts with the
+        first command, or in the background after `prefetch`.
+
+        Return: A result message containing the load state, rows and
+                characters read, the file size and the duration in seconds.
+        """
+        return service_load_status(self.get_file_path())
+
     def list_movies(self):
         """
         Lists all movies in the storage.
@@ -102,6 +132,87 @@ class StorageCsv(IStorage):
                                     rating,
                                     self.get_file_path())
 
+    def add_movies(self, movies):
+        """
+        Adds several movies to the storage with a single write.
+
+        Parameter:
+            movies: Dictionaries with the title, year, rating, poster,
+                    notes and imdbid of each movie.
+
+        Return: A result message containing one result message per movie.
+        """
+        return service_add_movies(movies, self.get_file_path())
+
+    def delete_movies(self, titles):
+        """
+        Deletes several movies from the storage with a single write.
+
+        Parameter:
+            titles: The titles of the movies to delete.
+
+        Return: A result message containing one result message per title.
+        """
+        return service_delete_movies(titles, self.get_file_path())
+
+    def update_movies(self, ratings):
+        """
+        Updates the rating of several movies with a single write.
+
+        Parameter:
+            ratings: The new ratings by movie title.
+
+        Return: A result message containing one result message per movie.
+        """
+        return service_update_movies(ratings, self.get_file_path())
+
+    def transaction(self):
+        """
+        Opens a transaction: the changes made inside the `with` block are
+        written with a single write when it ends, or rolled back if it
+        raises. If the write fails, the block raises an OSError.
+
+        Example:
+            with storage.transaction() as transaction:
+                storage.delete_movie("Titanic")
+                storage.update_movie("Joker", "9.0")
+            print(transaction.result)
+
+        Return: A context manager yielding the transaction.
+        """
+        return service_transaction(self.get_file_path())
+
+    def subscribe(self, callback):
+        """
+        Registers a function to call with the change events of every
+        commit to the storage.
+
+        Parameter:
+            callback: Function taking the list of events of one commit.
+        """
+        service_subscribe_movies(callback, self.get_file_path())
+
+    def unsubscribe(self, callback):
+        """
+        Removes a function registered with `subscribe`.
+
+        Parameter:
+            callback: The registered function.
+        """
+        service_unsubscribe_movies(callback, self.get_file_path())
+
+    def changes_since(self, version):
+        """
+        Reads the change events committed after a version.
+
+        Parameter:
+            version: The last version processed, 0 at first.
+
+        Return: A result message containing the events, the version to
+                resume from and whether a rebuild is needed.
+        """
+        return service_changes_since(version, self.get_file_path())
+
     def find_movie(self, title):
         """
         Searches for a specific movie by its title.
@@ -114,6 +225,18 @@ class StorageCsv(IStorage):
         return service_find_movie(True, title,
                                   self.get_file_path())
 
+    def find_movie_by_imdbid(self, imdbid):
+        """
+        Searches for a specific movie by its IMDb ID.
+
+        Parameter:
+            imdbid: The IMDb ID of the movie to find.
+
+        Return: A result message containing the movie keyed by its title or
+                an error.
+        """
+        return service_find_movie_by_imdbid(imdbid, self.get_file_path())
+
     def stats_movie(self):
         """
         Retrieves statistical information about movies in storage.
@@ -122,6 +245,43 @@ class StorageCsv(IStorage):
         """
         return service_stat_movies(self.get_file_path())
 
+    def stats_file(self):
+        """
+        Computes the statistics report by streaming the storage file,
+        without loading the catalog.
+
+        Return: A result message containing the report.
+        """
+        return service_stat_file(self.get_file_path())
+
+    def group_movies(self, key, aggregates=()):
+        """
+        Groups the movies by year, decade or rating band and aggregates
+        their ratings per group.
+
+        Parameters:
+            key: One of constant.GROUP_KEYS.
+            aggregates: Any of constant.GROUP_AGGREGATES, all if empty.
+
+        Return: A result message containing the aggregates by group.
+        """
+        return service_group_movies(key, aggregates, self.get_file_path())
+
+    def similar_movies(self, title, count=None, radius=None):
+        """
+        Finds the movies closest to a movie in release year and rating.
+
+        Parameters:
+            title: The title of the movie.
+            count: The number of similar movies wanted.
+            radius: If given, the maximum distance of a similar movie.
+
+        Return: A result message containing (title, entry, distance)
+                triples, closest first.
+        """
+        return service_similar_movies(title, count, radius,
+                                      self.get_file_path())
+
     def random_movie(self):
         """
         Retrieves a random movie from the storage.
@@ -142,6 +302,19 @@ class StorageCsv(IStorage):
         return service_find_movie(False, title,
                                   self.get_file_path())
 
+    def search_notes(self, text, limit=constant.SEARCH_LIMIT):
+        """
+        Ranks the movies whose notes or title contain the words of a text.
+
+        Parameters:
+            text: The words to search for.
+            limit: The maximum number of results.
+
+        Return: A result message containing (title, entry, score) triples,
+                best match first.
+        """
+        return service_search_notes(text, limit, self.get_file_path())
+
     def search_movie_sorted_by_rating(self, option):
         """
         Retrieves movies sorted by their rating.
@@ -179,3 +352,36 @@ class StorageCsv(IStorage):
         """
         return service_filter_movies(minimum_rating, start_year,
                                      end_year, self.get_file_path())
+
+    def query_movies(self, query):
+        """
+        Runs a query built with MovieQuery.
+
+        Parameter:
+            query: The query to run.
+
+        Return: A result message containing the matching (title, entry)
+                pairs.
+        """
+        return service_query_movies(query, self.get_file_path())
+
+    def explain_query(self, query):
+        """
+        Runs a query and reports the plan the planner chose.
+
+        Parameter:
+            query: The query to explain.
+
+        Return: A result message containing the plan and its timings.
+        """
+        return service_explain_query(query, self.get_file_path())
+
+    def query_cache_stats(self):
+        """
+        Reports the hits and misses of the cache serving repeated search,
+        sort and filter queries.
+
+        Return: A result message containing the hit and miss counts, the
+                number of results cached and the capacity.
+        """
+        return service_query_cache_stats()
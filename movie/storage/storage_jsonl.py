@@ -0,0 +1,407 @@
+from pathlib import WindowsPath
+
+from movie.storage.istorage import IStorage
+from movie.utility import constant
+from movie.movie_services.movie_service import service_list_movies, \
+    service_add_movie, service_delete_movie, service_update_movie, \
+    service_find_movie, service_stat_movies, service_random_movie, \
+    service_filter_movies, service_prefetch_movies, service_load_status, \
+    service_tail_movies, service_find_movie_by_imdbid, service_add_movies, \
+    service_delete_movies, service_update_movies, service_transaction, \
+    service_subscribe_movies, service_unsubscribe_movies, \
+    service_changes_since, service_query_movies, service_explain_query, \
+    service_search_notes, service_stat_file, service_group_movies, \
+    service_similar_movies, service_query_cache_stats
+
+
+class StorageJsonl(IStorage):
+    """
+    A class to handle movie data stored in a JSON Lines file.
+    Implements the IStorage interface for standardized storage operations.
+    Adding, deleting and updating a movie appends a single line to the file
+    instead of rewriting it, and the file is compacted once overridden lines
+    outweigh the live movies. Followers can read the appended changes with
+    `tail_movies`.
+    Instances may be shared across threads: reads work on immutable catalog
+    snapshots and never wait for writers, while writes to the same file are
+    serialized by a lock.
+    """
+
+    def __init__(self, file_path: WindowsPath):
+        """
+        Initializes the StorageJsonl class with a file path. The movies are
+        loaded on first use, or in the background after `prefetch`.
+
+        Parameter:
+            file_path (WindowsPath): Path to the JSON Lines file.
+        """
+        self.__file_path = file_path
+
+    def get_file_path(self):
+        """
+        Retrieves the current file path.
+
+        Returns:
+            WindowsPath: The current file path.
+        """
+        return self.__file_path
+
+    def set_file_path(self, file_path: int):
+        """
+        Updates the file path if valid.
+
+        Parameters:
+            file_path (int): The new file path.
+
+        Raises:
+            ValueError: If the input is not a valid `WindowsPath`.
+        """
+        if isinstance(file_path, WindowsPath) and file_path:
+            self.__file_path = file_path
+        else:
+            raise ValueError("File path should be valid.")
+
+    def prefetch(self):
+        """
+        Starts loading the movies in the background, so the first command
+        does not have to wait for the whole file to be parsed. Meant for
+        interactive startup; a storage used for single lookups is better
+        left to the title index.
+        """
+        service_prefetch_movies(self.get_file_path())
+
+    def get_load_status(self):
+        """
+        Reports the progress of loading the movies, which starts with the
+        first command, or in the background after `prefetch`.
+
+        Return: A result message containing the load state, rows and
+                characters read, the file size and the duration in seconds.
+        """
+        return service_load_status(self.get_file_path())
+
+    def tail_movies(self, offset=0, file_id=None):
+        """
+        Reads the movies added, updated or deleted since a previous call.
+
+        Parameters:
+            offset: The offset returned by the previous call, 0 at first.
+            file_id: The file id returned by the previous call, None at
+                     first.
+
+        Return: A result message containing the changes as (title, entry)
+                pairs, where entry is None for a deleted movie, and the
+                offset and file id to pass to the next call.
+        """
+        return service_tail_movies(offset, file_id, self.get_file_path())
+
+    def list_movies(self):
+        """
+        Lists all movies in the storage.
+
+        Parameter : A result message containing all stored movies.
+        """
+        return service_list_movies("",
+                                   self.get_file_path())
+
+    def add_movie(self, title, year, rating, poster, notes, imdbid):
+        """
+        Adds a new movie to the storage.
+
+        Parameters:
+        title: The title of the movie.
+        year: The release year of the movie.
+        rating: The rating of the movie.
+        poster: The URL of the movie's poster.
+        notes: Additional notes about the movie.
+        imdbid: The IMDb ID of the movie.
+
+        Return: A result message indicating success or failure.
+        """
+        return service_add_movie(title,
+                                 year,
+                                 rating,
+                                 poster,
+                                 notes,
+                                 imdbid,
+                                 self.get_file_path())
+
+    def delete_movie(self, title):
+        """
+        Deletes a movie from the storage by title.
+
+        Parameter:
+            title: The title of the movie to delete.
+
+        Returns: A result message indicating success or failure.
+        """
+        return service_delete_movie(title,
+                                    self.get_file_path())
+
+    def update_movie(self, title, rating):
+        """
+        Updates the rating of a specific movie in the storage.
+
+        Parameter:
+            title: The title of the movie to update.
+            rating: The new rating for the movie.
+
+        Return: A result message indicating success or failure.
+        """
+        return service_update_movie(title,
+                                    rating,
+                                    self.get_file_path())
+
+    def add_movies(self, movies):
+        """
+        Adds several movies to the storage with a single write.
+
+        Parameter:
+            movies: Dictionaries with the title, year, rating, poster,
+                    notes and imdbid of each movie.
+
+        Return: A result message containing one result message per movie.
+        """
+        return service_add_movies(movies, self.get_file_path())
+
+    def delete_movies(self, titles):
+        """
+        Deletes several movies from the storage with a single write.
+
+        Parameter:
+            titles: The titles of the movies to delete.
+
+        Return: A result message containing one result message per title.
+        """
+        return service_delete_movies(titles, self.get_file_path())
+
+    def update_movies(self, ratings):
+        """
+        Updates the rating of several movies with a single write.
+
+        Parameter:
+            ratings: The new ratings by movie title.
+
+        Return: A result message containing one result message per movie.
+        """
+        return service_update_movies(ratings, self.get_file_path())
+
+    def transaction(self):
+        """
+        Opens a transaction: the changes made inside the `with` block are
+        written with a single write when it ends, or rolled back if it
+        raises. If the write fails, the block raises an OSError.
+
+        Example:
+            with storage.transaction() as transaction:
+                storage.delete_movie("Titanic")
+                storage.update_movie("Joker", "9.0")
+            print(transaction.result)
+
+        Return: A context manager yielding the transaction.
+        """
+        return service_transaction(self.get_file_path())
+
+    def subscribe(self, callback):
+        """
+        Registers a function to call with the change events of every
+        commit to the storage.
+
+        Parameter:
+            callback: Function taking the list of events of one commit.
+        """
+        service_subscribe_movies(callback, self.get_file_path())
+
+    def unsubscribe(self, callback):
+        """
+        Removes a function registered with `subscribe`.
+
+        Parameter:
+            callback: The registered function.
+        """
+        service_unsubscribe_movies(callback, self.get_file_path())
+
+    def changes_since(self, version):
+        """
+        Reads the change events committed after a version.
+
+        Parameter:
+            version: The last version processed, 0 at first.
+
+        Return: A result message containing the events, the version to
+                resume from and whether a rebuild is needed.
+        """
+        return service_changes_since(version, self.get_file_path())
+
+    def find_movie(self, title):
+        """
+        Searches for a specific movie by its title.
+
+        Parameter:
+            title: The title of the movie to find.
+
+        Return: A result message containing the movie details or an error.
+        """
+        return service_find_movie(True, title,
+                                  self.get_file_path())
+
+    def find_movie_by_imdbid(self, imdbid):
+        """
+        Searches for a specific movie by its IMDb ID.
+
+        Parameter:
+            imdbid: The IMDb ID of the movie to find.
+
+        Return: A result message containing the movie keyed by its title or
+                an error.
+        """
+        return service_find_movie_by_imdbid(imdbid, self.get_file_path())
+
+    def stats_movie(self):
+        """
+        Retrieves statistical information about movies in storage.
+
+        Return: A result message containing movie statistics.
+        """
+        return service_stat_movies(self.get_file_path())
+
+    def stats_file(self):
+        """
+        Computes the statistics report by streaming the storage file,
+        without loading the catalog.
+
+        Return: A result message containing the report.
+        """
+        return service_stat_file(self.get_file_path())
+
+    def group_movies(self, key, aggregates=()):
+        """
+        Groups the movies by year, decade or rating band and aggregates
+        their ratings per group.
+
+        Parameters:
+            key: One of constant.GROUP_KEYS.
+            aggregates: Any of constant.GROUP_AGGREGATES, all if empty.
+
+        Return: A result message containing the aggregates by group.
+        """
+        return service_group_movies(key, aggregates, self.get_file_path())
+
+    def similar_movies(self, title, count=None, radius=None):
+        """
+        Finds the movies closest to a movie in release year and rating.
+
+        Parameters:
+            title: The title of the movie.
+            count: The number of similar movies wanted.
+            radius: If given, the maximum distance of a similar movie.
+
+        Return: A result message containing (title, entry, distance)
+                triples, closest first.
+        """
+        return service_similar_movies(title, count, radius,
+                                      self.get_file_path())
+
+    def random_movie(self):
+        """
+        Retrieves a random movie from the storage.
+
+        Return: A result message containing a randomly selected movie.
+        """
+        return service_random_movie(self.get_file_path())
+
+    def search_movie(self, title):
+        """
+        Searches for movies containing a specific keyword in their title.
+
+        Parameter:
+            title: The keyword to search for in movie titles.
+
+        Return: A result message containing matching movies.
+        """
+        return service_find_movie(False, title,
+                                  self.get_file_path())
+
+    def search_notes(self, text, limit=constant.SEARCH_LIMIT):
+        """
+        Ranks the movies whose notes or title contain the words of a text.
+
+        Parameters:
+            text: The words to search for.
+            limit: The maximum number of results.
+
+        Return: A result message containing (title, entry, score) triples,
+                best match first.
+        """
+        return service_search_notes(text, limit, self.get_file_path())
+
+    def search_movie_sorted_by_rating(self, option):
+        """
+        Retrieves movies sorted by their rating.
+
+        Parameter:
+            option: The key for sorting movies by rating.
+
+        Return: A result message containing sorted movies.
+        """
+        return service_list_movies(option,
+                                   self.get_file_path())
+
+    def search_movie_sorted_by_year(self, option):
+        """
+        Retrieves movies sorted by their release year.
+
+        Parameter:
+            option: The key for sorting movies by year.
+
+        Return: A result message containing sorted movies.
+        """
+        return service_list_movies(option,
+                                   self.get_file_path())
+
+    def search_filter_movies(self, minimum_rating, start_year, end_year):
+        """
+        Filters movies based on rating and release year range.
+
+        Parameter:
+            minimum_rating: The minimum rating to filter by.
+            start_year: The start year of the range.
+            end_year: The end year of the range.
+
+        Return: A result message containing filtered movies.
+        """
+        return service_filter_movies(minimum_rating, start_year,
+                                     end_year, self.get_file_path())
+
+    def query_movies(self, query):
+        """
+        Runs a query built with MovieQuery.
+
+        Parameter:
+            query: The query to run.
+
+        Return: A result message containing the matching (title, entry)
+                pairs.
+        """
+        return service_query_movies(query, self.get_file_path())
+
+    def explain_query(self, query):
+        """
+        Runs a query and reports the plan the planner chose.
+
+        Parameter:
+            query: The query to explain.
+
+        Return: A result message containing the plan and its timings.
+        """
+        return service_explain_query(query, self.get_file_path())
+
+    def query_cache_stats(self):
+        """
+        Reports the hits and misses of the cache serving repeated search,
+        sort and filter queries.
+
+        Return: A result message containing the hit and miss counts, the
+                number of results cached and the capacity.
+        """
+        return service_query_cache_stats()
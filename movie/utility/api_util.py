@@ -1,22 +1,30 @@
-import json
-
-from dotenv import load_dotenv
-
-import requests
+import functools
 import os
 
 from movie.utility import misc_util
 from movie.utility.constant import MOVIE_API_URL
 from movie.utility.data_util import build_dict_poster
 
+"""
+`requests` and `dotenv` are imported on first use rather than at module
+level, so that starting the application for commands that never reach the
+API does not pay for loading the network stack.
+"""
+
 
+@functools.cache
 def get_key() -> str:
     """
     Retrieves the API key from the `.env` file.
 
+    The `.env` file is read on the first call only, the key is memoized for
+    the lifetime of the process.
+
     Returns:
         str: The API key as a string.
     """
+    from dotenv import load_dotenv
+
     load_dotenv()
 
     return os.getenv('key')
@@ -35,7 +43,7 @@ def get_parameters(movie_title: str) -> str:
     return f"?t={movie_title}&apikey="
 
 
-def get_movie_data_from_api(movie_title: str) -> json:
+def get_movie_data_from_api(movie_title: str) -> misc_util.result_message:
     """
     Fetches movie data from an external API using the title.
 
@@ -43,9 +51,11 @@ def get_movie_data_from_api(movie_title: str) -> json:
         movie_title (str): Title of the movie to search.
 
     Returns:
-        json: A `result_message` JSON object indicating success or failure,
-              along with movie data or error details.
+        misc_util.result_message: A `result_message` indicating success or
+              failure, along with movie data or error details.
     """
+    import requests
+
     try:
         response = requests.get(
             MOVIE_API_URL + get_parameters(movie_title) + get_key(),
@@ -0,0 +1,136 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+from movie.utility import constant
+
+"""
+Memoization of query results per catalog version.
+
+A query result only depends on the query parameters and on the catalog it
+ran on, and a catalog snapshot never changes, so a result can be served
+again for as long as the catalog stays at the same version. Results are
+kept in a least-recently-used cache keyed by (scope, parameters, version),
+the scope being the storage file.
+
+The cache remembers the snapshot it last saw per scope. As soon as a lookup
+comes with another snapshot, i.e. the storage version was bumped by a
+write in this or another process, every result of that scope is dropped.
+The snapshot is compared by identity, not just by version number, so a
+catalog that is loaded again from scratch and restarts its numbering never
+hits results of its predecessor.
+"""
+
+
+class QueryCache:
+    """
+    A thread-safe LRU cache of query results, invalidated per scope when
+    the catalog snapshot changes.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initializes an empty cache.
+
+        Parameter:
+            capacity (int): The maximum number of results kept.
+        """
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.snapshots = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def lookup(self, scope, params: tuple, snapshot):
+        """
+        Looks up the result of a query on a snapshot.
+
+        Parameters:
+            scope: What the snapshot belongs to, e.g. the storage file.
+            params (tuple): The hashable query parameters.
+            snapshot (CatalogSnapshot): The current catalog.
+
+        Returns:
+            The cached result, or None on a miss.
+        """
+        with self.lock:
+            self.track(scope, snapshot)
+            key = (scope, params, snapshot.version)
+            result = self.entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def store(self, scope, params: tuple, snapshot, result) -> None:
+        """
+        Caches the result of a query on a snapshot, evicting the least
+        recently used result if the cache is full.
+
+        Parameters:
+            scope: What the snapshot belongs to, e.g. the storage file.
+            params (tuple): The hashable query parameters.
+            snapshot (CatalogSnapshot): The catalog the query ran on.
+            result: The result; it is shared by every later hit, so it
+                    must not be modified.
+        """
+        with self.lock:
+            if self.capacity <= 0:
+                return
+            self.track(scope, snapshot)
+            self.entries[(scope, params, snapshot.version)] = result
+            self.entries.move_to_end((scope, params, snapshot.version))
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+    def track(self, scope, snapshot) -> None:
+        """
+        Records the current snapshot of a scope, dropping the results of
+        the previous one if it changed. Must be called with the lock held.
+
+        Parameters:
+            scope: What the snapshot belongs to.
+            snapshot (CatalogSnapshot): The current catalog.
+        """
+        current = self.snapshots.get(scope)
+        if current is None or current() is not snapshot:
+            self.invalidate(scope)
+            self.snapshots[scope] = weakref.ref(snapshot)
+
+    def invalidate(self, scope) -> None:
+        """
+        Drops every result of a scope. Must be called with the lock held.
+
+        Parameter:
+            scope: What the results belong to.
+        """
+        for key in [key for key in self.entries if key[0] == scope]:
+            del self.entries[key]
+        self.snapshots.pop(scope, None)
+
+    def clear(self) -> None:
+        """
+        Drops every result and resets the counters.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.snapshots.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Reports how well the cache is doing.
+
+        Returns:
+            dict: The hit and miss counts, the number of results cached and
+                  the capacity.
+        """
+        with self.lock:
+            return {constant.CACHE_HITS: self.hits,
+                    constant.CACHE_MISSES: self.misses,
+                    constant.CACHE_ENTRIES: len(self.entries),
+                    constant.CACHE_CAPACITY: self.capacity}
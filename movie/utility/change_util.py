@@ -0,0 +1,338 @@
+import logging
+import os
+import threading
+from pathlib import WindowsPath
+
+from movie.utility import constant, misc_util
+
+"""
+Change feed of a catalog.
+
+Every committed change is described by events: a movie was added, deleted,
+had its rating updated or was otherwise updated, with the values before and
+after. Each commit creates the next catalog version, and its events are
+appended to a `<file>.changes` JSON Lines log tagged with that version, so
+versions keep increasing across restarts and a consumer that remembers the
+last version it processed can catch up by reading just the newer events.
+Subscribers registered in the process are called with the events of every
+commit as it happens. `json` is imported on first use, like in the other
+modules loaded at startup.
+
+The log keeps the last `CHANGE_LOG_MAX_EVENTS` events; a consumer whose
+version is older than that has to rebuild from the catalog itself. Like in
+a JSON Lines catalog, a last line without a newline that does not decode
+is an append that was interrupted; readers ignore it and the next append
+cuts it off.
+"""
+
+logger = logging.getLogger(__name__)
+
+subscribers = {}
+subscribers_guard = threading.Lock()
+
+
+def get_change_log_path(file_path: WindowsPath) -> WindowsPath:
+    """
+    Returns the path of the change log of a catalog file.
+
+    Parameter:
+        file_path (WindowsPath): Path to the catalog file.
+
+    Returns:
+        WindowsPath: `<file>.changes` next to the catalog.
+    """
+    return file_path.with_name(file_path.name + constant.CHANGE_LOG_SUFFIX)
+
+
+def build_event(event_type: str, title: str, old, new) -> dict:
+    """
+    Creates a change event without a version.
+
+    Parameters:
+        event_type (str): One of the EVENT_* types.
+        title (str): Title of the changed movie.
+        old: The value before the change.
+        new: The value after the change.
+
+    Returns:
+        dict: The event.
+    """
+    return {constant.EVENT_TYPE: event_type, constant.EVENT_TITLE: title,
+            constant.EVENT_OLD: old, constant.EVENT_NEW: new}
+
+
+def diff_events(base: dict, changes: dict, deletions) -> list:
+    """
+    Describes changes to a catalog as events.
+
+    Parameters:
+        base: The catalog before the changes, a dict or an overlay.
+        changes (dict): Movie entries added or replaced, by title.
+        deletions: Titles deleted.
+
+    Returns:
+        list: The events, deletions first.
+    """
+    events = [build_event(constant.EVENT_DELETED, title, base.get(title),
+                          None)
+              for title in deletions]
+    for title, entry in changes.items():
+        old = base.get(title)
+        if old is None:
+            events.append(build_event(constant.EVENT_ADDED, title, None,
+                                      entry))
+        elif ({**old, constant.RATING_KEY: None}
+              == {**entry, constant.RATING_KEY: None}):
+            if old[constant.RATING_KEY] != entry[constant.RATING_KEY]:
+                events.append(build_event(constant.EVENT_RATING_UPDATED,
+                                          title, old[constant.RATING_KEY],
+                                          entry[constant.RATING_KEY]))
+        else:
+            events.append(build_event(constant.EVENT_UPDATED, title, old,
+                                      entry))
+    return events
+
+
+def read_last_version(log_path: WindowsPath) -> int:
+    """
+    Reads the version of the last event in a change log.
+
+    Only the end of the file is read.
+
+    Parameter:
+        log_path (WindowsPath): Path to the change log.
+
+    Returns:
+        int: The version, 0 if the log is empty or missing.
+    """
+    import json
+
+    try:
+        with open(log_path, "rb") as handle:
+            size = handle.seek(0, os.SEEK_END)
+            block = 4096
+            while True:
+                handle.seek(max(size - block, 0))
+                lines = handle.read().splitlines(keepends=True)
+                if block < size:
+                    # The first line may start before the block.
+                    lines = lines[1:]
+                for line in reversed(lines):
+                    event = decode_event(line)
+                    if event is not None:
+                        return event[constant.EVENT_VERSION]
+                if block >= size:
+                    return 0
+                block *= 2
+    except FileNotFoundError:
+        return 0
+
+
+def decode_event(line):
+    """
+    Decodes one line of a change log.
+
+    Parameter:
+        line: The line, with its line break if it has one.
+
+    Returns:
+        dict: The event, or None for a blank line or an interrupted
+              append, i.e. a line without a line break that does not
+              decode.
+
+    Raises:
+        ValueError: If a complete line does not decode.
+    """
+    import json
+
+    if not line.strip():
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        if line.endswith(b"\n" if isinstance(line, bytes) else "\n"):
+            raise
+        return None
+
+
+def read_events(log_path: WindowsPath) -> list:
+    """
+    Reads all events of a change log.
+
+    Parameter:
+        log_path (WindowsPath): Path to the change log.
+
+    Returns:
+        list: The events, oldest first.
+    """
+    try:
+        with open(log_path, "r") as handle:
+            events = [decode_event(line) for line in handle]
+    except FileNotFoundError:
+        return []
+    return [event for event in events if event is not None]
+
+
+def record_events(file_path: WindowsPath, events: list) -> int:
+    """
+    Assigns the next version to the events of a commit, appends them to the
+    change log and notifies the subscribers.
+
+    Must be called with the storage locks held, right after the commit, so
+    that versions follow the order of the commits across processes.
+
+    The commit is already on disk at this point, so nothing here may fail
+    it: an error reading or writing the change log, or raised by a
+    subscriber, is logged and the remaining subscribers are still called.
+
+    Parameters:
+        file_path (WindowsPath): Path to the catalog file.
+        events (list): The events of the commit.
+
+    Returns:
+        int: The new version, the current one if there were no events, or
+             None if the change log could not be read or written; the
+             subscribers then get the events with a version of None.
+    """
+    log_path = get_change_log_path(file_path)
+    try:
+        version = read_last_version(log_path)
+        if not events:
+            return version
+        versioned = [{constant.EVENT_VERSION: version + 1, **event}
+                     for event in events]
+        append_events(log_path, versioned)
+    except (OSError, ValueError):
+        logger.exception("Could not record the changes of %s in %s.",
+                         file_path, log_path)
+        if not events:
+            return None
+        version = None
+        events = [{constant.EVENT_VERSION: None, **event}
+                  for event in events]
+    else:
+        version += 1
+        events = versioned
+
+    for callback in list(subscribers.get(file_path, ())):
+        try:
+            callback(events)
+        except Exception:
+            logger.exception("A subscriber to the changes of %s failed.",
+                             file_path)
+    return version
+
+
+def append_events(log_path: WindowsPath, events: list) -> None:
+    """
+    Appends versioned events to a change log, trimming the log once it
+    holds more than twice the retained events. An interrupted append at the
+    end of the log is cut off first.
+
+    Parameters:
+        log_path (WindowsPath): Path to the change log.
+        events (list): The events, tagged with their version.
+
+    Raises:
+        OSError: If the log cannot be written.
+    """
+    import json
+
+    data = "".join(json.dumps(event) + "\n" for event in events).encode()
+    with open(log_path, "a+b") as handle:
+        end = handle.seek(0, os.SEEK_END)
+        block = 4096
+        while end:
+            start = max(end - block, 0)
+            handle.seek(start)
+            tail = handle.read()
+            if tail.endswith(b"\n"):
+                break
+            cut = tail.rfind(b"\n") + 1
+            if cut or not start:
+                if decode_event(tail[cut:]) is None:
+                    handle.truncate(start + cut)
+                else:
+                    data = b"\n" + data
+                break
+            block *= 2
+        handle.write(data)
+        size = handle.tell()
+
+    # Trim the log once it may hold twice the retained events; the size
+    # check avoids reading the log on every commit (an event takes a few
+    # hundred bytes).
+    if size > 2 * constant.CHANGE_LOG_MAX_EVENTS * 256:
+        retained = read_events(log_path)
+        if len(retained) > 2 * constant.CHANGE_LOG_MAX_EVENTS:
+            from movie.utility.data_util import atomic_open
+
+            with atomic_open(log_path, "w") as handle:
+                handle.write("".join(
+                    json.dumps(event) + "\n" for event in
+                    retained[-constant.CHANGE_LOG_MAX_EVENTS:]))
+
+
+def changes_since(file_path: WindowsPath,
+                  version: int) -> misc_util.result_message:
+    """
+    Returns the events committed after a version.
+
+    Parameters:
+        file_path (WindowsPath): Path to the catalog file.
+        version (int): The last version the consumer has processed, 0 for
+                       all retained events.
+
+    Returns:
+        misc_util.result_message: The events, the current version and
+                                  whether the consumer must rebuild because
+                                  events it has not seen were trimmed.
+    """
+    try:
+        events = read_events(get_change_log_path(file_path))
+    except Exception as e:
+        return (misc_util.result_message
+                (False,
+                 f"An unexpected error occurred: {e}",
+                 ""))
+
+    oldest = events[0][constant.EVENT_VERSION] if events else None
+    return (misc_util.result_message
+            (True, "The changes have been read.",
+             {constant.FEED_EVENTS: [
+                 event for event in events
+                 if event[constant.EVENT_VERSION] > version],
+              constant.FEED_VERSION: (events[-1][constant.EVENT_VERSION]
+                                      if events else version),
+              constant.FEED_RESET: oldest is not None and version < oldest - 1
+              }))
+
+
+def subscribe(file_path: WindowsPath, callback) -> None:
+    """
+    Registers a function to call with the events of every commit to a
+    catalog made in this process.
+
+    The callback runs while the storage is locked for writing, so it
+    should be quick, e.g. update a derived structure or queue work.
+
+    Parameters:
+        file_path (WindowsPath): Path to the catalog file.
+        callback: Function taking the list of events of one commit.
+    """
+    with subscribers_guard:
+        subscribers[file_path] = [*subscribers.get(file_path, ()), callback]
+
+
+def unsubscribe(file_path: WindowsPath, callback) -> None:
+    """
+    Removes a function registered with `subscribe`.
+
+    Parameters:
+        file_path (WindowsPath): Path to the catalog file.
+        callback: The registered function.
+    """
+    with subscribers_guard:
+        subscribers[file_path] = [registered for registered in
+                                  subscribers.get(file_path, ())
+                                  if registered != callback]
@@ -0,0 +1,92 @@
+from pathlib import WindowsPath
+
+from movie.utility import constant
+
+"""
+Transparent compression of catalog files.
+
+A catalog whose name ends with `.gz`, `.xz` or `.bz2` (e.g. `data.csv.gz`,
+`data.json.xz`) is compressed with gzip, LZMA or bzip2. The format is still
+told by the rest of the name, so the readers and writers of every format
+work on compressed catalogs unchanged: they are handed a text handle that
+decompresses while reading or compresses while writing, in a stream,
+without holding the whole file in memory.
+
+Writes use `COMPRESSION_LEVEL` (0-9; bzip2 starts at 1). Lower levels
+write faster, higher ones write smaller files; reading speed hardly
+depends on the level.
+
+Compressed catalogs are read and written as a whole. Appending changes,
+the title index and tailing a JSON Lines catalog all work with byte
+offsets into the file, so they are not available for compressed catalogs,
+and neither is the parallel CSV parser.
+"""
+
+CODECS = {".gz": "gzip", ".xz": "lzma", ".bz2": "bz2"}
+
+
+def get_codec(file_path: WindowsPath):
+    """
+    Returns the compression module a catalog file is compressed with.
+
+    Parameter:
+        file_path (WindowsPath): Path to the catalog.
+
+    Returns:
+        str: The name of the module ("gzip", "lzma" or "bz2"), or None if
+             the file is not compressed.
+    """
+    return CODECS.get(file_path.suffix.lower())
+
+
+def is_compressed(file_path: WindowsPath) -> bool:
+    """
+    Tells whether a catalog file is compressed.
+
+    Parameter:
+        file_path (WindowsPath): Path to the catalog.
+
+    Returns:
+        bool: True if the name ends with a compression suffix.
+    """
+    return get_codec(file_path) is not None
+
+
+def open_catalog(file_path, mode: str = "r", codec: str = None, **kwargs):
+    """
+    Opens a catalog file, decompressing or compressing it on the fly.
+
+    Parameters:
+        file_path: Path to the catalog, or an open binary file to wrap
+                   if `codec` is given.
+        mode (str): "r" or "w", optionally with "b" for bytes.
+        codec (str): The compression module to use; by default it is told
+                     from the name of `file_path`.
+        **kwargs: Further keyword arguments for text mode, e.g. `newline`.
+
+    Returns:
+        The open file; a plain `open` if the catalog is not compressed.
+    """
+    if codec is None:
+        codec = get_codec(file_path)
+    if codec is None:
+        return open(file_path, mode, **kwargs)
+
+    if "b" not in mode and "t" not in mode:
+        mode += "t"
+    writing = "w" in mode or "a" in mode
+    level = constant.COMPRESSION_LEVEL
+    if codec == "gzip":
+        import gzip
+
+        return gzip.open(file_path, mode, compresslevel=level, **kwargs)
+    if codec == "bz2":
+        import bz2
+
+        return bz2.open(file_path, mode, compresslevel=max(level, 1),
+                        **kwargs)
+
+    import lzma
+
+    return lzma.open(file_path, mode, preset=level if writing else None,
+                     **kwargs)
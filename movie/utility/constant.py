@@ -27,6 +27,11 @@ Constants:
         MOVIES_SORTED_BY_RATING (str): Option for sorting movies by rating.
         MOVIES_SORTED_BY_YEAR (str): Option for sorting movies by release year.
         FILTER_MOVIES (str): Option for filtering movies by rating and year.
+        SEARCH_NOTES (str): Option for a ranked search of notes and titles.
+        GROUP_MOVIES (str): Option for aggregating ratings per year, decade
+                            or rating band.
+        SIMILAR_MOVIES (str): Option for listing the movies closest to a
+                              movie in year and rating.
 
     Return Constants:
         RESULT (str): Key indicating the result of a service operation.
@@ -36,6 +41,104 @@ Constants:
         MEDIAN_RATING (str): Key for the median movie rating.
         BEST_MOVIE (str): Key for the highest-rated movie.
         WORST_MOVIE (str): Key for the lowest-rated movie.
+
+    Extended Statistics Constants:
+        STATS_COUNT (str): Key for the number of movies.
+        STATS_MEAN (str): Key for the mean rating.
+        STATS_MEDIAN (str): Key for the median rating.
+        STATS_VARIANCE (str): Key for the sample variance of the ratings.
+        STATS_STD_DEV (str): Key for the sample standard deviation.
+        STATS_MIN (str): Key for the lowest rating.
+        STATS_MAX (str): Key for the highest rating.
+        STATS_PERCENTILES (str): Key for the ratings at
+                                 STATS_PERCENTILE_POINTS.
+        STATS_HISTOGRAM (str): Key for the (low, high, count) rating buckets,
+                               STATS_HISTOGRAM_BUCKETS equal buckets from 0
+                               to STATS_RATING_MAX.
+        STATS_YEARS (str): Key for the number of movies per year.
+        STATS_DECADES (str): Key for the GROUP_AGGREGATES per decade.
+        GROUP_KEYS (tuple): What movies can be grouped by: GROUP_YEAR,
+                            GROUP_DECADE and GROUP_RATING_BAND (the
+                            histogram buckets).
+        GROUP_AGGREGATES (tuple): The aggregates computed per group.
+
+    Load Status Constants:
+        LOAD_STATE (str): Key for the state of a catalog load
+                          (pending, loading, loaded or failed).
+        LOAD_ROWS (str): Key for the number of movies parsed so far.
+        LOAD_BYTES_READ (str): Key for the number of characters read so far.
+        LOAD_BYTES_TOTAL (str): Key for the size of the catalog file.
+        LOAD_DURATION (str): Key for the load duration in seconds.
+
+    Append Constants:
+        FSYNC_POLICY (str): Whether appended rows and records are fsynced
+                            before a write returns (FSYNC_ALWAYS) or left to
+                            the operating system to flush (FSYNC_NEVER).
+
+    Poster Dictionary Constants:
+        POSTER_PREFIXES (tuple): The URL prefixes posters are stored
+                                 without in the snapshot sidecar; the
+                                 first entry must stay the empty string.
+        POSTER_SUFFIXES (tuple): The URL suffixes, likewise; at most 16
+                                 entries each.
+
+    Compression Constants:
+        COMPRESSION_LEVEL (int): The level catalogs ending with `.gz`,
+                                 `.xz` or `.bz2` are compressed with, from
+                                 0 (fastest) to 9 (smallest).
+
+    Tail Constants (JSON Lines storage):
+        TAIL_CHANGES (str): Key for the (title, entry) records read.
+        TAIL_OFFSET (str): Key for the byte offset to resume from.
+        TAIL_FILE_ID (str): Key for the id of the file that was read.
+        TAIL_RESET (str): Key flagging a restart after a compaction.
+
+    Change Event Constants:
+        EVENT_VERSION (str): Key for the catalog version an event created.
+        EVENT_TYPE (str): Key for the event type, one of EVENT_ADDED,
+                          EVENT_DELETED, EVENT_RATING_UPDATED and
+                          EVENT_UPDATED (any other change of an entry).
+        EVENT_TITLE (str): Key for the title of the changed movie.
+        EVENT_OLD (str): Key for the value before the change (the entry,
+                         or the rating for EVENT_RATING_UPDATED).
+        EVENT_NEW (str): Key for the value after the change.
+        FEED_EVENTS (str): Key for the events read from the change feed.
+        FEED_VERSION (str): Key for the version to resume the feed from.
+        FEED_RESET (str): Key flagging that older events were trimmed from
+                          the change log and the consumer must rebuild.
+
+    Full-Text Search Constants:
+        BM25_K1 (float): How quickly repeating a word stops raising a
+                         movie's score.
+        BM25_B (float): How strongly scores are normalized by the length of
+                        a movie's text.
+        SEARCH_LIMIT (int): The number of ranked results returned.
+
+    Similar Movies Constants:
+        NEIGHBOR_FEATURES (tuple): The (key, scale) of every numeric
+                                   feature movies are compared by; a feature
+                                   is divided by its scale, so a decade
+                                   weighs as much as a rating point.
+        NEIGHBOR_COUNT (int): The number of similar movies returned.
+        NEIGHBOR_REBUILD_MIN (int): Changes tolerated before the k-d tree is
+                                    rebuilt, at least.
+        NEIGHBOR_REBUILD_RATIO (int): Rebuild once the changes exceed the
+                                      tree size divided by this ratio.
+
+    Query Cache Constants:
+        QUERY_CACHE_SIZE (int): The number of query results memoized.
+        CACHE_HITS (str): Key for the number of queries served from cache.
+        CACHE_MISSES (str): Key for the number of queries computed.
+        CACHE_ENTRIES (str): Key for the number of results cached.
+        CACHE_CAPACITY (str): Key for the maximum number of results cached.
+
+    Query Plan Constants:
+        PLAN_ACCESS (str): Key for the access path the planner chose.
+        PLAN_ESTIMATES (str): Key for the candidate count of every usable
+                              access path.
+        PLAN_SORT (str): Key for the ordering applied to the results.
+        PLAN_ROWS (str): Key for the number of movies returned.
+        PLAN_TIMINGS (str): Key for the seconds spent per step.
 """
 
 # OTHERS CONSTANTS
@@ -47,6 +150,28 @@ PACKAGE_REPOSITORY = "data"
 STATIC_DIRECTORY = "_static"
 TEMPLATE_HTML_FILE = "index_template.html"
 INDEX_HTML_FILE = "index.html"
+SIDECAR_FILE_SUFFIX = ".snapshot"
+VERSION_STAMP_CHECK_BYTES = 4096
+PARALLEL_LOAD_THRESHOLD = 64 * 1024 * 1024
+LOAD_PROGRESS_INTERVAL = 4096
+JSONL_COMPACTION_MIN_LINES = 1000
+JSONL_COMPACTION_RATIO = 2
+INDEX_FILE_SUFFIX = ".index"
+INDEX_DELTA_MIN_ENTRIES = 1024
+CHANGE_LOG_SUFFIX = ".changes"
+CHANGE_LOG_MAX_EVENTS = 10000
+INDEX_DELTA_RATIO = 8
+BM25_K1 = 1.2
+BM25_B = 0.75
+SEARCH_LIMIT = 10
+NEIGHBOR_COUNT = 5
+NEIGHBOR_REBUILD_MIN = 256
+NEIGHBOR_REBUILD_RATIO = 16
+QUERY_CACHE_SIZE = 128
+FSYNC_ALWAYS = "always"
+FSYNC_NEVER = "never"
+FSYNC_POLICY = FSYNC_ALWAYS
+COMPRESSION_LEVEL = 6
 
 RATING_KEY = "rating"
 YEAR_KEY = "year"
@@ -54,6 +179,11 @@ TITLE_KEY = "title"
 POSTER_KEY = "poster"
 NOTES_KEY = "notes"
 IMDBID_KEY = "imdbid"
+DELETED_KEY = "deleted"
+NEIGHBOR_FEATURES = ((YEAR_KEY, 10.0), (RATING_KEY, 1.0))
+POSTER_PREFIXES = ("", "https://m.media-amazon.com/images/M/",
+                   "https://ia.media-imdb.com/images/M/")
+POSTER_SUFFIXES = ("", "._V1_SX300.jpg")
 
 EMPTY = ""
 
@@ -93,6 +223,9 @@ MOVIES_SORTED_BY_RATING = "8"
 MOVIES_SORTED_BY_YEAR = "9"
 FILTER_MOVIES = "10"
 GENERATE_MOVIES = "11"
+SEARCH_NOTES = "12"
+GROUP_MOVIES = "13"
+SIMILAR_MOVIES = "14"
 
 # RETURN CONSTANT
 
@@ -103,3 +236,68 @@ AVERAGE_RATING = "average_rating"
 MEDIAN_RATING = "median_rating"
 BEST_MOVIE = "best_movie"
 WORST_MOVIE = "worst_movie"
+
+# EXTENDED STATISTICS CONSTANTS
+
+STATS_COUNT = "count"
+STATS_MEAN = "mean"
+STATS_MEDIAN = "median"
+STATS_VARIANCE = "variance"
+STATS_STD_DEV = "std_dev"
+STATS_MIN = "min"
+STATS_MAX = "max"
+STATS_PERCENTILES = "percentiles"
+STATS_HISTOGRAM = "histogram"
+STATS_YEARS = "years"
+STATS_DECADES = "decades"
+STATS_PERCENTILE_POINTS = (10, 25, 50, 75, 90)
+STATS_HISTOGRAM_BUCKETS = 10
+STATS_RATING_MAX = 10.0
+GROUP_YEAR = "year"
+GROUP_DECADE = "decade"
+GROUP_RATING_BAND = "rating_band"
+GROUP_KEYS = (GROUP_YEAR, GROUP_DECADE, GROUP_RATING_BAND)
+GROUP_AGGREGATES = (STATS_COUNT, STATS_MEAN, STATS_MIN, STATS_MAX,
+                    STATS_MEDIAN)
+
+# LOAD STATUS CONSTANTS
+
+LOAD_STATE = "state"
+LOAD_ROWS = "rows"
+LOAD_BYTES_READ = "bytes_read"
+LOAD_BYTES_TOTAL = "bytes_total"
+LOAD_DURATION = "duration"
+
+TAIL_CHANGES = "changes"
+TAIL_OFFSET = "offset"
+TAIL_FILE_ID = "file_id"
+TAIL_RESET = "reset"
+
+LOAD_PENDING = "pending"
+LOAD_LOADING = "loading"
+LOAD_LOADED = "loaded"
+LOAD_FAILED = "failed"
+
+EVENT_VERSION = "version"
+EVENT_TYPE = "type"
+EVENT_TITLE = "title"
+EVENT_OLD = "old"
+EVENT_NEW = "new"
+EVENT_ADDED = "added"
+EVENT_DELETED = "deleted"
+EVENT_RATING_UPDATED = "rating_updated"
+EVENT_UPDATED = "updated"
+FEED_EVENTS = "events"
+FEED_VERSION = "version"
+FEED_RESET = "reset"
+
+PLAN_ACCESS = "access"
+PLAN_ESTIMATES = "estimates"
+PLAN_SORT = "sort"
+PLAN_ROWS = "rows"
+PLAN_TIMINGS = "timings"
+
+CACHE_HITS = "hits"
+CACHE_MISSES = "misses"
+CACHE_ENTRIES = "entries"
+CACHE_CAPACITY = "capacity"
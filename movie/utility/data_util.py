@@ -1,19 +1,43 @@
-import csv
-import json
+import hashlib
+import os
+import stat
+import sys
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import WindowsPath
 
 from movie.utility import misc_util, constant
+from movie.utility.compression_util import get_codec, is_compressed, \
+    open_catalog
+from movie.utility.snapshot_util import CatalogOverlay, CatalogSnapshot
 
-cached_data = None
+cached_data = {}
+cached_data_pending = {}
+cached_data_stamps = {}
+cached_data_guards = {}
+cached_data_guard = threading.Lock()
 cached_data_html = None
+load_status = {}
+jsonl_line_counts = {}
+process_umask = None
+process_umask_guard = threading.Lock()
 
 
-def load_data(file_path: WindowsPath) -> misc_util.result_message:
+def load_data(file_path: WindowsPath,
+              progress: dict = None) -> misc_util.result_message:
     """
-    Loads data from a file (JSON or CSV) into a dictionary.
+    Loads data from a file (JSON, JSON Lines or CSV) into a dictionary.
+
+    Files ending with `.gz`, `.xz` or `.bz2` are decompressed while they
+    are parsed (see `compression_util`). Uncompressed CSV files of at least
+    `PARALLEL_LOAD_THRESHOLD` bytes are parsed on all CPU cores by
+    `parallel_util.load_csv_parallel`.
 
     Parameter:
         file_path (WindowsPath): Path to the file.
+        progress (dict): Optional load status, updated with the number of
+                         rows and characters read while parsing.
 
     Returns:
         misc_util.result_message: A dictionary containing:
@@ -24,17 +48,34 @@ def load_data(file_path: WindowsPath) -> misc_util.result_message:
     payload = {}
 
     try:
-        if "json" in file_path.name:
-            with open(file_path, "r") as handle:
-                payload = json.load(handle)
+        if "jsonl" in file_path.name:
+            from movie.utility.jsonl_util import read_jsonl
+
+            with open_catalog(file_path, "r") as handle:
+                payload, lines = read_jsonl(handle, progress)
+            jsonl_line_counts[file_path] = lines
+        elif "json" in file_path.name:
+            from movie.utility.json_stream_util import read_json_object
+
+            with open_catalog(file_path, "r") as handle:
+                payload = read_json_object(handle, progress)
+        elif ("csv" in file_path.name and not is_compressed(file_path)
+              and (os.path.getsize(file_path)
+                   >= constant.PARALLEL_LOAD_THRESHOLD)
+              and (os.cpu_count() or 1) > 1):
+            from movie.utility.parallel_util import load_csv_parallel
+
+            return load_csv_parallel(file_path, progress=progress)
         elif "csv" in file_path.name:
-            with open(file_path, mode='r') as handle:
-                csv_reader = csv.DictReader(handle)
-                for row in list(csv_reader):
-                    payload.update(build_dict(row[constant.TITLE_KEY],
-                                              row[constant.YEAR_KEY],
-                                              row[constant.RATING_KEY],
-                                              row[constant.POSTER_KEY]))
+            import csv
+
+            with open_catalog(file_path, mode='r', newline='') as handle:
+                lines = handle
+                if progress is not None:
+                    lines = track_progress(handle, progress)
+                csv_reader = csv.reader(lines)
+                decode_csv_rows(next(csv_reader, []), csv_reader, payload,
+                                progress)
     except FileNotFoundError:
         return (misc_util.result_message
                 (False,
@@ -54,10 +95,103 @@ def load_data(file_path: WindowsPath) -> misc_util.result_message:
                  payload))
 
 
+def decode_csv_rows(header: list, rows, payload: dict,
+                    progress: dict = None) -> dict:
+    """
+    Decodes CSV rows straight into the catalog payload.
+
+    The column positions are resolved once from the header, so a row costs a
+    single entry dict instead of a `DictReader` row, a `build_dict` result
+    and a merge. Ratings and years are converted once per distinct value and
+    the resulting objects shared, and notes are interned, since most movies
+    repeat the same handful of values. The optional notes and imdbid columns
+    are kept when the file has them.
+
+    Parameters:
+        header (list): The column names of the header row.
+        rows: An iterable of the remaining rows, e.g. a `csv.reader`.
+        payload (dict): The payload to add the movies to.
+        progress (dict): Optional load status, updated with the row count.
+
+    Returns:
+        dict: `payload`.
+    """
+    if not header:
+        return payload
+
+    columns = {name: index for index, name in enumerate(header)}
+    title_index = columns[constant.TITLE_KEY]
+    rating_index = columns[constant.RATING_KEY]
+    year_index = columns[constant.YEAR_KEY]
+    poster_index = columns[constant.POSTER_KEY]
+    notes_index = columns.get(constant.NOTES_KEY)
+    imdbid_index = columns.get(constant.IMDBID_KEY)
+
+    rating_key = constant.RATING_KEY
+    year_key = constant.YEAR_KEY
+    poster_key = constant.POSTER_KEY
+    notes_key = constant.NOTES_KEY
+    imdbid_key = constant.IMDBID_KEY
+    ratings = {}
+    years = {}
+    intern = sys.intern
+
+    count = 0
+    for row in rows:
+        if not row:
+            continue
+
+        rating = ratings.get(row[rating_index])
+        if rating is None:
+            rating = ratings[row[rating_index]] = float(row[rating_index])
+        year = years.get(row[year_index])
+        if year is None:
+            year = years[row[year_index]] = int(row[year_index])
+
+        entry = {rating_key: rating, year_key: year,
+                 poster_key: row[poster_index]}
+        if notes_index is not None:
+            entry[notes_key] = intern(row[notes_index])
+        if imdbid_index is not None:
+            entry[imdbid_key] = row[imdbid_index]
+        payload[row[title_index]] = entry
+
+        count += 1
+        if (progress is not None
+                and not count % constant.LOAD_PROGRESS_INTERVAL):
+            progress[constant.LOAD_ROWS] = count
+
+    if progress is not None:
+        progress[constant.LOAD_ROWS] = count
+    return payload
+
+
+def track_progress(lines, progress: dict):
+    """
+    Passes lines through while counting the characters read.
+
+    Parameters:
+        lines: An iterable of text lines, e.g. an open file.
+        progress (dict): The load status to update.
+
+    Yields:
+        str: The lines of `lines`, unchanged.
+    """
+    for line in lines:
+        progress[constant.LOAD_BYTES_READ] += len(line)
+        yield line
+
+
 def write_data(details: dict,
                file_path: WindowsPath) -> misc_util.result_message:
     """
-    Writes data to a file in JSON, CSV, or HTML format.
+    Writes data to a file in JSON, JSON Lines, CSV, or HTML format.
+
+    The data is written to a temporary file in the same directory which then
+    atomically replaces the target, so readers never see a partial file.
+    Catalogs ending with `.gz`, `.xz` or `.bz2` are compressed while they
+    are written, at `COMPRESSION_LEVEL`. The title index of a rewritten CSV
+    or JSON Lines catalog is dropped, its offsets no longer apply.
 
     Parameter:
         details (dict): The data to write.
@@ -68,25 +202,34 @@ def write_data(details: dict,
             - result (bool): Status of the operation.
             - message (str): Success or error message.
     """
+    from movie.utility.index_util import drop_index
+
     try:
-        if "json" in file_path.name:
-            with open(file_path, 'w') as handle:
-                handle.write(json.dumps(details))
+        if "jsonl" in file_path.name:
+            from movie.utility.jsonl_util import write_jsonl
+
+            with atomic_open(file_path, 'w') as handle:
+                write_jsonl(details, handle)
+            jsonl_line_counts[file_path] = len(details)
+            drop_index(file_path)
+        elif "json" in file_path.name:
+            from movie.utility.json_stream_util import write_json_object
+
+            with atomic_open(file_path, 'w') as handle:
+                write_json_object(details, handle)
         elif "csv" in file_path.name:
-            with open(file_path, mode='w', newline='') as handle:
+            import csv
+
+            with atomic_open(file_path, mode='w', newline='') as handle:
                 csv_writer = csv.writer(handle)
                 csv_writer.writerow([constant.TITLE_KEY, constant.RATING_KEY,
                                      constant.YEAR_KEY, constant.POSTER_KEY,
                                      constant.NOTES_KEY, constant.IMDBID_KEY])
-                for key, value in details.items():
-                    csv_writer.writerow([key,
-                                         value[constant.RATING_KEY],
-                                         value[constant.YEAR_KEY],
-                                         value[constant.POSTER_KEY],
-                                         value[constant.NOTES_KEY],
-                                         value[constant.IMDBID_KEY]])
+                csv_writer.writerows(encode_csv_row(key, value)
+                                     for key, value in details.items())
+            drop_index(file_path)
         elif "html" in file_path.name:
-            with open(file_path, 'w') as handle:
+            with atomic_open(file_path, 'w') as handle:
                 handle.write(details)
     except FileNotFoundError:
         return (misc_util.result_message
@@ -108,6 +251,134 @@ def write_data(details: dict,
                  ""))
 
 
+def encode_csv_row(title: str, entry: dict) -> list:
+    """
+    Lays out a movie as a row of the CSV columns written by `write_data`.
+
+    Movies loaded from a CSV file without the notes and imdbid columns are
+    written with empty values for them.
+
+    Parameters:
+        title (str): The movie title.
+        entry (dict): The movie entry.
+
+    Returns:
+        list: The row.
+    """
+    return [title,
+            entry[constant.RATING_KEY],
+            entry[constant.YEAR_KEY],
+            entry[constant.POSTER_KEY],
+            entry.get(constant.NOTES_KEY, ""),
+            entry.get(constant.IMDBID_KEY, "")]
+
+
+@contextmanager
+def atomic_open(file_path: WindowsPath, mode: str = 'w', **kwargs):
+    """
+    Opens a temporary file that atomically replaces `file_path` on success.
+
+    The temporary file lives in the target's directory so `os.replace` stays
+    on one filesystem. Its content is flushed and fsynced before the
+    replacement, and it keeps the permissions of the file it replaces; a new
+    file gets the permissions `open` would give it under the process umask,
+    rather than the owner-only ones of `tempfile.mkstemp`. On error the
+    temporary file is removed and the target is left untouched.
+
+    If `file_path` ends with a compression suffix, the content is compressed
+    on its way to the temporary file.
+
+    Parameters:
+        file_path (WindowsPath): Path to the file to replace.
+        mode (str): The mode passed to `open`.
+        **kwargs: Further keyword arguments passed to `open`.
+
+    Yields:
+        The open handle of the temporary file.
+    """
+    import tempfile
+
+    descriptor, temp_name = tempfile.mkstemp(dir=file_path.parent,
+                                             prefix=f".{file_path.name}.",
+                                             suffix=".tmp")
+    try:
+        if is_compressed(file_path):
+            with open(descriptor, 'wb') as raw:
+                with open_catalog(raw, mode, get_codec(file_path),
+                                  **kwargs) as handle:
+                    yield handle
+                raw.flush()
+                os.fsync(raw.fileno())
+        else:
+            with open(descriptor, mode, **kwargs) as handle:
+                yield handle
+                handle.flush()
+                os.fsync(handle.fileno())
+        if os.path.exists(file_path):
+            os.chmod(temp_name, stat.S_IMODE(os.stat(file_path).st_mode))
+        else:
+            os.chmod(temp_name, 0o666 & ~get_umask())
+        os.replace(temp_name, file_path)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
+
+
+def get_umask() -> int:
+    """
+    Returns the file mode creation mask of the process.
+
+    The mask can only be read by setting it, so it is read once and kept.
+
+    Returns:
+        int: The umask.
+    """
+    global process_umask
+
+    if process_umask is None:
+        with process_umask_guard:
+            if process_umask is None:
+                umask = os.umask(0o022)
+                os.umask(umask)
+                process_umask = umask
+    return process_umask
+
+
+def get_version_stamp(file_path: WindowsPath):
+    """
+    Returns a stamp identifying the current version of a file on disk.
+
+    Every write replaces the file with a new inode, so a changed stamp means
+    another writer (possibly another process) has touched the file. The
+    inode alone is not enough: a rewrite may be given back an inode the
+    file had before, with the same size, and within the resolution of the
+    modification time. The stamp therefore also holds a digest of the first
+    and the last `VERSION_STAMP_CHECK_BYTES` bytes of the file, which covers
+    the header and the latest appends.
+
+    Parameter:
+        file_path (WindowsPath): Path to the file.
+
+    Returns:
+        tuple: (inode, size, mtime in nanoseconds, content digest), or None
+               if the file does not exist.
+    """
+    try:
+        with open(file_path, "rb") as handle:
+            file_stat = os.fstat(handle.fileno())
+            digest = hashlib.blake2b(digest_size=8)
+            digest.update(handle.read(constant.VERSION_STAMP_CHECK_BYTES))
+            tail = max(file_stat.st_size - constant.VERSION_STAMP_CHECK_BYTES,
+                       handle.tell())
+            handle.seek(tail)
+            digest.update(handle.read(file_stat.st_size - tail))
+    except OSError:
+        return None
+    return (file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns,
+            digest.digest())
+
+
 def build_dict_poster(title: str, year: str, rating: str,
                       imdbid: str, poster: str) -> dict:
     """
@@ -172,17 +443,614 @@ def fetch_data(file_path: WindowsPath) -> misc_util.result_message:
     """
     Retrieves data from a file, utilizing a cached version if available.
 
+    The cache is kept per file, and the first load is guarded so that
+    concurrent callers parse the file only once. A cached version is only
+    used while the file's version stamp is unchanged; if another process
+    has replaced the file in the meantime, it is loaded again.
+
+    The payload of a successful load is an immutable `CatalogSnapshot`, so
+    callers may read it without any locking while writers publish newer
+    versions. Changes appended since the snapshot was built are applied to
+    it first (see `publish_data`).
+
     Parameter:
         file_path (WindowsPath): Path to the file.
 
     Returns:
         misc_util.result_message: Cached or newly loaded file data.
     """
-    global cached_data
+    details = fetch_current(file_path)
+    if isinstance(details[constant.PAYLOAD], CatalogOverlay):
+        details = apply_pending(file_path)
+    return details
+
+
+def fetch_current(file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Retrieves the current catalog of a file to stage changes on, like
+    `fetch_data` but without applying the changes appended since the cached
+    snapshot was built.
+
+    Parameter:
+        file_path (WindowsPath): Path to the file.
+
+    Returns:
+        misc_util.result_message: The cached or newly loaded file data,
+                                  whose payload is the cached snapshot or,
+                                  while appended changes are pending, a
+                                  `CatalogOverlay` holding them on top of
+                                  it.
+    """
+    stamp = get_version_stamp(file_path)
+    details = cached_data.get(file_path)
+
+    if details is None or cached_data_stamps.get(file_path) != stamp:
+        with get_cache_guard(file_path):
+            stamp = get_version_stamp(file_path)
+            details = cached_data.get(file_path)
+            if details is None or cached_data_stamps.get(file_path) != stamp:
+                cached_data_pending.pop(file_path, None)
+                details = load_data_with_status(file_path)
+                if details[constant.RESULT]:
+                    details[constant.PAYLOAD] = CatalogSnapshot(
+                        details[constant.PAYLOAD],
+                        get_cached_version(file_path) + 1)
+                cached_data[file_path] = details
+                cached_data_stamps[file_path] = stamp
+
+    pending = cached_data_pending.get(file_path)
+    if pending is not None:
+        return misc_util.result_message(True, details[constant.MESSAGE],
+                                        pending)
+    return details
+
+
+def apply_pending(file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Applies the changes appended to a file since its cached snapshot was
+    built, publishing the next snapshot to readers.
+
+    Parameter:
+        file_path (WindowsPath): Path to the file.
+
+    Returns:
+        misc_util.result_message: The cached data.
+    """
+    with get_cache_guard(file_path):
+        pending = cached_data_pending.pop(file_path, None)
+        if pending is not None:
+            cached_data[file_path] = misc_util.result_message(
+                True, "File loaded successfully.", pending.snapshot())
+        return cached_data[file_path]
+
+
+def get_cached_data(file_path: WindowsPath):
+    """
+    Returns the cached data of a file without loading it.
+
+    Parameter:
+        file_path (WindowsPath): Path to the file.
+
+    Returns:
+        misc_util.result_message: The cached data, or None if the file has
+                                  not been loaded or changed since.
+    """
+    if not is_cached(file_path):
+        return None
+    if file_path in cached_data_pending:
+        return apply_pending(file_path)
+    return cached_data.get(file_path)
+
+
+def is_cached(file_path: WindowsPath) -> bool:
+    """
+    Tells whether the current version of a file is in the cache.
+
+    Parameter:
+        file_path (WindowsPath): Path to the file.
+
+    Returns:
+        bool: True if the file is loaded and has not changed since.
+    """
+    return (file_path in cached_data
+            and cached_data_stamps.get(file_path) == get_version_stamp(
+                file_path))
+
+
+def get_cache_guard(file_path: WindowsPath) -> threading.Lock:
+    """
+    Returns the lock serializing loads and publishes of one file's cache.
+
+    Parameter:
+        file_path (WindowsPath): Path to the file.
+
+    Returns:
+        threading.Lock: The lock associated with the file.
+    """
+    with cached_data_guard:
+        return cached_data_guards.setdefault(file_path, threading.Lock())
+
+
+def load_data_with_status(file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Loads a file while recording its progress and duration in `load_status`.
+
+    A valid snapshot sidecar is preferred over parsing the file; after a
+    successful parse a fresh sidecar is written for the next process. A
+    daemon thread, like the one of `prefetch_data`, leaves the write to a
+    thread of its own: the interpreter kills daemon threads at exit, which
+    could leave the temporary file of a half-written sidecar behind, while
+    it waits for the writer thread.
+
+    Parameter:
+        file_path (WindowsPath): Path to the file.
+
+    Returns:
+        misc_util.result_message: The result of `load_data`.
+    """
+    stamp = get_version_stamp(file_path)
+    progress = {constant.LOAD_STATE: constant.LOAD_LOADING,
+                constant.LOAD_ROWS: 0,
+                constant.LOAD_BYTES_READ: 0,
+                constant.LOAD_BYTES_TOTAL: stamp[1] if stamp else 0,
+                constant.LOAD_DURATION: None}
+    load_status[file_path] = progress
+
+    start = time.perf_counter()
+    details = load_sidecar(file_path)
+
+    if details is None:
+        details = load_data(file_path, progress)
+        if (details[constant.RESULT]
+                and not threading.current_thread().daemon):
+            write_sidecar(details[constant.PAYLOAD], file_path)
+        elif details[constant.RESULT]:
+            try:
+                threading.Thread(target=write_sidecar,
+                                 args=(details[constant.PAYLOAD], file_path),
+                                 name=f"sidecar-{file_path.name}",
+                                 daemon=False).start()
+            except RuntimeError:
+                pass  # The interpreter is already shutting down.
+    else:
+        if "jsonl" in file_path.name and not is_compressed(file_path):
+            from movie.utility.jsonl_util import count_lines
 
-    if cached_data is None:
-        cached_data = load_data(file_path)
-    return cached_data
+            jsonl_line_counts[file_path] = count_lines(file_path)
+        progress[constant.LOAD_ROWS] = len(details[constant.PAYLOAD])
+        progress[constant.LOAD_BYTES_READ] = progress[
+            constant.LOAD_BYTES_TOTAL]
+
+    progress[constant.LOAD_DURATION] = time.perf_counter() - start
+    progress[constant.LOAD_STATE] = (constant.LOAD_LOADED
+                                     if details[constant.RESULT]
+                                     else constant.LOAD_FAILED)
+    return details
+
+
+def get_load_status(file_path: WindowsPath) -> dict:
+    """
+    Returns the progress of the most recent load of a file.
+
+    Parameter:
+        file_path (WindowsPath): Path to the file.
+
+    Returns:
+        dict: A copy of the load status with the state, the rows and
+              characters read so far, the file size and the duration in
+              seconds (None while loading).
+    """
+    progress = load_status.get(file_path)
+
+    if progress is None:
+        return {constant.LOAD_STATE: constant.LOAD_PENDING,
+                constant.LOAD_ROWS: 0,
+                constant.LOAD_BYTES_READ: 0,
+                constant.LOAD_BYTES_TOTAL: 0,
+                constant.LOAD_DURATION: None}
+    return dict(progress)
+
+
+def prefetch_data(file_path: WindowsPath) -> threading.Thread:
+    """
+    Starts loading a file into the cache in a background thread.
+
+    Callers that fetch the data before the load has finished simply wait for
+    it on the cache guard instead of parsing the file a second time. The
+    storages only start it when asked to (`prefetch`), since it reads the
+    whole file even if the title index could answer the first lookups.
+
+    Parameter:
+        file_path (WindowsPath): Path to the file.
+
+    Returns:
+        threading.Thread: The started loader thread.
+    """
+    thread = threading.Thread(target=fetch_data, args=(file_path,),
+                              name=f"prefetch-{file_path.name}", daemon=True)
+    thread.start()
+    return thread
+
+
+def get_cached_version(file_path: WindowsPath) -> int:
+    """
+    Returns the version of the catalog currently cached for a file.
+
+    Parameter:
+        file_path (WindowsPath): Path to the file.
+
+    Returns:
+        int: The snapshot version, or 0 if nothing is cached.
+    """
+    details = cached_data.get(file_path)
+
+    if details is None or not details[constant.RESULT]:
+        return 0
+    return details[constant.PAYLOAD].version
+
+
+def publish_data(overlay: CatalogOverlay,
+                 file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Writes the changes staged in an overlay on the current catalog to disk
+    as the next version and publishes it to readers.
+
+    The cache only changes once the changes have been written successfully,
+    so a failed write leaves both the file and the cache at the previous
+    version. Readers holding an older snapshot keep it until they let go of
+    it.
+
+    When the format supports it (see `encode_appends`), only the changes
+    are appended to the file instead of rewriting it. The cached snapshot
+    is then left as it is and the changes are kept pending next to it;
+    `fetch_data` applies them with a single `evolve` when a reader next
+    asks for the catalog, and writers stage on top of them meanwhile. An
+    append thus costs the same whatever the size of the catalog.
+
+    Parameters:
+        overlay (CatalogOverlay): The changes, staged on the catalog
+                                  returned by `fetch_current`.
+        file_path (WindowsPath): Path to the file.
+
+    Returns:
+        misc_util.result_message: The result of the write.
+    """
+    snapshot = None
+    lines = encode_appends(overlay, file_path) if overlay else None
+
+    if lines is None:
+        snapshot = overlay.snapshot()
+        result = write_data(snapshot, file_path)
+    else:
+        result = append_data(file_path, lines)
+
+    if result[constant.RESULT]:
+        with get_cache_guard(file_path):
+            if snapshot is not None:
+                cached_data_pending.pop(file_path, None)
+                cached_data[file_path] = misc_util.result_message(
+                    True, "File loaded successfully.", snapshot)
+            else:
+                pending = cached_data_pending.get(file_path)
+                if pending is None:
+                    pending = CatalogOverlay(
+                        cached_data[file_path][constant.PAYLOAD])
+                    cached_data_pending[file_path] = pending
+                pending.apply(overlay)
+            cached_data_stamps[file_path] = get_version_stamp(file_path)
+        if snapshot is not None:
+            write_sidecar(snapshot, file_path)
+        elif "jsonl" in file_path.name:
+            jsonl_line_counts[file_path] += len(lines)
+    return result
+
+
+def encode_appends(overlay: CatalogOverlay, file_path: WindowsPath):
+    """
+    Encodes the changes staged in an overlay as the lines to append to a
+    catalog file, if they can be appended rather than rewriting the file.
+
+    JSON Lines catalogs take any change until the file would hold more than
+    `JSONL_COMPACTION_RATIO` lines per live movie (and at least
+    `JSONL_COMPACTION_MIN_LINES` lines); the catalog is then compacted by a
+    full rewrite instead. CSV catalogs only take movies that are new to the
+    published catalog, and only if the file already has the full header
+    written by `write_data` and ends with a complete row.
+
+    Compressed catalogs are always rewritten.
+
+    Parameters:
+        overlay (CatalogOverlay): The changes, staged on the published
+                                  catalog.
+        file_path (WindowsPath): Path to the file.
+
+    Returns:
+        list: The lines to append, or None if the file must be rewritten.
+    """
+    changes = overlay.changes
+    deletions = overlay.deletions
+
+    if is_compressed(file_path):
+        return None
+
+    if "jsonl" in file_path.name:
+        if file_path not in jsonl_line_counts:
+            return None
+        total_lines = jsonl_line_counts[file_path] + len(changes) + len(
+            deletions)
+        if (total_lines >= constant.JSONL_COMPACTION_MIN_LINES
+                and total_lines > constant.JSONL_COMPACTION_RATIO
+                * overlay.count()):
+            return None
+
+        from movie.utility import jsonl_util
+
+        lines = [jsonl_util.encode_record(title, entry)
+                 for title, entry in changes.items()]
+        return lines + [jsonl_util.encode_tombstone(title)
+                        for title in deletions]
+
+    if "csv" in file_path.name and not deletions:
+        if (file_path not in cached_data
+                or any(title in overlay.base for title in changes)
+                or not is_csv_appendable(file_path)):
+            return None
+
+        import csv
+        import io
+
+        buffer = io.StringIO(newline='')
+        csv_writer = csv.writer(buffer)
+        csv_writer.writerows(encode_csv_row(key, value)
+                             for key, value in changes.items())
+        return [buffer.getvalue()]
+
+    return None
+
+
+def append_changes(file_path: WindowsPath,
+                   changes: dict) -> misc_util.result_message:
+    """
+    Appends changed movies to a JSON Lines catalog that is not loaded in
+    this process. The cache is left alone: the catalog is loaded with the
+    changes the next time it is fetched.
+
+    Parameters:
+        file_path (WindowsPath): Path to the file.
+        changes (dict): Movie entries added or replaced, by title.
+
+    Returns:
+        misc_util.result_message: The result of `append_data`.
+    """
+    from movie.utility.jsonl_util import encode_record
+
+    return append_data(file_path, [encode_record(title, entry)
+                                   for title, entry in changes.items()])
+
+
+def is_csv_appendable(file_path: WindowsPath) -> bool:
+    """
+    Checks that rows can be appended to a CSV catalog: its header lists
+    every column `write_data` writes, in the same order, and the file ends
+    with a line break. Only the header and the last byte are read.
+
+    Parameter:
+        file_path (WindowsPath): Path to the CSV file.
+
+    Returns:
+        bool: True if rows can be appended.
+    """
+    import csv
+
+    try:
+        with open(file_path, "r", newline='') as handle:
+            header = next(csv.reader(handle), None)
+        with open(file_path, "rb") as handle:
+            handle.seek(-1, os.SEEK_END)
+            last = handle.read(1)
+    except (OSError, csv.Error):
+        return False
+
+    return (header == [constant.TITLE_KEY, constant.RATING_KEY,
+                       constant.YEAR_KEY, constant.POSTER_KEY,
+                       constant.NOTES_KEY, constant.IMDBID_KEY]
+            and last == b"\n")
+
+
+def append_data(file_path: WindowsPath,
+                lines: list) -> misc_util.result_message:
+    """
+    Appends encoded lines to a catalog file with a single `O_APPEND` write.
+
+    The data is fsynced before returning unless `FSYNC_POLICY` is
+    `FSYNC_NEVER`. The cost depends on the size of the lines only, not on
+    the size of the catalog.
+
+    Parameters:
+        file_path (WindowsPath): Path to the file.
+        lines (list): The encoded lines to append.
+
+    Returns:
+        misc_util.result_message: A dictionary containing:
+            - result (bool): Status of the operation.
+            - message (str): Success or error message.
+    """
+    import locale
+
+    data = "".join(lines).encode(locale.getpreferredencoding(False))
+
+    try:
+        descriptor = os.open(file_path, os.O_WRONLY | os.O_APPEND)
+        try:
+            while data:
+                data = data[os.write(descriptor, data):]
+            if constant.FSYNC_POLICY != constant.FSYNC_NEVER:
+                os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+    except FileNotFoundError:
+        return (misc_util.result_message
+                (False,
+                 "Error: The file was not found.", ""))
+    except IOError:
+        return (misc_util.result_message
+                (False,
+                 "Error: Could not write to the file.",
+                 ""))
+    except Exception as e:
+        return (misc_util.result_message
+                (False,
+                 f"An unexpected error occurred: {e}",
+                 ""))
+    else:
+        return (misc_util.result_message
+                (True, "File written successfully.",
+                 ""))
+
+
+def tail_data(file_path: WindowsPath, offset: int = 0,
+              file_id: int = None) -> misc_util.result_message:
+    """
+    Reads the changes appended to a JSON Lines catalog since `offset`.
+
+    Parameters:
+        file_path (WindowsPath): Path to the file.
+        offset (int): The offset returned by the previous call, 0 to read
+                      the catalog from the start.
+        file_id (int): The file id returned by the previous call.
+
+    Returns:
+        misc_util.result_message: The changes, the offset and file id to
+                                  resume from, and the reset flag.
+    """
+    from movie.utility.jsonl_util import tail_jsonl
+
+    if is_compressed(file_path):
+        return (misc_util.result_message
+                (False,
+                 "Error: A compressed file cannot be tailed.", ""))
+
+    try:
+        payload = tail_jsonl(file_path, offset, file_id)
+    except FileNotFoundError:
+        return (misc_util.result_message
+                (False,
+                 "Error: The file was not found.", ""))
+    except Exception as e:
+        return (misc_util.result_message
+                (False,
+                 f"An unexpected error occurred: {e}",
+                 ""))
+    else:
+        return (misc_util.result_message
+                (True, "File tailed successfully.",
+                 payload))
+
+
+def get_sidecar_path(file_path: WindowsPath) -> WindowsPath:
+    """
+    Returns the path of the snapshot sidecar belonging to a catalog file.
+
+    Parameter:
+        file_path (WindowsPath): Path to the catalog file.
+
+    Returns:
+        WindowsPath: The sidecar path, `<file><SIDECAR_FILE_SUFFIX>`.
+    """
+    return file_path.with_name(file_path.name + constant.SIDECAR_FILE_SUFFIX)
+
+
+def get_file_signature(file_path: WindowsPath) -> tuple:
+    """
+    Computes the signature a sidecar is validated against.
+
+    Parameter:
+        file_path (WindowsPath): Path to the catalog file.
+
+    Returns:
+        tuple: (size, mtime in nanoseconds, BLAKE2b hex digest) of the file.
+    """
+    file_stat = os.stat(file_path)
+    digest = hashlib.blake2b()
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return file_stat.st_size, file_stat.st_mtime_ns, digest.hexdigest()
+
+
+def load_sidecar(file_path: WindowsPath):
+    """
+    Loads the catalog from its snapshot sidecar, if the sidecar is valid.
+
+    The sidecar is a pickle of the parsed payload together with the size,
+    mtime and hash of the catalog file it was made from. It is only used if
+    all three still match, which is far cheaper than parsing the catalog.
+    Posters are stored dictionary-encoded (see `poster_util`), together with
+    the prefix and suffix dictionaries they were encoded with.
+    Like the catalog itself, the sidecar is trusted data: never point the
+    application at a directory writable by untrusted users.
+
+    Parameter:
+        file_path (WindowsPath): Path to the catalog file.
+
+    Returns:
+        misc_util.result_message: The loaded data, or None if there is no
+                                  valid sidecar.
+    """
+    import pickle
+
+    from movie.utility.poster_util import decode_posters
+
+    try:
+        with open(get_sidecar_path(file_path), "rb") as handle:
+            signature, posters, payload = pickle.load(handle)
+
+        file_stat = os.stat(file_path)
+        if signature[:2] != (file_stat.st_size, file_stat.st_mtime_ns):
+            return None
+        if signature != get_file_signature(file_path):
+            return None
+        decode_posters(payload, *posters)
+    except Exception:
+        return None
+
+    return misc_util.result_message(True, "File loaded successfully.",
+                                    payload)
+
+
+def write_sidecar(details: dict,
+                  file_path: WindowsPath) -> misc_util.result_message:
+    """
+    Writes the snapshot sidecar of a catalog file.
+
+    Parameters:
+        details (dict): The payload parsed from or written to the file.
+        file_path (WindowsPath): Path to the catalog file.
+
+    Returns:
+        misc_util.result_message: Status of the operation. A failure is
+                                  harmless, the next load parses the file.
+    """
+    import pickle
+
+    from movie.utility.poster_util import encode_posters
+
+    try:
+        signature = get_file_signature(file_path)
+        payload, codes = encode_posters(details)
+        with atomic_open(get_sidecar_path(file_path), 'wb') as handle:
+            pickle.dump((signature, (codes, constant.POSTER_PREFIXES,
+                                     constant.POSTER_SUFFIXES), payload),
+                        handle, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        return (misc_util.result_message
+                (False,
+                 f"Could not write the snapshot sidecar: {e}",
+                 ""))
+    else:
+        return (misc_util.result_message
+                (True, "Snapshot sidecar written successfully.",
+                 ""))
 
 
 def load_data_html(file_path: WindowsPath) -> misc_util.result_message:
@@ -0,0 +1,571 @@
+import hashlib
+import io
+import locale
+import mmap
+import os
+import struct
+from pathlib import WindowsPath
+
+from movie.utility import constant, lock_util, misc_util
+from movie.utility.compression_util import is_compressed
+
+"""
+Persistent title and IMDb ID index of CSV and JSON Lines catalogs.
+
+The index is a `<file>.index` sidecar mapping the 64-bit hash of every
+normalized title and IMDb ID in the catalog to the byte offset of the record
+it was read from. A point lookup memory-maps the index, binary searches it
+and decodes the few records it points to, so answering "is this movie in the
+catalog?" reads a handful of pages instead of parsing the whole file.
+
+Layout (little endian):
+    header: magic, inode of the catalog, catalog bytes indexed, digest of
+            the last indexed bytes, number of sorted entries, number of
+            delta entries
+    entries: (hash, offset) pairs; first the sorted ones, ordered by hash
+             and offset, then the delta entries in file order.
+
+Both catalog formats only grow by appends between full rewrites (which
+replace the file and drop its index). The index therefore remembers how
+many bytes it covers and only scans what was appended since, adding the
+new entries to the delta; the delta is merged into the sorted entries once
+it outgrows `INDEX_DELTA_RATIO` of them. Records are resolved newest first,
+so a later JSON Lines override or tombstone wins over earlier records, just
+as it does when the catalog is loaded.
+
+An index is only extended if the catalog still has the same inode and still
+holds the same `INDEX_CHECK_BYTES` bytes before the indexed end. The inode
+alone is not enough: a rewrite by another process (or one that did not get
+to drop the index) may be given back an inode the catalog had before.
+"""
+
+INDEX_MAGIC = b"MOVIDX3\0"
+INDEX_HEADER = struct.Struct("<8sQQ8sQQ")
+INDEX_CHECK_BYTES = 4096
+INDEX_ENTRY = struct.Struct("<QQ")
+TITLE_PREFIX = "t\0"
+IMDBID_PREFIX = "i\0"
+
+
+def get_index_path(file_path: WindowsPath) -> WindowsPath:
+    """
+    Returns the path of the index sidecar of a catalog file.
+
+    Parameter:
+        file_path (WindowsPath): Path to the catalog file.
+
+    Returns:
+        WindowsPath: `<file>.index` next to the catalog.
+    """
+    return file_path.with_name(file_path.name + constant.INDEX_FILE_SUFFIX)
+
+
+def drop_index(file_path: WindowsPath) -> None:
+    """
+    Removes the index of a catalog that has been rewritten as a whole, so
+    the next lookup indexes it from scratch.
+
+    Parameter:
+        file_path (WindowsPath): Path to the catalog file.
+    """
+    try:
+        os.remove(get_index_path(file_path))
+    except OSError:
+        pass
+
+
+def is_indexable(file_path: WindowsPath) -> bool:
+    """
+    Tells whether a catalog format can be indexed: CSV and JSON Lines can,
+    JSON cannot, since it is rewritten as a whole, and neither can a
+    compressed catalog, whose records have no byte offsets of their own.
+
+    Parameter:
+        file_path (WindowsPath): Path to the catalog file.
+
+    Returns:
+        bool: True for uncompressed CSV and JSON Lines catalogs.
+    """
+    if is_compressed(file_path):
+        return False
+    return "jsonl" in file_path.name or (
+            "csv" in file_path.name and "json" not in file_path.name)
+
+
+def hash_key(key: str) -> int:
+    """
+    Hashes an index key to 64 bits.
+
+    Parameter:
+        key (str): The prefixed key.
+
+    Returns:
+        int: The hash.
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode(),
+                                          digest_size=8).digest(), "little")
+
+
+def title_hash(title: str) -> int:
+    """
+    Returns the index hash of a title.
+
+    Parameter:
+        title (str): The title.
+
+    Returns:
+        int: The hash of the normalized title.
+    """
+    return hash_key(TITLE_PREFIX + misc_util.normalize_title(title))
+
+
+def imdbid_hash(imdbid: str) -> int:
+    """
+    Returns the index hash of an IMDb ID.
+
+    Parameter:
+        imdbid (str): The IMDb ID.
+
+    Returns:
+        int: The hash of the IMDb ID.
+    """
+    return hash_key(IMDBID_PREFIX + imdbid)
+
+
+def read_csv_header(handle) -> tuple:
+    """
+    Reads the header of a CSV catalog opened in binary mode.
+
+    Parameter:
+        handle: The catalog, opened for reading in binary mode.
+
+    Returns:
+        tuple: (column names, offset of the first record).
+    """
+    import csv
+
+    handle.seek(0)
+    line = handle.readline()
+    header = next(csv.reader(io.StringIO(
+        line.decode(locale.getpreferredencoding(False)), newline='')), [])
+    return header, len(line)
+
+
+def decode_record(record: bytes, header):
+    """
+    Decodes one raw catalog record.
+
+    Parameters:
+        record (bytes): The record, including its line break.
+        header: The CSV column names, or None for a JSON Lines record.
+
+    Returns:
+        tuple: (title, entry), where entry is None for a JSON Lines
+               tombstone; None for a blank line.
+    """
+    text = record.decode(locale.getpreferredencoding(False))
+    if not text.strip():
+        return None
+
+    if header is None:
+        from movie.utility import jsonl_util
+
+        return jsonl_util.decode_record(text)
+
+    import csv
+    from movie.utility.data_util import decode_csv_rows
+
+    row = next(csv.reader(io.StringIO(text, newline='')))
+    ((title, entry),) = decode_csv_rows(header, [row], {}).items()
+    return title, entry
+
+
+def iter_records(handle, start: int, header):
+    """
+    Iterates over the complete records of a catalog from `start` on.
+
+    A CSV record ends at a line break preceded by an even number of quote
+    characters, so quoted fields spanning lines stay in one record. A last
+    record without a line break is still being appended and is left out.
+
+    Parameters:
+        handle: The catalog, opened for reading in binary mode.
+        start (int): Offset of the first record to read.
+        header: The CSV column names, or None for JSON Lines.
+
+    Yields:
+        tuple: (offset, raw record) for every complete record.
+    """
+    handle.seek(start)
+    offset = start
+    record = b""
+    quotes = 0
+
+    for line in handle:
+        if not line.endswith(b"\n"):
+            return
+        record += line
+        if header is not None:
+            quotes += line.count(b'"')
+            if quotes % 2:
+                continue
+        yield offset, record
+        offset += len(record)
+        record = b""
+        quotes = 0
+
+
+def read_record_at(handle, offset: int, header):
+    """
+    Reads and decodes the record starting at `offset`.
+
+    Parameters:
+        handle: The catalog, opened for reading in binary mode.
+        offset (int): Offset of the record.
+        header: The CSV column names, or None for JSON Lines.
+
+    Returns:
+        tuple: See `decode_record`.
+    """
+    for _, record in iter_records(handle, offset, header):
+        return decode_record(record, header)
+    return None
+
+
+def scan_entries(handle, start: int, header) -> tuple:
+    """
+    Collects the index entries of the records from `start` on.
+
+    Only the title and IMDb ID of every record are decoded; CSV records are
+    handed to one `csv.reader` in a batch rather than parsed one by one.
+
+    Parameters:
+        handle: The catalog, opened for reading in binary mode.
+        start (int): Offset of the first record to index.
+        header: The CSV column names, or None for JSON Lines.
+
+    Returns:
+        tuple: (list of (hash, offset) entries, offset after the last
+               complete record).
+    """
+    encoding = locale.getpreferredencoding(False)
+    offsets = []
+    texts = []
+    end = start
+    for offset, record in iter_records(handle, start, header):
+        end = offset + len(record)
+        offsets.append(offset)
+        texts.append(record.decode(encoding))
+
+    if header is None:
+        import json
+
+        rows = ((record.get(constant.TITLE_KEY),
+                 record.get(constant.IMDBID_KEY))
+                for record in (json.loads(text) if text.strip() else {}
+                               for text in texts))
+    else:
+        import csv
+
+        title_index = header.index(constant.TITLE_KEY)
+        imdbid_index = (header.index(constant.IMDBID_KEY)
+                        if constant.IMDBID_KEY in header else None)
+        rows = ((row[title_index] if row else None,
+                 row[imdbid_index] if row and imdbid_index is not None
+                 else None)
+                for row in csv.reader(texts))
+
+    entries = []
+    for offset, (title, imdbid) in zip(offsets, rows):
+        if title is None:
+            continue
+        entries.append((title_hash(title), offset))
+        if imdbid:
+            entries.append((imdbid_hash(imdbid), offset))
+    return entries, end
+
+
+def read_index(index_path: WindowsPath):
+    """
+    Reads the header of an index file.
+
+    Parameter:
+        index_path (WindowsPath): Path to the index.
+
+    Returns:
+        tuple: (inode, bytes indexed, digest, sorted entries, delta
+               entries), or None if there is no valid index.
+    """
+    try:
+        with open(index_path, "rb") as handle:
+            header = handle.read(INDEX_HEADER.size)
+            size = os.fstat(handle.fileno()).st_size
+    except OSError:
+        return None
+    if len(header) != INDEX_HEADER.size:
+        return None
+
+    magic, inode, indexed, digest, sorted_count, delta_count = \
+        INDEX_HEADER.unpack(header)
+    if (magic != INDEX_MAGIC or size != INDEX_HEADER.size
+            + (sorted_count + delta_count) * INDEX_ENTRY.size):
+        return None
+    return inode, indexed, digest, sorted_count, delta_count
+
+
+def get_prefix_digest(handle, indexed: int) -> bytes:
+    """
+    Hashes the last `INDEX_CHECK_BYTES` bytes before an offset of a catalog.
+
+    Parameters:
+        handle: The catalog, opened in binary mode.
+        indexed (int): The offset, i.e. the number of bytes indexed.
+
+    Returns:
+        bytes: An 8-byte BLAKE2b digest.
+    """
+    start = max(indexed - INDEX_CHECK_BYTES, 0)
+    handle.seek(start)
+    return hashlib.blake2b(handle.read(indexed - start),
+                           digest_size=8).digest()
+
+
+def write_index(index_path: WindowsPath, inode: int, indexed: int,
+                digest: bytes, sorted_entries, sorted_count: int,
+                delta_entries, delta_count: int) -> None:
+    """
+    Atomically writes an index file.
+
+    Parameters:
+        index_path (WindowsPath): Path to the index.
+        inode (int): Inode of the indexed catalog.
+        indexed (int): Number of catalog bytes indexed.
+        digest (bytes): `get_prefix_digest` of the indexed bytes.
+        sorted_entries: The packed sorted entries (bytes-like).
+        sorted_count (int): Number of sorted entries.
+        delta_entries: The packed delta entries (bytes-like).
+        delta_count (int): Number of delta entries.
+    """
+    from movie.utility.data_util import atomic_open
+
+    with atomic_open(index_path, "wb") as handle:
+        handle.write(INDEX_HEADER.pack(INDEX_MAGIC, inode, indexed, digest,
+                                       sorted_count, delta_count))
+        handle.write(sorted_entries)
+        handle.write(delta_entries)
+
+
+def pack_entries(entries) -> bytes:
+    """
+    Packs (hash, offset) entries into their binary layout.
+
+    Parameter:
+        entries: The entries.
+
+    Returns:
+        bytes: The packed entries.
+    """
+    return b"".join(INDEX_ENTRY.pack(key, offset) for key, offset in entries)
+
+
+def refresh_index(file_path: WindowsPath) -> bool:
+    """
+    Brings the index of a catalog up to date.
+
+    A catalog that was replaced since it was indexed (another inode, or
+    other bytes before the indexed end) is indexed from scratch; otherwise
+    only the records appended since are scanned.
+
+    Parameter:
+        file_path (WindowsPath): Path to the catalog.
+
+    Returns:
+        bool: True if the index is up to date, False if the catalog cannot
+              be indexed.
+    """
+    if not is_indexable(file_path):
+        return False
+
+    index_path = get_index_path(file_path)
+    with open(file_path, "rb") as handle:
+        file_stat = os.fstat(handle.fileno())
+        header = None
+        start = 0
+        if "jsonl" not in file_path.name:
+            header, start = read_csv_header(handle)
+            if constant.TITLE_KEY not in header:
+                return False
+
+        current = read_index(index_path)
+        valid = (current is not None and current[0] == file_stat.st_ino
+                 and start <= current[1] <= file_stat.st_size
+                 and current[2] == get_prefix_digest(handle, current[1]))
+        if valid:
+            inode, indexed, _, sorted_count, delta_count = current
+            if indexed == file_stat.st_size:
+                return True
+        else:
+            inode, indexed, sorted_count, delta_count = (file_stat.st_ino,
+                                                         start, 0, 0)
+
+        new_entries, end = scan_entries(handle, indexed, header)
+        digest = get_prefix_digest(handle, end)
+
+    if valid and end == indexed:
+        return True
+
+    sorted_bytes = delta_bytes = b""
+    if sorted_count or delta_count:
+        with open(index_path, "rb") as handle, mmap.mmap(
+                handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            middle = INDEX_HEADER.size + sorted_count * INDEX_ENTRY.size
+            sorted_bytes = view[INDEX_HEADER.size:middle]
+            delta_bytes = view[middle:]
+
+    delta_count += len(new_entries)
+    if delta_count > max(constant.INDEX_DELTA_MIN_ENTRIES,
+                         sorted_count // constant.INDEX_DELTA_RATIO):
+        entries = sorted(list(INDEX_ENTRY.iter_unpack(sorted_bytes))
+                         + list(INDEX_ENTRY.iter_unpack(delta_bytes))
+                         + new_entries)
+        write_index(index_path, inode, end, digest, pack_entries(entries),
+                    len(entries), b"", 0)
+    else:
+        write_index(index_path, inode, end, digest, sorted_bytes,
+                    sorted_count, delta_bytes + pack_entries(new_entries),
+                    delta_count)
+    return True
+
+
+def find_offsets(view, key: int) -> list:
+    """
+    Finds the catalog offsets of all index entries with a given hash.
+
+    Parameters:
+        view: The memory-mapped index.
+        key (int): The hash to look up.
+
+    Returns:
+        list: The offsets, newest first.
+    """
+    _, _, _, _, sorted_count, delta_count = INDEX_HEADER.unpack_from(
+        view, 0)
+    unpack = INDEX_ENTRY.unpack_from
+    low, high = 0, sorted_count
+    while low < high:
+        middle = (low + high) // 2
+        if unpack(view, INDEX_HEADER.size
+                  + middle * INDEX_ENTRY.size)[0] < key:
+            low = middle + 1
+        else:
+            high = middle
+
+    offsets = []
+    position = INDEX_HEADER.size + low * INDEX_ENTRY.size
+    end = INDEX_HEADER.size + sorted_count * INDEX_ENTRY.size
+    while position < end:
+        entry_key, offset = unpack(view, position)
+        if entry_key != key:
+            break
+        offsets.append(offset)
+        position += INDEX_ENTRY.size
+
+    delta_end = end + delta_count * INDEX_ENTRY.size
+    offsets.extend(offset for entry_key, offset in INDEX_ENTRY.iter_unpack(
+        view[end:delta_end]) if entry_key == key)
+    return sorted(offsets, reverse=True)
+
+
+def lookup(file_path: WindowsPath, key: int):
+    """
+    Decodes the catalog records an index hash points to.
+
+    The index is refreshed and the records are read under a shared file
+    lock. It keeps a writer from replacing the catalog between the refresh
+    and the reads, which would leave the offsets pointing into another
+    file. Readers refreshing at the same time write equivalent indexes, and
+    each write replaces the index atomically.
+
+    Parameters:
+        file_path (WindowsPath): Path to the catalog.
+        key (int): The hash to look up.
+
+    Returns:
+        list: (offset, title, entry) for every record, newest first, or
+              None if the catalog cannot be indexed.
+    """
+    with lock_util.file_locked(file_path, exclusive=False):
+        if not refresh_index(file_path):
+            return None
+
+        with open(get_index_path(file_path), "rb") as handle, mmap.mmap(
+                handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            offsets = find_offsets(view, key)
+
+        records = []
+        with open(file_path, "rb") as handle:
+            header = None
+            if "jsonl" not in file_path.name:
+                header, _ = read_csv_header(handle)
+            for offset in offsets:
+                decoded = read_record_at(handle, offset, header)
+                if decoded is not None:
+                    records.append((offset, *decoded))
+    return records
+
+
+def find_title(file_path: WindowsPath, title: str):
+    """
+    Looks up the live movies whose normalized title matches `title`.
+
+    Parameters:
+        file_path (WindowsPath): Path to the catalog.
+        title (str): The title to look up.
+
+    Returns:
+        dict: The matching movies by their stored title (empty if there is
+              none), or None if the catalog cannot be indexed.
+    """
+    records = lookup(file_path, title_hash(title))
+    if records is None:
+        return None
+
+    normalized = misc_util.normalize_title(title)
+    movies = {}
+    seen = set()
+    for _, found_title, entry in records:
+        if (found_title in seen
+                or misc_util.normalize_title(found_title) != normalized):
+            continue
+        seen.add(found_title)
+        if entry is not None:
+            movies[found_title] = entry
+    return movies
+
+
+def find_imdbid(file_path: WindowsPath, imdbid: str):
+    """
+    Looks up the live movies with a given IMDb ID.
+
+    Parameters:
+        file_path (WindowsPath): Path to the catalog.
+        imdbid (str): The IMDb ID to look up.
+
+    Returns:
+        dict: The matching movies by title (empty if there is none), or
+              None if the catalog cannot be indexed.
+    """
+    records = lookup(file_path, imdbid_hash(imdbid))
+    if records is None:
+        return None
+
+    movies = {}
+    for _, title, entry in records:
+        if title in movies or not entry or entry.get(
+                constant.IMDBID_KEY) != imdbid:
+            continue
+        # The record may have been overridden or deleted since.
+        latest = find_title(file_path, title).get(title)
+        if latest is not None and latest.get(constant.IMDBID_KEY) == imdbid:
+            movies[title] = latest
+    return movies
@@ -1,3 +1,6 @@
+from movie.utility import constant
+
+
 def input_add_movie() -> tuple[str, str]:
     """
     Prompts the user to input a new movie's name and optional notes.
@@ -38,6 +41,38 @@ def input_search_movie() -> str:
     return input("Enter part of movie name: ")
 
 
+def input_search_notes() -> str:
+    """
+    Prompts the user to input words to search the movie notes for.
+
+    Returns:
+        str: The words to search for.
+    """
+    return input("Enter words to search the notes for: ")
+
+
+def input_group_movies() -> str:
+    """
+    Prompts the user to choose what to group the movies by.
+
+    Returns:
+        str: One of constant.GROUP_KEYS, the decade if left blank.
+    """
+    key = input("Group by (year, decade, rating band) [decade]: ")
+    key = "_".join(key.strip().lower().split())
+    return key or constant.GROUP_DECADE
+
+
+def input_similar_movie() -> str:
+    """
+    Prompts the user for the movie to find similar movies to.
+
+    Returns:
+        str: The movie title.
+    """
+    return input("Enter movie name: ")
+
+
 def please_enter_to_continue() -> None:
     """
     Pauses the application until the user presses enter.
@@ -0,0 +1,169 @@
+import json
+import re
+from itertools import islice
+from json.decoder import scanstring
+from json.scanner import make_scanner
+
+from movie.utility import constant
+
+"""
+Streaming encoding and decoding of the catalog's top-level JSON object.
+
+Catalogs are written a small batch of movies at a time and read back one
+movie at a time, so neither direction ever holds the serialized catalog as
+one string: the memory needed besides the payload itself is bounded by a
+write batch or a single record plus the read buffer.
+"""
+
+READ_CHUNK_SIZE = 1 << 16
+WRITE_BATCH_SIZE = 256
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def write_json_object(details: dict, handle) -> None:
+    """
+    Writes a mapping as a JSON object, a batch of members at a time.
+
+    Every batch of `WRITE_BATCH_SIZE` members is encoded in one call of the
+    C-accelerated encoder, so memory stays bounded by a batch while the
+    output is byte for byte what `json.dumps(details)` produces.
+    `JSONEncoder.iterencode` is not used: unlike a one-shot encode, it runs
+    the pure-Python encoder and is several times slower.
+
+    Parameters:
+        details (dict): The mapping to write.
+        handle: A text file opened for writing.
+    """
+    items = iter(details.items())
+    separator = "{"
+    while True:
+        batch = dict(islice(items, WRITE_BATCH_SIZE))
+        if not batch:
+            break
+        handle.write(separator)
+        handle.write(json.dumps(batch)[1:-1])
+        separator = ", "
+    handle.write("}" if separator == ", " else "{}")
+
+
+def iter_json_object(handle, progress: dict = None):
+    """
+    Incrementally decodes a top-level JSON object.
+
+    The file is read in chunks of `READ_CHUNK_SIZE` characters and every
+    member is decoded with the C scanner of the `json` module as soon as it
+    is complete. A member only counts as complete once the `,` or `}`
+    following it is in the buffer, so a value cut off at the end of a chunk
+    (e.g. a number) is decoded again after the next chunk has been read.
+    Consumed input is dropped from the buffer.
+
+    Parameters:
+        handle: A text file opened for reading.
+        progress (dict): Optional load status; its rows and bytes_read
+                         entries are updated while reading.
+
+    Yields:
+        tuple: The (key, value) members of the object in file order.
+
+    Raises:
+        json.JSONDecodeError: If the file is not a single JSON object.
+    """
+    scan_once = make_scanner(json.JSONDecoder())
+    skip = WHITESPACE.match
+    buffer = handle.read(READ_CHUNK_SIZE)
+    consumed = 0
+    rows = 0
+    keys = {}
+
+    position = skip(buffer, 0).end()
+    while position == len(buffer):
+        chunk = handle.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer += chunk
+        position = skip(buffer, position).end()
+    if buffer[position:position + 1] != "{":
+        raise json.JSONDecodeError("Expecting '{'", buffer, position)
+    position += 1
+    first = True
+
+    while True:
+        start = position
+        try:
+            position = skip(buffer, position).end()
+            character = buffer[position]
+            if character == "}" and first:
+                break
+            if character != '"':
+                raise json.JSONDecodeError("Expecting property name "
+                                           "enclosed in double quotes",
+                                           buffer, position)
+            key, position = scanstring(buffer, position + 1)
+            position = skip(buffer, position).end()
+            if buffer[position] != ":":
+                raise json.JSONDecodeError("Expecting ':' delimiter",
+                                           buffer, position)
+            position = skip(buffer, position + 1).end()
+            value, position = scan_once(buffer, position)
+            position = skip(buffer, position).end()
+            character = buffer[position]
+            if character not in ",}":
+                raise json.JSONDecodeError("Expecting ',' delimiter",
+                                           buffer, position)
+            position += 1
+        except (json.JSONDecodeError, StopIteration, IndexError) as e:
+            # The member is incomplete or invalid: read more and retry it.
+            # The read size grows with the member, so a member larger than
+            # a chunk is not re-parsed once per chunk.
+            chunk = handle.read(max(READ_CHUNK_SIZE, len(buffer) - start))
+            if not chunk:
+                if isinstance(e, json.JSONDecodeError):
+                    raise
+                raise json.JSONDecodeError("Unterminated object", buffer,
+                                           start) from None
+            consumed += start
+            buffer = buffer[start:] + chunk
+            position = 0
+            continue
+
+        if type(value) is dict:
+            # The scanner forgets its key memo after every call; share the
+            # keys repeated in every record again, as `json.load` does.
+            value = {keys.setdefault(name, name): field
+                     for name, field in value.items()}
+        yield key, value
+        first = False
+
+        rows += 1
+        if progress is not None and not rows % constant.LOAD_PROGRESS_INTERVAL:
+            progress[constant.LOAD_ROWS] = rows
+            progress[constant.LOAD_BYTES_READ] = consumed + position
+
+        if character == "}":
+            break
+
+    position = skip(buffer, position + 1 if first else position).end()
+    chunk = buffer[position:]
+    while True:
+        if chunk.strip():
+            raise json.JSONDecodeError("Extra data", buffer, position)
+        chunk = handle.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+    if progress is not None:
+        progress[constant.LOAD_ROWS] = rows
+        progress[constant.LOAD_BYTES_READ] = consumed + position
+
+
+def read_json_object(handle, progress: dict = None) -> dict:
+    """
+    Reads a top-level JSON object incrementally into a dictionary.
+
+    Parameters:
+        handle: A text file opened for reading.
+        progress (dict): Optional load status to update while reading.
+
+    Returns:
+        dict: The decoded object.
+    """
+    return dict(iter_json_object(handle, progress))
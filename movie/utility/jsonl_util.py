@@ -0,0 +1,192 @@
+import json
+import os
+from pathlib import WindowsPath
+
+from movie.utility import constant
+
+"""
+JSON Lines catalog format.
+
+Every line is one JSON object describing a movie: its title plus the movie
+entry. Adding or updating a movie appends a line that overrides earlier
+lines for the same title, and deleting a movie appends a tombstone line,
+`{"title": ..., "deleted": true}`. The file is compacted (rewritten with one
+line per live movie) once the overridden lines outweigh the live ones.
+
+Because the file only ever grows between compactions, a reader can follow
+it like a log: remember the byte offset it has read up to, and read only
+the lines appended after it.
+"""
+
+
+def encode_record(title: str, entry: dict) -> str:
+    """
+    Encodes a movie as one JSON Lines record.
+
+    Parameters:
+        title (str): The movie title.
+        entry (dict): The movie entry.
+
+    Returns:
+        str: The record, terminated by a newline.
+    """
+    return json.dumps({constant.TITLE_KEY: title, **entry}) + "\n"
+
+
+def encode_tombstone(title: str) -> str:
+    """
+    Encodes the deletion of a movie as one JSON Lines record.
+
+    Parameter:
+        title (str): The title of the deleted movie.
+
+    Returns:
+        str: The tombstone record, terminated by a newline.
+    """
+    return json.dumps({constant.TITLE_KEY: title,
+                       constant.DELETED_KEY: True}) + "\n"
+
+
+def decode_record(line: str) -> tuple:
+    """
+    Decodes one JSON Lines record.
+
+    Parameter:
+        line (str): The record.
+
+    Returns:
+        tuple: (title, entry), where entry is None for a tombstone.
+    """
+    record = json.loads(line)
+    title = record.pop(constant.TITLE_KEY)
+    if record.get(constant.DELETED_KEY):
+        return title, None
+    return title, record
+
+
+def apply_record(payload: dict, title: str, entry) -> None:
+    """
+    Applies a decoded record to a payload.
+
+    Parameters:
+        payload (dict): The payload to update.
+        title (str): The movie title.
+        entry: The movie entry, or None to delete the movie.
+    """
+    if entry is None:
+        payload.pop(title, None)
+    else:
+        payload[title] = entry
+
+
+def read_jsonl(handle, progress: dict = None) -> tuple:
+    """
+    Replays a JSON Lines catalog into a payload.
+
+    A last line without a newline that does not decode is a record whose
+    append is still in progress (or was interrupted) and is ignored.
+
+    Parameters:
+        handle: A text file opened for reading.
+        progress (dict): Optional load status, updated while reading.
+
+    Returns:
+        tuple: (payload, number of lines read).
+    """
+    payload = {}
+    lines = 0
+    characters = 0
+
+    for line in handle:
+        characters += len(line)
+        if not line.strip():
+            continue
+        try:
+            title, entry = decode_record(line)
+        except ValueError:
+            if line.endswith("\n"):
+                raise
+            break
+        apply_record(payload, title, entry)
+
+        lines += 1
+        if (progress is not None
+                and not lines % constant.LOAD_PROGRESS_INTERVAL):
+            progress[constant.LOAD_ROWS] = lines
+            progress[constant.LOAD_BYTES_READ] = characters
+
+    if progress is not None:
+        progress[constant.LOAD_ROWS] = lines
+        progress[constant.LOAD_BYTES_READ] = characters
+    return payload, lines
+
+
+def write_jsonl(details: dict, handle) -> None:
+    """
+    Writes a payload as a compacted JSON Lines catalog.
+
+    Parameters:
+        details (dict): The payload to write.
+        handle: A text file opened for writing.
+    """
+    for title, entry in details.items():
+        handle.write(encode_record(title, entry))
+
+
+def count_lines(file_path: WindowsPath) -> int:
+    """
+    Counts the complete records of a JSON Lines catalog without decoding
+    them.
+
+    Parameter:
+        file_path (WindowsPath): Path to the catalog.
+
+    Returns:
+        int: The number of newline-terminated lines.
+    """
+    lines = 0
+    with open(file_path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            lines += block.count(b"\n")
+    return lines
+
+
+def tail_jsonl(file_path: WindowsPath, offset: int = 0,
+               file_id: int = None) -> dict:
+    """
+    Reads the records appended to a JSON Lines catalog after `offset`.
+
+    Only complete lines are returned, so a record that is being appended is
+    picked up by the next call. If the catalog was compacted since the
+    caller's last call (its file id changed), it is read from the start and
+    the result is flagged as a reset.
+
+    Parameters:
+        file_path (WindowsPath): Path to the catalog.
+        offset (int): The byte offset returned by the previous call.
+        file_id (int): The file id returned by the previous call.
+
+    Returns:
+        dict: The changes as a list of (title, entry or None) pairs, the
+              offset and file id to pass to the next call, and whether the
+              reader had to start over.
+    """
+    with open(file_path, "rb") as handle:
+        current_id = os.fstat(handle.fileno()).st_ino
+        reset = file_id is not None and file_id != current_id
+        if reset or offset > os.fstat(handle.fileno()).st_size:
+            reset, offset = True, 0
+        handle.seek(offset)
+
+        changes = []
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            if line.strip():
+                changes.append(decode_record(line.decode()))
+
+    return {constant.TAIL_CHANGES: changes,
+            constant.TAIL_OFFSET: offset,
+            constant.TAIL_FILE_ID: current_id,
+            constant.TAIL_RESET: reset}
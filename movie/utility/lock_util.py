@@ -0,0 +1,152 @@
+import threading
+from contextlib import contextmanager
+from pathlib import WindowsPath
+
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl, file locking is skipped there
+    fcntl = None
+
+LOCK_FILE_SUFFIX = ".lock"
+
+locks = {}
+locks_guard = threading.Lock()
+held_file_locks = threading.local()
+
+
+class ReadWriteLock:
+    """
+    A writer-preferring reader-writer lock.
+
+    Any number of readers may hold the lock at the same time, while a writer
+    holds it exclusively. Once a writer is waiting, new readers queue behind
+    it so that a steady stream of readers cannot starve the writers.
+    """
+
+    def __init__(self):
+        """
+        Initializes the lock with no readers and no writer.
+        """
+        self.__condition = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__writer = False
+        self.__waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        """
+        Blocks until no writer holds or waits for the lock, then registers
+        the caller as a reader.
+        """
+        with self.__condition:
+            while self.__writer or self.__waiting_writers:
+                self.__condition.wait()
+            self.__readers += 1
+
+    def release_read(self) -> None:
+        """
+        Unregisters a reader and wakes up waiting writers when the last
+        reader leaves.
+        """
+        with self.__condition:
+            self.__readers -= 1
+            if self.__readers == 0:
+                self.__condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """
+        Blocks until there are no active readers and no writer, then takes
+        the lock exclusively.
+        """
+        with self.__condition:
+            self.__waiting_writers += 1
+            try:
+                while self.__writer or self.__readers:
+                    self.__condition.wait()
+            finally:
+                self.__waiting_writers -= 1
+            self.__writer = True
+
+    def release_write(self) -> None:
+        """
+        Releases the exclusive lock and wakes up all waiting threads.
+        """
+        with self.__condition:
+            self.__writer = False
+            self.__condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        """
+        Context manager holding the lock in shared (read) mode.
+        """
+        self.acquire_read()
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        """
+        Context manager holding the lock in exclusive (write) mode.
+        """
+        self.acquire_write()
+        try:
+            yield self
+        finally:
+            self.release_write()
+
+
+def get_lock(file_path: WindowsPath) -> ReadWriteLock:
+    """
+    Returns the reader-writer lock guarding a storage file.
+
+    Every storage instance pointing at the same file shares one lock, so
+    they are serialized against each other as well.
+
+    Parameter:
+        file_path (WindowsPath): Path to the storage file.
+
+    Returns:
+        ReadWriteLock: The lock associated with the file.
+    """
+    lock = locks.get(file_path)
+    if lock is None:
+        with locks_guard:
+            lock = locks.setdefault(file_path, ReadWriteLock())
+    return lock
+
+
+@contextmanager
+def file_locked(file_path: WindowsPath, exclusive: bool = True):
+    """
+    Context manager holding an advisory `fcntl` lock on a storage file.
+
+    The lock is taken on a `<file>.lock` sidecar rather than on the file
+    itself, because writers replace the storage file atomically and a lock
+    on the old inode would not be seen by the next process. On platforms
+    without `fcntl` the context manager does nothing.
+
+    The lock is reentrant per thread: a thread that already holds it (in
+    either mode) enters again without locking, because a second `flock` on
+    another descriptor of the same file would wait for the first one.
+
+    Parameters:
+        file_path (WindowsPath): Path to the storage file.
+        exclusive (bool): Take an exclusive lock if True, a shared one
+                          otherwise.
+    """
+    held = held_file_locks.__dict__.setdefault("paths", set())
+    if fcntl is None or file_path in held:
+        yield
+        return
+
+    lock_path = file_path.with_name(file_path.name + LOCK_FILE_SUFFIX)
+    with open(lock_path, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        held.add(file_path)
+        try:
+            yield
+        finally:
+            held.discard(file_path)
+            fcntl.flock(handle, fcntl.LOCK_UN)
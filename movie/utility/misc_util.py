@@ -1,4 +1,4 @@
-import statistics
+import unicodedata
 
 from movie.utility import constant
 
@@ -19,6 +19,23 @@ def result_message(result: bool, message: str, payload) -> dict:
             constant.PAYLOAD: payload}
 
 
+def normalize_title(title: str) -> str:
+    """
+    Normalizes a movie title into the key it is looked up by, so that
+    titles differing only in case, Unicode representation or whitespace
+    refer to the same movie.
+
+    Parameter:
+        title (str): The title as entered or stored.
+
+    Returns:
+        str: The NFKC-normalized, case-folded title with runs of whitespace
+             collapsed to single spaces.
+    """
+    title = unicodedata.normalize("NFKC", title).casefold()
+    return " ".join(unicodedata.normalize("NFKC", title).split())
+
+
 def get_average_rating(result: list) -> float:
     """
     Calculates the average rating from a list of ratings.
@@ -29,6 +46,8 @@ def get_average_rating(result: list) -> float:
     Returns:
         float: The average rating.
     """
+    import statistics
+
     return statistics.mean(result)
 
 
@@ -42,6 +61,8 @@ def get_median_rating(result: list) -> float:
     Returns:
         float: The median rating.
     """
+    import statistics
+
     return statistics.median(result)
 
 
@@ -83,7 +104,7 @@ def get_worst_movie(result: dict) -> list:
 
 def get_stat_details(result: dict) -> tuple:
     """
-    Computes statistical details about movie ratings.
+    Computes statistical details about movie ratings in a single pass.
 
     Parameter:
         result (dict): A dictionary containing movie details with ratings.
@@ -95,16 +116,12 @@ def get_stat_details(result: dict) -> tuple:
             - Median rating (float)
             - List of worst movie(s) (list)
     """
-    rating_for_all_movies = \
-        [float(value[constant.RATING_KEY])
-         for key, value in result[constant.PAYLOAD].items()]
+    from movie.utility.stats_util import catalog_stats
 
-    average_rating = get_average_rating(rating_for_all_movies)
-    median_rating = get_median_rating(rating_for_all_movies)
-    best_movie = get_best_movie(result[constant.PAYLOAD])
-    worst_movie = get_worst_movie(result[constant.PAYLOAD])
+    report = catalog_stats(result[constant.PAYLOAD])
 
-    return average_rating, best_movie, median_rating, worst_movie
+    return (report[constant.STATS_MEAN], report[constant.BEST_MOVIE],
+            report[constant.STATS_MEDIAN], report[constant.WORST_MOVIE])
 
 
 def validate_input_filter_movie(end_year: str, minimum_rating: str,
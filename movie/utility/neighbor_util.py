@@ -0,0 +1,300 @@
+import heapq
+
+from movie.utility import constant
+
+"""
+"Similar movies": nearest neighbours in the space of the numeric movie
+features listed in `NEIGHBOR_FEATURES` (year and rating), each divided by
+its scale so that a unit of distance means the same for every feature.
+
+The movies are indexed in a k-d tree: a balanced binary tree that splits the
+movies at the median of one feature per level, cycling through the
+features. A k-nearest-neighbour or radius query descends to the region of
+the query point first and only visits the other side of a split if the
+split plane is closer than the worst neighbour found so far, which makes a
+query logarithmic in the number of movies for small k and radii.
+
+The tree is derived from a catalog snapshot on the first query. Rebuilding
+it after every write would cost more than the queries save, so evolved
+snapshots share it and record the changed movies next to it: replaced and
+deleted movies are skipped when found in the tree, and new versions are
+checked one by one. Once the pending changes pass
+`max(NEIGHBOR_REBUILD_MIN, size // NEIGHBOR_REBUILD_RATIO)`, the next query
+rebuilds the tree.
+"""
+
+
+def get_features(entry: dict) -> tuple:
+    """
+    Returns the scaled feature vector of a movie.
+
+    Parameter:
+        entry (dict): The movie entry.
+
+    Returns:
+        tuple: One float per feature in `NEIGHBOR_FEATURES`.
+    """
+    return tuple(float(entry[key]) / scale
+                 for key, scale in constant.NEIGHBOR_FEATURES)
+
+
+def distance(first: tuple, second: tuple) -> float:
+    """
+    Returns the Euclidean distance between two feature vectors.
+
+    Parameters:
+        first (tuple): A feature vector.
+        second (tuple): Another feature vector.
+
+    Returns:
+        float: The distance.
+    """
+    return sum((a - b) ** 2 for a, b in zip(first, second)) ** 0.5
+
+
+class KDTree:
+    """
+    A static k-d tree over (feature vector, title) points.
+
+    The tree is stored implicitly: the points of the subtree over
+    `points[low:high]` are split at `middle = (low + high) // 2`, the point
+    at `middle` being the node, so no node objects are allocated.
+    """
+
+    def __init__(self, points: list):
+        """
+        Builds the tree.
+
+        Parameter:
+            points (list): (feature vector, title) pairs.
+        """
+        self.points = list(points)
+        self.dimensions = len(constant.NEIGHBOR_FEATURES)
+        self.build(0, len(self.points), 0)
+
+    def build(self, low: int, high: int, depth: int) -> None:
+        """
+        Orders `points[low:high]` into a subtree.
+
+        Parameters:
+            low (int): First index of the subtree.
+            high (int): Index after the last one of the subtree.
+            depth (int): Depth of the subtree root, selects the feature.
+        """
+        stack = [(low, high, depth)]
+        while stack:
+            low, high, depth = stack.pop()
+            if high - low <= 1:
+                continue
+            axis = depth % self.dimensions
+            self.points[low:high] = sorted(self.points[low:high],
+                                           key=lambda point: point[0][axis])
+            middle = (low + high) // 2
+            stack.append((low, middle, depth + 1))
+            stack.append((middle + 1, high, depth + 1))
+
+    def nearest(self, target: tuple, count: int, skip) -> list:
+        """
+        Finds the points closest to a target.
+
+        Parameters:
+            target (tuple): The query feature vector.
+            count (int): The number of points wanted.
+            skip: A container of titles to leave out.
+
+        Returns:
+            list: Up to `count` (distance, title) pairs, closest first;
+                  which of several points at the same distance make the cut
+                  is unspecified.
+        """
+        best = []
+        if count <= 0:
+            return best
+
+        def visit(low, high, depth):
+            if low >= high:
+                return
+            middle = (low + high) // 2
+            features, title = self.points[middle]
+            if title not in skip:
+                candidate = (-distance(target, features), title)
+                if len(best) < count:
+                    heapq.heappush(best, candidate)
+                elif candidate > best[0]:
+                    heapq.heapreplace(best, candidate)
+
+            axis = depth % self.dimensions
+            gap = target[axis] - features[axis]
+            near, far = ((low, middle), (middle + 1, high)) if gap < 0 \
+                else ((middle + 1, high), (low, middle))
+            visit(*near, depth + 1)
+            if len(best) < count or abs(gap) <= -best[0][0]:
+                visit(*far, depth + 1)
+
+        visit(0, len(self.points), 0)
+        return sorted((-negative, title) for negative, title in best)
+
+    def within(self, target: tuple, radius: float, skip) -> list:
+        """
+        Finds the points within a distance of a target.
+
+        Parameters:
+            target (tuple): The query feature vector.
+            radius (float): The maximum distance.
+            skip: A container of titles to leave out.
+
+        Returns:
+            list: (distance, title) pairs, closest first.
+        """
+        found = []
+        stack = [(0, len(self.points), 0)]
+        while stack:
+            low, high, depth = stack.pop()
+            if low >= high:
+                continue
+            middle = (low + high) // 2
+            features, title = self.points[middle]
+            if title not in skip:
+                gap = distance(target, features)
+                if gap <= radius:
+                    found.append((gap, title))
+
+            axis = depth % self.dimensions
+            gap = target[axis] - features[axis]
+            if gap >= -radius:
+                stack.append((middle + 1, high, depth + 1))
+            if gap <= radius:
+                stack.append((low, middle, depth + 1))
+        return sorted(found)
+
+
+class NeighborIndex:
+    """
+    A k-d tree over a catalog snapshot plus the changes made since it was
+    built.
+    """
+
+    def __init__(self, snapshot):
+        """
+        Builds the tree over every movie of a snapshot.
+
+        Parameter:
+            snapshot (CatalogSnapshot): The catalog.
+        """
+        self.tree = KDTree((get_features(entry), title)
+                           for title, entry in snapshot.items())
+        self.removed = frozenset()
+        self.added = {}
+
+    def evolve(self, base, changes: dict, deletions: tuple):
+        """
+        Derives the index of the next catalog version, sharing the tree.
+
+        Parameters:
+            base (CatalogSnapshot): The snapshot this index is for.
+            changes (dict): Movie entries added or replaced, by title.
+            deletions (tuple): Titles removed.
+
+        Returns:
+            NeighborIndex: The index of the evolved snapshot, or None if
+                           the tree is due to be rebuilt.
+        """
+        index = NeighborIndex.__new__(NeighborIndex)
+        index.tree = self.tree
+        removed = set(self.removed)
+        index.added = dict(self.added)
+
+        for title in (*changes, *deletions):
+            # A movie of the base snapshot is either a new version or in
+            # the tree.
+            if title in base and title not in self.added:
+                removed.add(title)
+            index.added.pop(title, None)
+        for title, entry in changes.items():
+            index.added[title] = get_features(entry)
+        index.removed = frozenset(removed)
+
+        pending = len(index.removed) + len(index.added)
+        if pending > max(constant.NEIGHBOR_REBUILD_MIN,
+                         len(self.tree.points)
+                         // constant.NEIGHBOR_REBUILD_RATIO):
+            return None
+        return index
+
+    def nearest(self, target: tuple, count: int, exclude: str = None) -> list:
+        """
+        Finds the movies closest to a feature vector.
+
+        Parameters:
+            target (tuple): The query feature vector.
+            count (int): The number of movies wanted.
+            exclude (str): A title to leave out, e.g. the query movie.
+
+        Returns:
+            list: Up to `count` (distance, title) pairs, closest first.
+        """
+        skip = self.skipped(exclude)
+        found = self.tree.nearest(target, count, skip)
+        found += [(distance(target, features), title)
+                  for title, features in self.added.items()
+                  if title != exclude]
+        return sorted(found)[:count]
+
+    def within(self, target: tuple, radius: float,
+               exclude: str = None) -> list:
+        """
+        Finds the movies within a distance of a feature vector.
+
+        Parameters:
+            target (tuple): The query feature vector.
+            radius (float): The maximum distance.
+            exclude (str): A title to leave out, e.g. the query movie.
+
+        Returns:
+            list: (distance, title) pairs, closest first.
+        """
+        found = self.tree.within(target, radius, self.skipped(exclude))
+        for title, features in self.added.items():
+            gap = distance(target, features)
+            if gap <= radius and title != exclude:
+                found.append((gap, title))
+        return sorted(found)
+
+    def skipped(self, exclude: str):
+        """
+        Returns the titles to leave out of a tree search.
+
+        Parameter:
+            exclude (str): An additional title to leave out, or None.
+
+        Returns:
+            The replaced and deleted titles, plus `exclude`.
+        """
+        if exclude is None:
+            return self.removed
+        return self.removed | {exclude}
+
+
+def similar_movies(snapshot, title: str, count: int = None,
+                   radius: float = None) -> list:
+    """
+    Finds the movies most similar to a movie of a snapshot.
+
+    Parameters:
+        snapshot (CatalogSnapshot): The catalog.
+        title (str): The stored title of the movie.
+        count (int): The number of neighbours wanted (k-NN query).
+        radius (float): The maximum distance (radius query); if both are
+                        given, the `count` closest movies within `radius`.
+
+    Returns:
+        list: (title, entry, distance) triples, closest first.
+    """
+    index = snapshot.derive("neighbors", NeighborIndex)
+    target = get_features(snapshot[title])
+    if radius is not None:
+        found = index.within(target, radius, title)[:count]
+    else:
+        found = index.nearest(target, count or constant.NEIGHBOR_COUNT,
+                              title)
+    return [(neighbor, snapshot[neighbor], gap) for gap, neighbor in found]
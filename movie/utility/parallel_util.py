@@ -0,0 +1,203 @@
+import io
+import locale
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import WindowsPath
+
+from movie.utility import misc_util, constant
+
+"""
+Multi-core loading of large CSV catalogs.
+
+The file is split into byte ranges that each start at the beginning of a
+CSV record. A newline only ends a record if it lies outside a quoted field,
+i.e. if an even number of quote characters precede it (an escaped quote
+`""` counts twice and keeps the parity). The ranges are parsed in worker
+processes and the partial payloads are merged in file order, which gives
+exactly the result of the serial loader.
+"""
+
+SCAN_BLOCK_SIZE = 1 << 20
+
+
+def count_quotes(view, start: int, end: int) -> int:
+    """
+    Counts the quote characters in `view[start:end]`, block by block so
+    that no large copy of the file is made.
+
+    Parameters:
+        view: A bytes-like view of the file, e.g. an mmap.
+        start (int): First offset to scan.
+        end (int): Offset after the last one to scan.
+
+    Returns:
+        int: The number of `"` characters in the range.
+    """
+    quotes = 0
+    for block_start in range(start, end, SCAN_BLOCK_SIZE):
+        block_end = min(block_start + SCAN_BLOCK_SIZE, end)
+        quotes += view[block_start:block_end].count(b'"')
+    return quotes
+
+
+def find_record_start(view, position: int, quotes: int, size: int) -> tuple:
+    """
+    Finds the first record that starts at or after `position`.
+
+    Parameters:
+        view: A bytes-like view of the file.
+        position (int): Offset to start searching from.
+        quotes (int): Number of quotes in the file before `position`.
+        size (int): Size of the file.
+
+    Returns:
+        tuple: (offset of the record start, number of quotes before it).
+    """
+    while position < size:
+        newline = view.find(b"\n", position)
+        if newline == -1:
+            return size, quotes + count_quotes(view, position, size)
+        quotes += count_quotes(view, position, newline)
+        position = newline + 1
+        if quotes % 2 == 0:
+            return position, quotes
+    return size, quotes
+
+
+def find_chunk_boundaries(file_path: WindowsPath, chunks: int) -> list:
+    """
+    Splits a CSV file into byte ranges aligned to record boundaries.
+
+    Parameters:
+        file_path (WindowsPath): Path to the CSV file.
+        chunks (int): The number of ranges wanted.
+
+    Returns:
+        list: Offsets [header_end, b1, ..., size]; consecutive pairs are the
+              ranges to parse. The header is `[0, header_end)`.
+    """
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return [0, 0]
+
+    with open(file_path, "rb") as handle, \
+            mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        header_end, quotes = find_record_start(view, 0, 0, size)
+        boundaries = [header_end]
+        step = max((size - header_end) // chunks, 1)
+        position = header_end
+
+        for index in range(1, chunks):
+            target = header_end + index * step
+            if target <= position:
+                continue
+            quotes += count_quotes(view, position, target)
+            position, quotes = find_record_start(view, target, quotes, size)
+            if position >= size:
+                break
+            boundaries.append(position)
+
+    boundaries.append(size)
+    return boundaries
+
+
+def read_text(file_path: WindowsPath, start: int, end: int) -> str:
+    """
+    Reads and decodes a byte range of a file with the encoding `open` would
+    use by default.
+
+    Parameters:
+        file_path (WindowsPath): Path to the file.
+        start (int): First offset to read.
+        end (int): Offset after the last one to read.
+
+    Returns:
+        str: The decoded text.
+    """
+    with open(file_path, "rb") as handle:
+        handle.seek(start)
+        data = handle.read(end - start)
+    return data.decode(locale.getpreferredencoding(False))
+
+
+def parse_chunk(file_path: WindowsPath, start: int, end: int,
+                fieldnames: list) -> dict:
+    """
+    Parses the CSV records in a byte range into a partial payload.
+
+    Runs in a worker process.
+
+    Parameters:
+        file_path (WindowsPath): Path to the CSV file.
+        start (int): Offset of the first record of the range.
+        end (int): Offset after the last record of the range.
+        fieldnames (list): The column names from the header.
+
+    Returns:
+        dict: The movies of the range, in file order.
+    """
+    import csv
+    from movie.utility.data_util import decode_csv_rows
+
+    text = io.StringIO(read_text(file_path, start, end), newline='')
+    return decode_csv_rows(fieldnames, csv.reader(text), {})
+
+
+def load_csv_parallel(file_path: WindowsPath, workers: int = None,
+                      progress: dict = None) -> misc_util.result_message:
+    """
+    Loads a CSV catalog using several processes.
+
+    Parameters:
+        file_path (WindowsPath): Path to the CSV file.
+        workers (int): Number of worker processes, defaults to the number
+                       of CPUs.
+        progress (dict): Optional load status, updated as chunks complete.
+
+    Returns:
+        misc_util.result_message: Same shape and payload as `load_data`.
+    """
+    import csv
+
+    workers = workers or os.cpu_count() or 1
+
+    try:
+        boundaries = find_chunk_boundaries(file_path, workers)
+        header = read_text(file_path, 0, boundaries[0])
+        fieldnames = next(csv.reader(io.StringIO(header, newline='')), [])
+
+        payload = {}
+        # Workers are spawned rather than forked: the loader usually runs in
+        # the background prefetch thread, and forking a threaded process is
+        # unsafe.
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context(
+                                     "spawn")) as executor:
+            partials = [executor.submit(parse_chunk, file_path, start, end,
+                                        fieldnames)
+                        for start, end in zip(boundaries, boundaries[1:])]
+            for start, end, partial in zip(boundaries, boundaries[1:],
+                                           partials):
+                payload.update(partial.result())
+                if progress is not None:
+                    progress[constant.LOAD_ROWS] = len(payload)
+                    progress[constant.LOAD_BYTES_READ] = end
+    except FileNotFoundError:
+        return (misc_util.result_message
+                (False,
+                 "Error: The file was not found.", ""))
+    except IOError:
+        return (misc_util.result_message
+                (False,
+                 "Error: Could not read the file.", ""))
+    except Exception as e:
+        return (misc_util.result_message
+                (False,
+                 f"An unexpected error occurred: {e}",
+                 ""))
+    else:
+        return (misc_util.result_message
+                (True, "File loaded successfully.",
+                 payload))
@@ -0,0 +1,129 @@
+from movie.utility import constant
+
+"""
+Dictionary encoding of poster URLs.
+
+Almost every poster URL OMDb returns starts and ends the same way, e.g.
+`https://m.media-amazon.com/images/M/<id>._V1_SX300.jpg`. A poster is
+encoded as (prefix id, middle, suffix id), the ids pointing into the shared
+`POSTER_PREFIXES` and `POSTER_SUFFIXES` dictionaries; id 0 is the empty
+string, so any URL can be encoded and is restored exactly.
+
+The snapshot sidecar stores posters this way (see `encode_posters`), which
+leaves only the middle part per movie in the file. In memory, posters stay
+plain strings: a Python object holding the parts would take more memory
+than the prefix and suffix it saves.
+"""
+
+
+def encode_poster(poster: str, prefixes: tuple = None,
+                  suffixes: tuple = None) -> tuple:
+    """
+    Splits a poster URL into its dictionary-encoded parts.
+
+    Parameters:
+        poster (str): The poster URL.
+        prefixes (tuple): The prefix dictionary, POSTER_PREFIXES by default.
+        suffixes (tuple): The suffix dictionary, POSTER_SUFFIXES by default.
+
+    Returns:
+        tuple: (prefix id, middle, suffix id).
+    """
+    prefixes = prefixes or constant.POSTER_PREFIXES
+    suffixes = suffixes or constant.POSTER_SUFFIXES
+
+    prefix_id = suffix_id = 0
+    start, end = 0, len(poster)
+    for index in range(1, len(prefixes)):
+        if poster.startswith(prefixes[index]):
+            prefix_id, start = index, len(prefixes[index])
+            break
+    for index in range(1, len(suffixes)):
+        if (poster.endswith(suffixes[index])
+                and end - len(suffixes[index]) >= start):
+            suffix_id, end = index, end - len(suffixes[index])
+            break
+    return prefix_id, poster[start:end], suffix_id
+
+
+def decode_poster(prefix_id: int, middle: str, suffix_id: int,
+                  prefixes: tuple = None, suffixes: tuple = None) -> str:
+    """
+    Restores a poster URL from its dictionary-encoded parts.
+
+    Parameters:
+        prefix_id (int): Index into the prefix dictionary.
+        middle (str): The part between prefix and suffix.
+        suffix_id (int): Index into the suffix dictionary.
+        prefixes (tuple): The prefix dictionary, POSTER_PREFIXES by default.
+        suffixes (tuple): The suffix dictionary, POSTER_SUFFIXES by default.
+
+    Returns:
+        str: The poster URL.
+    """
+    prefixes = prefixes or constant.POSTER_PREFIXES
+    suffixes = suffixes or constant.POSTER_SUFFIXES
+    return prefixes[prefix_id] + middle + suffixes[suffix_id]
+
+
+def encode_posters(payload: dict) -> tuple:
+    """
+    Dictionary-encodes the posters of a catalog payload.
+
+    Movies whose poster matches a prefix or suffix are copied with just the
+    middle part as poster; all other entries are shared with `payload`.
+    The ids of every movie are packed into one byte, in payload order.
+
+    Parameter:
+        payload (dict): Mapping of movie titles to movie entries.
+
+    Returns:
+        tuple: (encoded payload, codes), codes being a bytes object with
+               `prefix id << 4 | suffix id` per movie.
+    """
+    poster_key = constant.POSTER_KEY
+    prefixes = constant.POSTER_PREFIXES
+    suffixes = constant.POSTER_SUFFIXES
+    encoded = {}
+    codes = bytearray(len(payload))
+    for position, (title, entry) in enumerate(payload.items()):
+        poster = entry.get(poster_key)
+        if poster.__class__ is str:
+            prefix_id, middle, suffix_id = encode_poster(poster, prefixes,
+                                                         suffixes)
+            if prefix_id or suffix_id:
+                codes[position] = prefix_id << 4 | suffix_id
+                entry = entry.copy()
+                entry[poster_key] = middle
+        encoded[title] = entry
+    return encoded, bytes(codes)
+
+
+def decode_posters(payload: dict, codes: bytes, prefixes: tuple,
+                   suffixes: tuple) -> dict:
+    """
+    Restores in place the posters of a payload encoded by
+    `encode_posters`. Posters outside the dictionary that repeat, like an
+    "N/A" placeholder, end up sharing one string.
+
+    Parameters:
+        payload (dict): The encoded payload; its entries are modified.
+        codes (bytes): The packed ids, in payload order.
+        prefixes (tuple): The prefix dictionary the payload was encoded
+                          with.
+        suffixes (tuple): The suffix dictionary the payload was encoded
+                          with.
+
+    Returns:
+        dict: `payload`.
+    """
+    poster_key = constant.POSTER_KEY
+    posters = {}
+    for code, entry in zip(codes, payload.values()):
+        poster = entry.get(poster_key)
+        if code:
+            entry[poster_key] = (prefixes[code >> 4] + poster
+                                 + suffixes[code & 15])
+        elif isinstance(poster, str):
+            entry[poster_key] = posters.setdefault(poster, poster)
+    return payload
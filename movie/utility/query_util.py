@@ -0,0 +1,518 @@
+import time
+from bisect import bisect_left, bisect_right
+
+from movie.utility import constant
+from movie.utility.misc_util import normalize_title
+
+"""
+Composable catalog queries with an index-aware planner.
+
+A `MovieQuery` collects predicates (title equals/prefix/contains, rating
+and year ranges, notes contains), an ordering and a page. To run it on a
+catalog snapshot, the planner estimates how many movies each usable index
+would hand back and reads the smallest candidate set, then checks the
+remaining predicates on just those movies:
+
+    - title index: the snapshot's normalized title lookup, for an exact
+      title (at most one movie),
+    - title prefix index: normalized titles in sorted order, for a prefix,
+    - rating index and year index: movies sorted by rating or by year, for
+      a range,
+    - full scan: every movie, when no index applies or none is smaller.
+
+The sorted indexes are built on the first query that can use them (see
+`CatalogSnapshot.derive`) and from then on carried over as the catalog
+evolves. The estimates are exact counts taken with two binary searches
+each, so planning is logarithmic; only the chosen access path hands back
+its titles. Carrying an index over copies its lists, which is linear in the
+catalog size just like the copy of the snapshot itself, and happens once
+per batch of changes applied to the snapshot (see
+`data_util.apply_pending`).
+"""
+
+TITLE = constant.TITLE_KEY
+RATING = constant.RATING_KEY
+YEAR = constant.YEAR_KEY
+ORDER_KEYS = (TITLE, RATING, YEAR)
+
+TITLE_ACCESS = "title index"
+PREFIX_ACCESS = "title prefix index"
+RATING_ACCESS = "rating index"
+YEAR_ACCESS = "year index"
+SCAN_ACCESS = "full scan"
+
+# The greatest code point; appended to a prefix it bounds every string that
+# starts with the prefix.
+MAX_CHARACTER = chr(0x10FFFF)
+
+
+def title_key(title: str, entry: dict) -> str:
+    return normalize_title(title)
+
+
+def rating_key(title: str, entry: dict) -> float:
+    return entry[RATING]
+
+
+def year_key(title: str, entry: dict) -> int:
+    return entry[YEAR]
+
+
+class SortedIndex:
+    """
+    The titles of a snapshot sorted by a key of each movie, with the keys in
+    a parallel list for binary searches.
+
+    The index is carried over to evolved snapshots (see
+    `CatalogSnapshot.evolve`): the lists are copied and only the changed
+    movies are removed and re-inserted, each shifting the tail of the
+    lists. Movies with equal keys are in no particular order.
+    """
+
+    def __init__(self, snapshot, key):
+        """
+        Builds the index.
+
+        Parameters:
+            snapshot (CatalogSnapshot): The catalog.
+            key: A function of (title, entry) returning the sort key.
+        """
+        self.key = key
+        pairs = sorted((key(title, entry), title)
+                       for title, entry in snapshot.items())
+        self.keys = [pair[0] for pair in pairs]
+        self.titles = [pair[1] for pair in pairs]
+
+    def evolve(self, base, changes: dict, deletions: tuple) -> "SortedIndex":
+        """
+        Derives the index of the next catalog version.
+
+        Parameters:
+            base (CatalogSnapshot): The snapshot this index was built for.
+            changes (dict): Movie entries added or replaced, by title.
+            deletions (tuple): Titles removed.
+
+        Returns:
+            SortedIndex: The index of the evolved snapshot.
+        """
+        index = SortedIndex.__new__(SortedIndex)
+        index.key = self.key
+        index.keys = list(self.keys)
+        index.titles = list(self.titles)
+        for title in (*changes, *deletions):
+            if title in base:
+                index.remove(self.key(title, base[title]), title)
+        for title, entry in changes.items():
+            position = bisect_right(index.keys, self.key(title, entry))
+            index.keys.insert(position, self.key(title, entry))
+            index.titles.insert(position, title)
+        return index
+
+    def remove(self, key, title: str) -> None:
+        """
+        Removes a movie from the index.
+
+        Parameters:
+            key: The sort key the movie was indexed under.
+            title (str): The movie title.
+        """
+        position = bisect_left(self.keys, key)
+        while self.titles[position] != title:
+            position += 1
+        del self.keys[position]
+        del self.titles[position]
+
+    def bounds(self, minimum, maximum) -> tuple:
+        """
+        Finds the positions of the titles whose key lies in a closed range.
+
+        Parameters:
+            minimum: The lower bound, or None for no bound.
+            maximum: The upper bound, or None for no bound.
+
+        Returns:
+            tuple: (start, end) of the titles, end excluded.
+        """
+        start = 0 if minimum is None else bisect_left(self.keys, minimum)
+        end = len(self.keys) if maximum is None \
+            else bisect_right(self.keys, maximum)
+        return start, end
+
+    def count(self, minimum, maximum) -> int:
+        """
+        Counts the titles whose key lies in a closed range.
+
+        Parameters:
+            minimum: The lower bound, or None for no bound.
+            maximum: The upper bound, or None for no bound.
+
+        Returns:
+            int: The number of titles.
+        """
+        start, end = self.bounds(minimum, maximum)
+        return end - start
+
+    def find(self, minimum, maximum) -> list:
+        """
+        Returns the titles whose key lies in a closed range.
+
+        Parameters:
+            minimum: The lower bound, or None for no bound.
+            maximum: The upper bound, or None for no bound.
+
+        Returns:
+            list: The titles, in key order.
+        """
+        start, end = self.bounds(minimum, maximum)
+        return self.titles[start:end]
+
+
+class CatalogPositions(dict):
+    """
+    Maps every title of a snapshot to a number that grows with its position
+    in the catalog, to put index results back into catalog order.
+
+    Carried over to evolved snapshots: replaced movies keep their place in
+    the catalog and their number, new movies are appended and numbered
+    after all others, and deleted ones leave a gap.
+    """
+
+    def __init__(self, snapshot):
+        """
+        Numbers the movies of a snapshot.
+
+        Parameter:
+            snapshot (CatalogSnapshot): The catalog.
+        """
+        super().__init__((title, position)
+                         for position, title in enumerate(snapshot))
+        self.next = len(self)
+
+    def evolve(self, base, changes: dict,
+               deletions: tuple) -> "CatalogPositions":
+        positions = CatalogPositions.__new__(CatalogPositions)
+        dict.__init__(positions, self)
+        positions.next = self.next
+        for title in deletions:
+            del positions[title]
+        for title in changes:
+            if title not in positions:
+                positions[title] = positions.next
+                positions.next += 1
+        return positions
+
+
+class MovieQuery:
+    """
+    A query over a movie catalog, built by chaining its methods:
+
+        MovieQuery().rating_between(8).year_between(2000, 2010)
+                    .order_by(constant.RATING_KEY, descending=True).limit(10)
+
+    Predicates are combined with AND. Title and notes predicates compare
+    normalized text, so they ignore case, Unicode form and spacing. Without
+    an `order_by`, results are in catalog order.
+    """
+
+    def __init__(self):
+        """
+        Initializes a query matching every movie.
+        """
+        self.title = None
+        self.prefix = None
+        self.title_text = None
+        self.notes_text = None
+        self.ratings = None
+        self.years = None
+        self.order = []
+        self.count = None
+        self.skip = 0
+
+    def title_equals(self, title: str) -> "MovieQuery":
+        """
+        Matches the movie with this title.
+
+        Parameter:
+            title (str): The title in any case, Unicode form or spacing.
+
+        Returns:
+            MovieQuery: This query.
+        """
+        self.title = title
+        return self
+
+    def title_prefix(self, prefix: str) -> "MovieQuery":
+        """
+        Matches movies whose title starts with a text.
+
+        Parameter:
+            prefix (str): The start of the title.
+
+        Returns:
+            MovieQuery: This query.
+        """
+        self.prefix = normalize_title(prefix)
+        return self
+
+    def title_contains(self, text: str) -> "MovieQuery":
+        """
+        Matches movies whose title contains a text.
+
+        Parameter:
+            text (str): The text to look for.
+
+        Returns:
+            MovieQuery: This query.
+        """
+        self.title_text = normalize_title(text)
+        return self
+
+    def notes_contains(self, text: str) -> "MovieQuery":
+        """
+        Matches movies whose notes contain a text.
+
+        Parameter:
+            text (str): The text to look for.
+
+        Returns:
+            MovieQuery: This query.
+        """
+        self.notes_text = normalize_title(text)
+        return self
+
+    def rating_between(self, minimum: float = None,
+                       maximum: float = None) -> "MovieQuery":
+        """
+        Matches movies rated within a closed range.
+
+        Parameters:
+            minimum (float): The lowest rating, or None for no bound.
+            maximum (float): The highest rating, or None for no bound.
+
+        Returns:
+            MovieQuery: This query.
+        """
+        self.ratings = (minimum, maximum)
+        return self
+
+    def year_between(self, start: int = None,
+                     end: int = None) -> "MovieQuery":
+        """
+        Matches movies released within a closed range of years.
+
+        Parameters:
+            start (int): The earliest year, or None for no bound.
+            end (int): The latest year, or None for no bound.
+
+        Returns:
+            MovieQuery: This query.
+        """
+        self.years = (start, end)
+        return self
+
+    def order_by(self, key: str, descending: bool = False) -> "MovieQuery":
+        """
+        Orders the results by a field; further calls add tie-breakers.
+
+        Parameters:
+            key (str): TITLE_KEY, RATING_KEY or YEAR_KEY.
+            descending (bool): Whether to order from the highest value.
+
+        Returns:
+            MovieQuery: This query.
+
+        Raises:
+            ValueError: If the field cannot be ordered by.
+        """
+        if key not in ORDER_KEYS:
+            raise ValueError(f"Cannot order movies by {key}.")
+        self.order.append((key, descending))
+        return self
+
+    def limit(self, count: int) -> "MovieQuery":
+        """
+        Returns at most `count` movies.
+
+        Parameter:
+            count (int): The page size.
+
+        Returns:
+            MovieQuery: This query.
+        """
+        self.count = count
+        return self
+
+    def offset(self, count: int) -> "MovieQuery":
+        """
+        Skips the first `count` movies.
+
+        Parameter:
+            count (int): The number of movies to skip.
+
+        Returns:
+            MovieQuery: This query.
+        """
+        self.skip = count
+        return self
+
+    def access_paths(self, snapshot) -> dict:
+        """
+        Finds the access paths usable for the query, without reading any
+        of their candidates.
+
+        Parameter:
+            snapshot (CatalogSnapshot): The catalog.
+
+        Returns:
+            dict: access path -> (number of candidate movies, function
+                  returning their titles), including the full scan.
+        """
+        # The scan comes first so that it wins a tie: an index that would
+        # read every movie anyway only adds work.
+        paths = {SCAN_ACCESS: (len(snapshot), lambda: snapshot)}
+        if self.title is not None:
+            stored_title = snapshot.resolve_title(self.title)
+            found = [] if stored_title is None else [stored_title]
+            paths[TITLE_ACCESS] = (len(found), lambda: found)
+        for access, name, key, bounds in (
+                (PREFIX_ACCESS, TITLE, title_key,
+                 None if self.prefix is None
+                 else (self.prefix, self.prefix + MAX_CHARACTER)),
+                (RATING_ACCESS, RATING, rating_key, self.ratings),
+                (YEAR_ACCESS, YEAR, year_key, self.years)):
+            if bounds is not None:
+                index = snapshot.derive(
+                    name, lambda catalog, key=key: SortedIndex(catalog, key))
+                paths[access] = (index.count(*bounds),
+                                 lambda index=index, bounds=bounds:
+                                 index.find(*bounds))
+        return paths
+
+    def estimate(self, snapshot) -> dict:
+        """
+        Counts the candidate movies each usable access path would read.
+
+        Parameter:
+            snapshot (CatalogSnapshot): The catalog.
+
+        Returns:
+            dict: access path -> number of candidates, including the full
+                  scan.
+        """
+        return {access: count for access, (count, _)
+                in self.access_paths(snapshot).items()}
+
+    def matches(self, title: str, entry: dict, access: str) -> bool:
+        """
+        Checks the predicates that the chosen access path does not answer.
+
+        Parameters:
+            title (str): The movie title.
+            entry (dict): The movie entry.
+            access (str): The access path the movie was read with.
+
+        Returns:
+            bool: Whether the movie matches the query.
+        """
+        if self.title is not None and access != TITLE_ACCESS \
+                and normalize_title(title) != normalize_title(self.title):
+            return False
+        if self.prefix is not None and access != PREFIX_ACCESS \
+                and not normalize_title(title).startswith(self.prefix):
+            return False
+        if self.title_text is not None \
+                and self.title_text not in normalize_title(title):
+            return False
+        if self.notes_text is not None and self.notes_text not in \
+                normalize_title(entry.get(constant.NOTES_KEY) or ""):
+            return False
+        for key, bounds, answered in ((RATING, self.ratings, RATING_ACCESS),
+                                      (YEAR, self.years, YEAR_ACCESS)):
+            if bounds is None or access == answered:
+                continue
+            minimum, maximum = bounds
+            if minimum is not None and entry[key] < minimum:
+                return False
+            if maximum is not None and entry[key] > maximum:
+                return False
+        return True
+
+    def run(self, snapshot) -> tuple:
+        """
+        Plans and runs the query, timing every step.
+
+        Parameter:
+            snapshot (CatalogSnapshot): The catalog.
+
+        Returns:
+            tuple: (list of (title, entry) results, the plan).
+        """
+        started = time.perf_counter()
+        paths = self.access_paths(snapshot)
+        access = min(paths, key=lambda path: paths[path][0])
+        planned = time.perf_counter()
+
+        results = [(title, snapshot[title]) for title in paths[access][1]()
+                   if self.matches(title, snapshot[title], access)]
+        filtered = time.perf_counter()
+
+        # Index results are put back into catalog order first, so that
+        # movies the ordering keys consider equal are in catalog order,
+        # just like the results of a scan.
+        if access != SCAN_ACCESS and len(results) > 1:
+            positions = snapshot.derive("positions", CatalogPositions)
+            results.sort(key=lambda item: positions[item[0]])
+        if self.order:
+            for key, descending in reversed(self.order):
+                if key == TITLE:
+                    results.sort(key=lambda item: normalize_title(item[0]),
+                                 reverse=descending)
+                else:
+                    results.sort(key=lambda item: item[1][key],
+                                 reverse=descending)
+            sort = "by " + ", ".join(
+                f"{key} {'descending' if descending else 'ascending'}"
+                for key, descending in self.order)
+        elif access != SCAN_ACCESS:
+            sort = "catalog order"
+        else:
+            sort = "none"
+        end = None if self.count is None else self.skip + self.count
+        results = results[self.skip:end]
+        finished = time.perf_counter()
+
+        plan = {constant.PLAN_ACCESS: access,
+                constant.PLAN_ESTIMATES: {path: count for path, (count, _)
+                                          in paths.items()},
+                constant.PLAN_SORT: sort,
+                constant.PLAN_ROWS: len(results),
+                constant.PLAN_TIMINGS: {"plan": planned - started,
+                                        "filter": filtered - planned,
+                                        "sort": finished - filtered}}
+        return results, plan
+
+    def execute(self, snapshot) -> list:
+        """
+        Runs the query.
+
+        Parameter:
+            snapshot (CatalogSnapshot): The catalog.
+
+        Returns:
+            list: The matching (title, entry) pairs.
+        """
+        return self.run(snapshot)[0]
+
+    def explain(self, snapshot) -> dict:
+        """
+        Runs the query and reports how it was run.
+
+        Parameter:
+            snapshot (CatalogSnapshot): The catalog.
+
+        Returns:
+            dict: The chosen access path, the candidate count of every
+                  usable path, the ordering applied, the number of results
+                  and the seconds spent planning, filtering and sorting.
+        """
+        return self.run(snapshot)[1]
@@ -0,0 +1,251 @@
+import heapq
+import math
+import re
+from operator import itemgetter
+
+from movie.utility import constant
+from movie.utility.misc_util import normalize_title
+
+"""
+Ranked full-text search over movie notes and titles.
+
+Text is tokenized into normalized words (see `tokenize`) and indexed in an
+inverted index: for every word, the movies containing it and how often. A
+search scores the movies containing at least one query word with Okapi
+BM25,
+
+    score = sum over query words of
+            idf(word) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len / avglen))
+
+where tf is how often the word occurs in the movie, len the number of words
+of the movie and avglen the average over the catalog, and returns the best
+`limit` movies. Only the postings of the query words are read, and mostly
+only their best-scoring part (see `InvertedIndex.search`), so a search does
+not slow down with the size of the catalog.
+
+The index is derived from a catalog snapshot on the first search and then
+carried over to every evolved snapshot, updated for just the changed
+movies; the postings of words that did not change are shared between
+versions.
+"""
+
+WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list:
+    """
+    Splits a text into normalized words.
+
+    Parameter:
+        text (str): The text.
+
+    Returns:
+        list: The words, case folded and in Unicode normal form.
+    """
+    return WORD.findall(normalize_title(text or ""))
+
+
+class InvertedIndex:
+    """
+    An inverted index over the notes, and optionally the titles, of a
+    catalog snapshot.
+    """
+
+    def __init__(self, snapshot, titles: bool = True):
+        """
+        Indexes every movie of a snapshot.
+
+        Parameters:
+            snapshot (CatalogSnapshot): The catalog.
+            titles (bool): Whether titles are indexed along with notes.
+        """
+        self.titles = titles
+        self.postings = {}
+        self.lengths = {}
+        self.total_length = 0
+        self.cache = {}
+        for title, entry in snapshot.items():
+            self.add(title, entry, self.postings)
+
+    def words(self, title: str, entry: dict) -> list:
+        """
+        Returns the words a movie is indexed under.
+
+        Parameters:
+            title (str): The movie title.
+            entry (dict): The movie entry.
+
+        Returns:
+            list: The words of its notes, and title if titles are indexed.
+        """
+        words = tokenize(entry.get(constant.NOTES_KEY))
+        if self.titles:
+            words += tokenize(title)
+        return words
+
+    def add(self, title: str, entry: dict, postings: dict) -> None:
+        """
+        Indexes a movie.
+
+        Parameters:
+            title (str): The movie title.
+            entry (dict): The movie entry.
+            postings (dict): The postings to add the movie to; every list
+                             of movies in it that is touched must be owned
+                             by this index.
+        """
+        words = self.words(title, entry)
+        self.lengths[title] = len(words)
+        self.total_length += len(words)
+        for word in words:
+            movies = postings.setdefault(word, {})
+            movies[title] = movies.get(title, 0) + 1
+
+    def evolve(self, base, changes: dict, deletions: tuple) -> "InvertedIndex":
+        """
+        Derives the index of the next catalog version.
+
+        Only the postings of the words of changed movies are copied; all
+        others are shared with this index.
+
+        Parameters:
+            base (CatalogSnapshot): The snapshot this index was built for.
+            changes (dict): Movie entries added or replaced, by title.
+            deletions (tuple): Titles removed.
+
+        Returns:
+            InvertedIndex: The index of the evolved snapshot.
+        """
+        index = InvertedIndex.__new__(InvertedIndex)
+        index.titles = self.titles
+        index.postings = dict(self.postings)
+        index.lengths = dict(self.lengths)
+        index.total_length = self.total_length
+        index.cache = {}
+
+        touched = set()
+        for title, entry in changes.items():
+            touched.update(index.words(title, entry))
+        for title in (*changes, *deletions):
+            if title in base:
+                touched.update(index.words(title, base[title]))
+        for word in touched:
+            index.postings[word] = dict(index.postings.get(word, {}))
+
+        for title in (*changes, *deletions):
+            if title in base:
+                index.total_length -= index.lengths.pop(title)
+                for word in set(index.words(title, base[title])):
+                    del index.postings[word][title]
+        for title, entry in changes.items():
+            index.add(title, entry, index.postings)
+        for word in touched:
+            if not index.postings[word]:
+                del index.postings[word]
+        return index
+
+    def impacts(self, word: str) -> tuple:
+        """
+        Returns the BM25 score of a word in every movie containing it.
+
+        The scores are computed on the first search for the word and cached
+        for the lifetime of this index; an evolved index starts with an
+        empty cache, since a write changes the average length and so every
+        score.
+
+        Parameter:
+            word (str): A normalized word.
+
+        Returns:
+            tuple: (title -> score, (title, score) pairs best first), or
+                   None if no movie contains the word.
+        """
+        impacts = self.cache.get(word)
+        if impacts is None:
+            movies = self.postings.get(word)
+            if not movies:
+                return None
+            count = len(self.lengths)
+            average_length = self.total_length / count or 1
+            k1 = constant.BM25_K1
+            b = constant.BM25_B
+            idf = math.log(1 + (count - len(movies) + 0.5)
+                           / (len(movies) + 0.5))
+            scores = {title: idf * frequency * (k1 + 1)
+                      / (frequency + k1 * (1 - b + b * self.lengths[title]
+                                           / average_length))
+                      for title, frequency in movies.items()}
+            ranked = sorted(scores.items(), key=itemgetter(1), reverse=True)
+            impacts = self.cache.setdefault(word, (scores, ranked))
+        return impacts
+
+    def search(self, text: str, limit: int) -> list:
+        """
+        Ranks the movies matching a text with BM25.
+
+        The score lists of the query words are walked best first, in step,
+        and every movie met is scored in full with lookups in the other
+        lists (Fagin's threshold algorithm). A movie not met yet scores at
+        most the sum of the scores at the current depth, so the walk stops
+        as soon as the `limit` best movies found score at least that much;
+        a rare word usually ends it after a few steps, however common the
+        other words are.
+
+        Parameters:
+            text (str): The search text.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list: (title, score) pairs, best first.
+        """
+        lists = [impacts for impacts in map(self.impacts, set(tokenize(text)))
+                 if impacts is not None]
+        if not lists or limit <= 0:
+            return []
+        if len(lists) == 1:
+            return lists[0][1][:limit]
+
+        best = []
+        seen = set()
+        for depth in range(max(len(ranked) for scores, ranked in lists)):
+            threshold = 0.0
+            for scores, ranked in lists:
+                if depth >= len(ranked):
+                    continue
+                title, score = ranked[depth]
+                threshold += score
+                if title in seen:
+                    continue
+                seen.add(title)
+                total = sum(other.get(title, 0.0) for other, _ in lists)
+                candidate = (total, -len(seen), title)
+                if len(best) < limit:
+                    heapq.heappush(best, candidate)
+                elif candidate > best[0]:
+                    heapq.heapreplace(best, candidate)
+            if len(best) == limit and best[0][0] >= threshold:
+                break
+
+        return [(title, total) for total, _, title in sorted(best,
+                                                             reverse=True)]
+
+
+def search_movies(snapshot, text: str, limit: int,
+                  titles: bool = True) -> list:
+    """
+    Runs a ranked full-text search on a catalog snapshot.
+
+    Parameters:
+        snapshot (CatalogSnapshot): The catalog.
+        text (str): The search text.
+        limit (int): The maximum number of results.
+        titles (bool): Whether titles are searched along with notes.
+
+    Returns:
+        list: (title, entry, score) triples, best first.
+    """
+    index = snapshot.derive(
+        "fulltext titles" if titles else "fulltext",
+        lambda catalog: InvertedIndex(catalog, titles))
+    return [(title, snapshot[title], score)
+            for title, score in index.search(text, limit)]
@@ -0,0 +1,473 @@
+from movie.utility.constant import IMDBID_KEY
+from movie.utility.misc_util import normalize_title
+
+
+class CatalogSnapshot(dict):
+    """
+    An immutable, versioned snapshot of a movie catalog.
+
+    Snapshots are published by writers and handed out to readers as is, so
+    readers never need a lock: a published snapshot is never changed. A
+    writer derives the next version with `evolve`, which copies only the
+    title -> entry mapping and shares every unchanged movie entry with the
+    previous version. Movie entries are therefore treated as immutable too
+    and are replaced, never modified in place.
+
+    Old versions are freed by the garbage collector as soon as the last
+    reader holding them lets go.
+
+    Two secondary indexes, from normalized title and from IMDb ID to the
+    stored title, are built on their first lookup and then carried over to
+    every evolved version, updated for just the changed movies. Older
+    catalogs may hold several movies under one key; the first one is
+    indexed and the others are kept aside, so that one of them takes over
+    when the indexed movie goes away. Other structures computed from a
+    snapshot, like the sorted indexes of the query planner, are cached per
+    snapshot with `derive`.
+    """
+
+    __slots__ = ("version", "__titles", "__title_duplicates", "__imdbids",
+                 "__imdbid_duplicates", "__derived", "__weakref__")
+
+    def __init__(self, payload: dict, version: int):
+        """
+        Initializes the snapshot with a payload and a version number.
+
+        Parameters:
+            payload (dict): Mapping of movie titles to movie entries.
+            version (int): The catalog version this snapshot represents.
+        """
+        super().__init__(payload)
+        self.version = version
+        self.__titles = None
+        self.__title_duplicates = None
+        self.__imdbids = None
+        self.__imdbid_duplicates = None
+        self.__derived = {}
+
+    def __reduce__(self):
+        return CatalogSnapshot, (dict(self), self.version)
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("A catalog snapshot is read-only, "
+                        "use evolve() to derive a new version.")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def evolve(self, changes: dict = None,
+               deletions: tuple = ()) -> "CatalogSnapshot":
+        """
+        Derives the next version of the catalog.
+
+        Parameters:
+            changes (dict): Movie entries to add or replace, by title.
+            deletions (tuple): Titles to remove.
+
+        Returns:
+            CatalogSnapshot: The new snapshot, sharing all untouched entries
+                             with this one.
+
+        Raises:
+            KeyError: If a title to delete is not in the catalog.
+        """
+        payload = dict(self)
+        if changes:
+            payload.update(changes)
+        for title in deletions:
+            del payload[title]
+        snapshot = CatalogSnapshot(payload, self.version + 1)
+
+        touched = (*(changes or ()), *deletions)
+        if self.__titles is not None:
+            titles = dict(self.__titles)
+            duplicates = dict(self.__title_duplicates)
+            for title in touched:
+                if (title in self) != (title in payload):
+                    update_index(titles, duplicates, normalize_title(title),
+                                 title, title in payload)
+            snapshot.__title_duplicates = duplicates
+            snapshot.__titles = titles
+
+        if self.__imdbids is not None:
+            imdbids = dict(self.__imdbids)
+            duplicates = dict(self.__imdbid_duplicates)
+            for title in touched:
+                old = self.get(title, {}).get(IMDBID_KEY)
+                new = payload.get(title, {}).get(IMDBID_KEY)
+                if old != new:
+                    if old:
+                        update_index(imdbids, duplicates, old, title, False)
+                    if new:
+                        update_index(imdbids, duplicates, new, title, True)
+            snapshot.__imdbid_duplicates = duplicates
+            snapshot.__imdbids = imdbids
+
+        for name, derived in self.__derived.items():
+            if hasattr(derived, "evolve"):
+                derived = derived.evolve(self, changes or {},
+                                         tuple(deletions))
+                if derived is not None:
+                    snapshot.__derived[name] = derived
+        return snapshot
+
+    def resolve_title(self, title: str):
+        """
+        Looks up the stored title of a movie by its normalized title.
+
+        Parameter:
+            title (str): The title in any case, Unicode form or spacing.
+
+        Returns:
+            str: The title the movie is stored under, or None if there is
+                 none.
+        """
+        titles = self.resolve_titles(title)
+        return titles[0] if titles else None
+
+    def resolve_titles(self, title: str) -> tuple:
+        """
+        Looks up every stored title with the same normalized title.
+
+        Parameter:
+            title (str): The title in any case, Unicode form or spacing.
+
+        Returns:
+            tuple: The stored titles, the one `resolve_title` returns first.
+        """
+        if self.__titles is None:
+            titles, duplicates = {}, {}
+            for stored_title in self:
+                update_index(titles, duplicates, normalize_title(stored_title),
+                             stored_title, True)
+            self.__title_duplicates = duplicates
+            self.__titles = titles
+        key = normalize_title(title)
+        return lookup_index(self.__titles, self.__title_duplicates, key)
+
+    def find_imdbid(self, imdbid: str):
+        """
+        Looks up a movie by its IMDb ID.
+
+        Parameter:
+            imdbid (str): The IMDb ID.
+
+        Returns:
+            str: The title of the movie, or None if there is none.
+        """
+        titles = self.find_imdbid_titles(imdbid)
+        return titles[0] if titles else None
+
+    def find_imdbid_titles(self, imdbid: str) -> tuple:
+        """
+        Looks up every movie with an IMDb ID.
+
+        Parameter:
+            imdbid (str): The IMDb ID.
+
+        Returns:
+            tuple: The titles of the movies, the one `find_imdbid` returns
+                   first.
+        """
+        if self.__imdbids is None:
+            imdbids, duplicates = {}, {}
+            for title, entry in self.items():
+                if entry.get(IMDBID_KEY):
+                    update_index(imdbids, duplicates, entry[IMDBID_KEY],
+                                 title, True)
+            self.__imdbid_duplicates = duplicates
+            self.__imdbids = imdbids
+        return lookup_index(self.__imdbids, self.__imdbid_duplicates, imdbid)
+
+    def derive(self, name: str, build):
+        """
+        Returns a structure computed from this snapshot, building it on the
+        first call.
+
+        The structure is cached for the lifetime of the snapshot; since a
+        snapshot never changes, it never goes stale. A structure with an
+        `evolve(snapshot, changes, deletions)` method is carried over to the
+        versions derived from this one by calling it, unless it returns
+        None; others are rebuilt when next asked for. Two threads asking at
+        the same time may both build it, and one result wins.
+
+        Parameters:
+            name (str): The name the structure is cached under.
+            build: A function of the snapshot that builds the structure.
+
+        Returns:
+            The cached or newly built structure.
+        """
+        derived = self.__derived.get(name)
+        if derived is None:
+            derived = self.__derived.setdefault(name, build(self))
+        return derived
+
+
+def update_index(index: dict, duplicates: dict, key, title: str,
+                 present: bool) -> None:
+    """
+    Adds a title to or removes it from a secondary index of a snapshot.
+
+    The first title added under a key is indexed, later ones are appended
+    to the key's duplicates. When the indexed title is removed, the first
+    duplicate takes its place.
+
+    Parameters:
+        index (dict): Mapping of keys to the indexed title.
+        duplicates (dict): Mapping of keys to a tuple of further titles.
+        key: The key of the title.
+        title (str): The stored title.
+        present (bool): True to add the title, False to remove it.
+    """
+    others = duplicates.get(key, ())
+    if present:
+        if index.setdefault(key, title) != title and title not in others:
+            duplicates[key] = others + (title,)
+        return
+
+    if index.get(key) == title:
+        if not others:
+            del index[key]
+            return
+        index[key], others = others[0], others[1:]
+    elif title in others:
+        others = tuple(other for other in others if other != title)
+    else:
+        return
+    if others:
+        duplicates[key] = others
+    else:
+        del duplicates[key]
+
+
+def lookup_index(index: dict, duplicates: dict, key) -> tuple:
+    """
+    Returns every title stored under a key of a secondary index.
+
+    Parameters:
+        index (dict): Mapping of keys to the indexed title.
+        duplicates (dict): Mapping of keys to a tuple of further titles.
+        key: The key to look up.
+
+    Returns:
+        tuple: The indexed title followed by its duplicates, or an empty
+               tuple.
+    """
+    title = index.get(key)
+    if title is None:
+        return ()
+    return (title, *duplicates.get(key, ()))
+
+
+class CatalogOverlay:
+    """
+    Pending changes staged on top of a catalog snapshot.
+
+    The overlay records added, replaced and deleted movies next to the
+    snapshot it was started from, without copying it, and answers lookups
+    as if the changes had been applied. `snapshot` turns it into the next
+    catalog version with a single `evolve`.
+
+    The base may itself be an overlay, e.g. the changes a writer appended
+    to the catalog file but that have not been applied to the cached
+    snapshot yet (see `data_util.publish_data`); lookups then go through
+    both layers. Like the snapshot, the overlay keeps its own title and
+    IMDb ID indexes of the staged movies, so every lookup takes constant
+    time however many changes are staged.
+
+    When the overlay backs a transaction, `result` holds the result_message
+    of its commit once the transaction has ended.
+    """
+
+    def __init__(self, base):
+        """
+        Initializes an empty overlay on a snapshot.
+
+        Parameter:
+            base: The catalog version to stage changes on, a
+                  CatalogSnapshot or another CatalogOverlay.
+        """
+        self.base = base
+        self.result = None
+        self.discard()
+
+    def __bool__(self) -> bool:
+        return bool(self.changes or self.deletions)
+
+    def __contains__(self, title) -> bool:
+        return self.get(title) is not None
+
+    def discard(self) -> None:
+        """
+        Drops all staged changes.
+        """
+        self.changes = {}
+        self.deletions = {}
+        self.added = 0
+        self.__titles = {}
+        self.__title_duplicates = {}
+        self.__imdbids = {}
+        self.__imdbid_duplicates = {}
+
+    def count(self) -> int:
+        """
+        Returns the number of movies with the staged changes applied.
+
+        Returns:
+            int: The number of movies.
+        """
+        base = self.base
+        size = base.count() if isinstance(base, CatalogOverlay) else len(base)
+        return size + self.added - len(self.deletions)
+
+    def get(self, title: str):
+        """
+        Returns the entry stored under a title.
+
+        Parameter:
+            title (str): The stored title.
+
+        Returns:
+            dict: The staged or original entry, or None if there is none.
+        """
+        if title in self.changes:
+            return self.changes[title]
+        if title in self.deletions:
+            return None
+        return self.base.get(title)
+
+    def resolve_title(self, title: str):
+        """
+        Looks up the stored title of a movie by its normalized title.
+
+        Parameter:
+            title (str): The title in any case, Unicode form or spacing.
+
+        Returns:
+            str: The stored title, or None if there is no such movie.
+        """
+        titles = self.resolve_titles(title)
+        return titles[0] if titles else None
+
+    def resolve_titles(self, title: str) -> tuple:
+        """
+        Looks up every stored title with the same normalized title.
+
+        Parameter:
+            title (str): The title in any case, Unicode form or spacing.
+
+        Returns:
+            tuple: The staged titles first, then those of the base.
+        """
+        staged = lookup_index(self.__titles, self.__title_duplicates,
+                              normalize_title(title))
+        return staged + tuple(
+            stored_title for stored_title in self.base.resolve_titles(title)
+            if stored_title not in self.changes
+            and stored_title not in self.deletions)
+
+    def find_imdbid(self, imdbid: str):
+        """
+        Looks up a movie by its IMDb ID.
+
+        Parameter:
+            imdbid (str): The IMDb ID.
+
+        Returns:
+            str: The title of the movie, or None if there is none.
+        """
+        titles = self.find_imdbid_titles(imdbid)
+        return titles[0] if titles else None
+
+    def find_imdbid_titles(self, imdbid: str) -> tuple:
+        """
+        Looks up every movie with an IMDb ID.
+
+        Parameter:
+            imdbid (str): The IMDb ID.
+
+        Returns:
+            tuple: The staged titles first, then those of the base.
+        """
+        staged = lookup_index(self.__imdbids, self.__imdbid_duplicates,
+                              imdbid)
+        return staged + tuple(
+            title for title in self.base.find_imdbid_titles(imdbid)
+            if title not in self.changes and title not in self.deletions)
+
+    def put(self, title: str, entry: dict) -> None:
+        """
+        Stages adding or replacing a movie.
+
+        Parameters:
+            title (str): The stored title.
+            entry (dict): The new entry.
+        """
+        old = self.changes.get(title)
+        if old is None:
+            if title in self.deletions:
+                del self.deletions[title]
+            elif title not in self.base:
+                self.added += 1
+            update_index(self.__titles, self.__title_duplicates,
+                         normalize_title(title), title, True)
+        elif old.get(IMDBID_KEY):
+            update_index(self.__imdbids, self.__imdbid_duplicates,
+                         old[IMDBID_KEY], title, False)
+        self.changes[title] = entry
+        if entry.get(IMDBID_KEY):
+            update_index(self.__imdbids, self.__imdbid_duplicates,
+                         entry[IMDBID_KEY], title, True)
+
+    def remove(self, title: str) -> None:
+        """
+        Stages deleting a movie.
+
+        Parameter:
+            title (str): The stored title.
+        """
+        entry = self.changes.pop(title, None)
+        if title in self.base:
+            self.deletions[title] = None
+        elif entry is not None:
+            self.added -= 1
+        if entry is not None:
+            update_index(self.__titles, self.__title_duplicates,
+                         normalize_title(title), title, False)
+            if entry.get(IMDBID_KEY):
+                update_index(self.__imdbids, self.__imdbid_duplicates,
+                             entry[IMDBID_KEY], title, False)
+
+    def apply(self, other: "CatalogOverlay") -> None:
+        """
+        Stages the changes of another overlay on top of this one's.
+
+        Parameter:
+            other (CatalogOverlay): Changes staged on this overlay or on
+                                    the same catalog version.
+        """
+        for title in other.deletions:
+            self.remove(title)
+        for title, entry in other.changes.items():
+            self.put(title, entry)
+
+    def snapshot(self) -> CatalogSnapshot:
+        """
+        Applies the staged changes to the base snapshot.
+
+        Returns:
+            CatalogSnapshot: The next catalog version.
+        """
+        if isinstance(self.base, CatalogOverlay):
+            merged = CatalogOverlay(self.base.base)
+            merged.apply(self.base)
+            merged.apply(self)
+            return merged.snapshot()
+        return self.base.evolve(self.changes, tuple(self.deletions))
@@ -0,0 +1,455 @@
+from pathlib import WindowsPath
+
+from movie.utility import constant
+from movie.utility.compression_util import open_catalog
+
+"""
+Single-pass catalog statistics.
+
+`StatsAccumulator` sees every movie once and keeps only running state:
+
+    - Welford's running mean and sum of squared deviations, for a variance
+      that stays accurate over large catalogs,
+    - the number of movies per distinct rating, from which the exact mean,
+      median and percentiles are read at the end; ratings are stored with
+      one decimal, so this stays at about a hundred counters however large
+      the catalog is,
+    - the lowest and highest rating and the movies that have them,
+    - the number of movies per rating bucket, and per year and rating.
+
+The per-year buckets also answer group-by queries (`group_movies`): every
+grouping key, year, decade or rating band, is coarser than a (year, rating)
+pair.
+
+Movies can be fed from an in-memory catalog or straight from a catalog
+file as it is parsed, without building the catalog.
+"""
+
+
+def rating_percentile(ratings: dict, count: int, percent: float) -> float:
+    """
+    Returns a percentile of ratings given as counts per distinct rating,
+    interpolating linearly between the two closest ranks (the 50th
+    percentile is the median).
+
+    Parameters:
+        ratings (dict): rating -> number of movies with that rating.
+        count (int): The total number of movies.
+        percent (float): The percentile, from 0 to 100.
+
+    Returns:
+        float: The rating, or None if there are no movies.
+    """
+    if not count:
+        return None
+    position = (count - 1) * percent / 100
+    rank = int(position)
+    fraction = position - rank
+
+    lower = upper = None
+    seen = 0
+    for rating in sorted(ratings):
+        seen += ratings[rating]
+        if lower is None and seen > rank:
+            lower = rating
+        if seen > rank + 1 or (seen > rank and not fraction):
+            upper = rating
+            break
+    if upper is None:
+        upper = lower
+    return lower * (1 - fraction) + upper * fraction
+
+
+def exact_mean(ratings: dict, count: int) -> float:
+    """
+    Returns the mean of ratings given as counts per distinct rating,
+    computed exactly and rounded once, like `statistics.mean`.
+
+    Parameters:
+        ratings (dict): rating -> number of movies with that rating.
+        count (int): The total number of movies.
+
+    Returns:
+        float: The mean, or None if there are no movies.
+    """
+    from fractions import Fraction
+
+    if not count:
+        return None
+    return float(sum(Fraction(rating) * number
+                     for rating, number in ratings.items()) / count)
+
+
+class RatingCounts(dict):
+    """
+    The ratings of a group of movies, as rating -> number of movies, which
+    is all the count, mean, min, max and median of the group need.
+    """
+
+    def add(self, rating: float, number: int = 1) -> None:
+        """
+        Adds movies with a rating.
+
+        Parameters:
+            rating (float): The rating.
+            number (int): How many movies have it.
+        """
+        self[rating] = self.get(rating, 0) + number
+
+    def remove(self, rating: float) -> None:
+        """
+        Removes one movie with a rating.
+
+        Parameter:
+            rating (float): The rating.
+        """
+        if self[rating] == 1:
+            del self[rating]
+        else:
+            self[rating] -= 1
+
+    def summary(self, aggregates: tuple = None) -> dict:
+        """
+        Computes aggregates of the group.
+
+        Parameter:
+            aggregates (tuple): Any of STATS_COUNT, STATS_MEAN, STATS_MIN,
+                                STATS_MAX and STATS_MEDIAN; all by default.
+
+        Returns:
+            dict: aggregate -> value.
+        """
+        count = sum(self.values())
+        values = {constant.STATS_COUNT: lambda: count,
+                  constant.STATS_MEAN: lambda: exact_mean(self, count),
+                  constant.STATS_MIN: lambda: min(self, default=None),
+                  constant.STATS_MAX: lambda: max(self, default=None),
+                  constant.STATS_MEDIAN: lambda: rating_percentile(
+                      self, count, 50)}
+        return {aggregate: values[aggregate]()
+                for aggregate in aggregates or constant.GROUP_AGGREGATES}
+
+
+def group_of(key: str, year: int, rating: float):
+    """
+    Returns the group a movie falls into.
+
+    Parameters:
+        key (str): GROUP_YEAR, GROUP_DECADE or GROUP_RATING_BAND.
+        year (int): The release year.
+        rating (float): The rating.
+
+    Returns:
+        The year, the first year of the decade, or the lower bound of the
+        rating band (the STATS_HISTOGRAM_BUCKETS equal bands from 0 to
+        STATS_RATING_MAX, the top one including its upper bound).
+    """
+    if key == constant.GROUP_YEAR:
+        return year
+    if key == constant.GROUP_DECADE:
+        return year - year % 10
+    width = constant.STATS_RATING_MAX / constant.STATS_HISTOGRAM_BUCKETS
+    band = min(max(int(rating // width), 0),
+               constant.STATS_HISTOGRAM_BUCKETS - 1)
+    return band * width
+
+
+class YearBuckets(dict):
+    """
+    The ratings of a catalog bucketed by year: year -> RatingCounts.
+
+    Every grouping key is coarser than a (year, rating) pair, so any group-by
+    is answered from the buckets in time proportional to the number of
+    years and distinct ratings instead of the number of movies. Derived from
+    a snapshot, the buckets are carried over to every evolved snapshot,
+    updated for just the changed movies.
+    """
+
+    def __init__(self, payload: dict = None):
+        """
+        Buckets the movies of a catalog in one hash-aggregate pass.
+
+        Parameter:
+            payload (dict): Mapping of movie titles to movie entries.
+        """
+        super().__init__()
+        for entry in (payload or {}).values():
+            self.add(int(entry[constant.YEAR_KEY]),
+                     float(entry[constant.RATING_KEY]))
+
+    def add(self, year: int, rating: float) -> None:
+        """
+        Adds a movie.
+
+        Parameters:
+            year (int): The release year.
+            rating (float): The rating.
+        """
+        counts = self.get(year)
+        if counts is None:
+            counts = self[year] = RatingCounts()
+        counts.add(rating)
+
+    def evolve(self, base, changes: dict, deletions: tuple) -> "YearBuckets":
+        """
+        Derives the buckets of the next catalog version. Only the buckets of
+        the years of changed movies are copied.
+
+        Parameters:
+            base (CatalogSnapshot): The snapshot these buckets are for.
+            changes (dict): Movie entries added or replaced, by title.
+            deletions (tuple): Titles removed.
+
+        Returns:
+            YearBuckets: The buckets of the evolved snapshot.
+        """
+        buckets = YearBuckets()
+        dict.update(buckets, self)
+        copied = set()
+
+        def bucket(year):
+            if year not in copied:
+                copied.add(year)
+                buckets[year] = RatingCounts(buckets.get(year, {}))
+            return buckets[year]
+
+        for title in (*changes, *deletions):
+            if title in base:
+                year = int(base[title][constant.YEAR_KEY])
+                bucket(year).remove(float(base[title][constant.RATING_KEY]))
+                if not buckets[year]:
+                    del buckets[year]
+        for entry in changes.values():
+            bucket(int(entry[constant.YEAR_KEY])).add(
+                float(entry[constant.RATING_KEY]))
+        return buckets
+
+    def group(self, key: str) -> dict:
+        """
+        Merges the buckets into groups.
+
+        Parameter:
+            key (str): GROUP_YEAR, GROUP_DECADE or GROUP_RATING_BAND.
+
+        Returns:
+            dict: group -> RatingCounts, in group order.
+        """
+        groups = {}
+        for year, counts in self.items():
+            for rating, number in counts.items():
+                group = group_of(key, year, rating)
+                merged = groups.get(group)
+                if merged is None:
+                    merged = groups[group] = RatingCounts()
+                merged.add(rating, number)
+        return dict(sorted(groups.items()))
+
+
+def group_movies(payload: dict, key: str, aggregates: tuple = None) -> dict:
+    """
+    Groups the movies of a catalog and aggregates the ratings per group.
+
+    A catalog snapshot keeps its year buckets between calls and versions
+    (see `YearBuckets`); any other mapping is bucketed in one pass.
+
+    Parameters:
+        payload (dict): Mapping of movie titles to movie entries.
+        key (str): GROUP_YEAR, GROUP_DECADE or GROUP_RATING_BAND.
+        aggregates (tuple): The aggregates to compute, see
+                            `RatingCounts.summary`; all by default.
+
+    Returns:
+        dict: group -> {aggregate: value}, in group order.
+
+    Raises:
+        ValueError: If the key or an aggregate is unknown.
+    """
+    if key not in constant.GROUP_KEYS:
+        raise ValueError(f"Cannot group movies by {key}.")
+    for aggregate in aggregates or ():
+        if aggregate not in constant.GROUP_AGGREGATES:
+            raise ValueError(f"Unknown aggregate {aggregate}.")
+
+    if hasattr(payload, "derive"):
+        buckets = payload.derive("year buckets", YearBuckets)
+    else:
+        buckets = YearBuckets(payload)
+    return {group: counts.summary(aggregates)
+            for group, counts in buckets.group(key).items()}
+
+
+class StatsAccumulator:
+    """
+    Accumulates the statistics of the movies added to it.
+
+    Movies are added with `add`, or by assigning `accumulator[title] =
+    entry`, so the accumulator can stand in for the payload the CSV decoder
+    fills.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty accumulator.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.squares = 0.0
+        self.ratings = RatingCounts()
+        self.years = YearBuckets()
+        self.histogram = [0] * constant.STATS_HISTOGRAM_BUCKETS
+        self.width = (constant.STATS_RATING_MAX
+                      / constant.STATS_HISTOGRAM_BUCKETS)
+        self.lowest = None
+        self.highest = None
+        self.worst = []
+        self.best = []
+
+    def add(self, title: str, entry: dict) -> None:
+        """
+        Adds a movie.
+
+        Parameters:
+            title (str): The movie title.
+            entry (dict): The movie entry.
+        """
+        rating = float(entry[constant.RATING_KEY])
+        year = int(entry[constant.YEAR_KEY])
+
+        self.count += 1
+        delta = rating - self.mean
+        self.mean += delta / self.count
+        self.squares += delta * (rating - self.mean)
+
+        self.ratings.add(rating)
+        self.years.add(year, rating)
+        bucket = min(max(int(rating // self.width), 0),
+                     constant.STATS_HISTOGRAM_BUCKETS - 1)
+        self.histogram[bucket] += 1
+
+        if self.highest is None or rating > self.highest:
+            self.highest, self.best = rating, [title]
+        elif rating == self.highest:
+            self.best.append(title)
+        if self.lowest is None or rating < self.lowest:
+            self.lowest, self.worst = rating, [title]
+        elif rating == self.lowest:
+            self.worst.append(title)
+
+    __setitem__ = add
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns a percentile of the ratings, see `rating_percentile`.
+
+        Parameter:
+            percent (float): The percentile, from 0 to 100.
+
+        Returns:
+            float: The rating, or None if no movie was added.
+        """
+        return rating_percentile(self.ratings, self.count, percent)
+
+    def report(self) -> dict:
+        """
+        Builds the statistics report.
+
+        Returns:
+            dict: The number of movies, the exact mean and median, the
+                  sample variance and standard deviation, the lowest and
+                  highest rating with their movies, the configured
+                  percentiles, the histogram as (low, high, count) buckets,
+                  the number of movies per year and the aggregates per
+                  decade. Values that need at least one movie (two for the
+                  variance) are None.
+        """
+        # The mean is computed exactly from the rating counts, like
+        # `statistics.mean`; the running mean only feeds the variance.
+        mean = exact_mean(self.ratings, self.count)
+        variance = None
+        if self.count > 1:
+            variance = self.squares / (self.count - 1)
+
+        width = self.width
+        return {constant.STATS_COUNT: self.count,
+                constant.STATS_MEAN: mean,
+                constant.STATS_MEDIAN: self.percentile(50),
+                constant.STATS_VARIANCE: variance,
+                constant.STATS_STD_DEV: (None if variance is None
+                                         else variance ** 0.5),
+                constant.STATS_MIN: self.lowest,
+                constant.STATS_MAX: self.highest,
+                constant.WORST_MOVIE: list(self.worst),
+                constant.BEST_MOVIE: list(self.best),
+                constant.STATS_PERCENTILES: {
+                    percent: self.percentile(percent)
+                    for percent in constant.STATS_PERCENTILE_POINTS},
+                constant.STATS_HISTOGRAM: [
+                    (bucket * width, (bucket + 1) * width, count)
+                    for bucket, count in enumerate(self.histogram)],
+                constant.STATS_YEARS: {
+                    year: sum(counts.values())
+                    for year, counts in sorted(self.years.items())},
+                constant.STATS_DECADES: {
+                    decade: counts.summary()
+                    for decade, counts in self.years.group(
+                        constant.GROUP_DECADE).items()}}
+
+
+def catalog_stats(payload: dict) -> dict:
+    """
+    Computes the statistics report of a catalog in one pass.
+
+    Parameter:
+        payload (dict): Mapping of movie titles to movie entries.
+
+    Returns:
+        dict: The report, see `StatsAccumulator.report`.
+    """
+    accumulator = StatsAccumulator()
+    for title, entry in payload.items():
+        accumulator.add(title, entry)
+    return accumulator.report()
+
+
+def file_stats(file_path: WindowsPath) -> dict:
+    """
+    Computes the statistics report of a catalog file while parsing it,
+    without building the catalog in memory.
+
+    CSV and JSON catalogs are streamed movie by movie. A JSON Lines catalog
+    is replayed first, since a later line may replace or delete a movie.
+
+    Parameter:
+        file_path (WindowsPath): Path to the catalog.
+
+    Returns:
+        dict: The report, see `StatsAccumulator.report`.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid catalog.
+    """
+    accumulator = StatsAccumulator()
+
+    if "jsonl" in file_path.name:
+        from movie.utility.jsonl_util import read_jsonl
+
+        with open_catalog(file_path, "r") as handle:
+            payload, lines = read_jsonl(handle)
+        for title, entry in payload.items():
+            accumulator.add(title, entry)
+    elif "json" in file_path.name:
+        from movie.utility.json_stream_util import iter_json_object
+
+        with open_catalog(file_path, "r") as handle:
+            for title, entry in iter_json_object(handle):
+                accumulator.add(title, entry)
+    elif "csv" in file_path.name:
+        import csv
+        from movie.utility.data_util import decode_csv_rows
+
+        with open_catalog(file_path, mode='r', newline='') as handle:
+            csv_reader = csv.reader(handle)
+            decode_csv_rows(next(csv_reader, []), csv_reader, accumulator)
+
+    return accumulator.report()
@@ -54,6 +54,25 @@ def print_movie_search(movies: dict) -> None:
     ))
 
 
+def print_ranked_search(movies: list) -> None:
+    """
+    Display ranked search results with their release year, rating and
+    relevance score.
+
+    Parameter:
+        movies (list): (title, entry, score) triples, best first.
+
+    Returns:
+        None
+    """
+    print("\n".join(
+        [
+            f"{title} ({details[constant.YEAR_KEY]}): "
+            f"{details[constant.RATING_KEY]} [score {score:.2f}]"
+            for title, details, score in movies]
+    ))
+
+
 def print_random_generated_movie(result: dict) -> None:
     print(f"Your movie for tonight: {result[constant.PAYLOAD][0]}, "
           f"it's rated {result[constant.PAYLOAD][1][constant.RATING_KEY]}")
@@ -63,7 +82,12 @@ def print_stats_movies(average_rating: float,
                        median_rating: float,
                        best_movie: list,
                        worst_movie: list,
-                       payload) -> None:
+                       payload,
+                       report: dict = None) -> None:
+    if not payload:
+        print("\nThere are no movies yet.")
+        return
+
     print(f"\nAverage rating: {average_rating:.1f}")
     print(f"Median rating: {median_rating:.1f}")
 
@@ -82,6 +106,77 @@ def print_stats_movies(average_rating: float,
             for movie in worst_movie]
     ))
 
+    if report is not None:
+        print_extended_stats(report)
+
+
+def print_extended_stats(report: dict) -> None:
+    """
+    Display the standard deviation, percentiles and rating histogram of an
+    extended statistics report.
+
+    Parameter:
+        report (dict): The report from `stats_util.StatsAccumulator`.
+    """
+    if report[constant.STATS_STD_DEV] is not None:
+        print(f"Standard deviation: {report[constant.STATS_STD_DEV]:.2f}")
+    print("Percentiles: " + ", ".join(
+        [f"p{percent} {rating:.1f}"
+         for percent, rating in report[constant.STATS_PERCENTILES].items()]
+    ))
+
+    print("\nBy decade:")
+    print_movie_groups(report[constant.STATS_DECADES], constant.GROUP_DECADE)
+
+    widest = max(count
+                 for low, high, count in report[constant.STATS_HISTOGRAM])
+    print("\n".join(
+        [
+            f"{low:4.1f}-{high:4.1f} | "
+            f"{'#' * round(30 * count / widest)} {count}"
+            for low, high, count in report[constant.STATS_HISTOGRAM]]
+    ))
+
+
+def print_movie_groups(groups: dict, key: str) -> None:
+    """
+    Display the aggregates of movie groups as a table.
+
+    Parameters:
+        groups (dict): {aggregate: value} by group.
+        key (str): What the movies are grouped by.
+    """
+    labels = {constant.GROUP_DECADE: lambda decade: f"{decade}s",
+              constant.GROUP_RATING_BAND: lambda band: f"{band:.1f}+"}
+    label = labels.get(key, str)
+
+    print(f"{key:>12} {'count':>7} {'mean':>6} {'min':>5} {'max':>5} "
+          f"{'median':>6}")
+    print("\n".join(
+        [
+            f"{label(group):>12} {values[constant.STATS_COUNT]:>7} "
+            f"{values[constant.STATS_MEAN]:>6.2f} "
+            f"{values[constant.STATS_MIN]:>5.1f} "
+            f"{values[constant.STATS_MAX]:>5.1f} "
+            f"{values[constant.STATS_MEDIAN]:>6.2f}"
+            for group, values in groups.items()]
+    ))
+
+
+def print_similar_movies(movies: list) -> None:
+    """
+    Display similar movies with their release year, rating and distance.
+
+    Parameter:
+        movies (list): (title, entry, distance) triples, closest first.
+    """
+    print("\n".join(
+        [
+            f"{title} ({details[constant.YEAR_KEY]}): "
+            f"{details[constant.RATING_KEY]} [distance {gap:.2f}]"
+            for title, details, gap in movies]
+    ))
+
 
 def print_movie_does_not_exist(movie: str) -> None:
     """
@@ -124,7 +219,10 @@ def print_menu() -> None:
     print("8. Movies sorted by rating")
     print("9. Movies sorted by year")
     print("10. Filter movies")
-    print("11. Generate website\n")
+    print("11. Generate website")
+    print("12. Search notes")
+    print("13. Group movies")
+    print("14. Similar movies\n")
 
 
 def select_options(self, user_choice: str) -> None:
@@ -153,6 +251,12 @@ def select_options(self, user_choice: str) -> None:
             self._command_filter_movie,
         f"{constant.GENERATE_MOVIES}":
             self._generate_website,
+        f"{constant.SEARCH_NOTES}":
+            self._command_search_notes,
+        f"{constant.GROUP_MOVIES}":
+            self._command_group_movies,
+        f"{constant.SIMILAR_MOVIES}":
+            self._command_similar_movies,
     }
 
     option = return_options()
@@ -178,7 +282,10 @@ def return_options() -> list:
         constant.MOVIES_SORTED_BY_RATING,
         constant.MOVIES_SORTED_BY_YEAR,
         constant.FILTER_MOVIES,
-        constant.GENERATE_MOVIES
+        constant.GENERATE_MOVIES,
+        constant.SEARCH_NOTES,
+        constant.GROUP_MOVIES,
+        constant.SIMILAR_MOVIES
     ]
     return option
 
@@ -188,7 +295,7 @@ def call_menu() -> str:
         try:
             print_menu()
 
-            input_available_commands = input("Enter choice (0-10): ")
+            input_available_commands = input("Enter choice (0-14): ")
 
             if input_available_commands == constant.EXIT:
                 break
@@ -274,6 +381,11 @@ class MovieApp:
         movie_name, movie_notes = input_util.input_add_movie()
 
         try:
+            # Skip the API call for movies that are already in the catalog.
+            if self.get_storage().find_movie(movie_name)[constant.RESULT]:
+                print(f"Movie {movie_name} is already in the catalog")
+                return
+
             movie_return = api_util.get_movie_data_from_api(movie_name)
 
             if not movie_return[constant.RESULT]:
@@ -292,6 +404,8 @@ class MovieApp:
                                                           constant.IMDBID_KEY])
                 if result["result"]:
                     print(f"Movie {movie_name} successfully added")
+                else:
+                    print(result[constant.MESSAGE])
 
         except Exception as e:
             print(f"Didn't find movie {movie_name} in the API: {e}")
@@ -393,7 +507,8 @@ class MovieApp:
                            result[constant.PAYLOAD][1],
                            result[constant.PAYLOAD][2],
                            result[constant.PAYLOAD][3],
-                           result[constant.PAYLOAD][4])
+                           result[constant.PAYLOAD][4],
+                           result[constant.PAYLOAD][5])
         please_enter_to_continue()
         select_options(self, call_menu())
 
@@ -429,6 +544,58 @@ class MovieApp:
         please_enter_to_continue()
         select_options(self, call_menu())
 
+    def _command_search_notes(self):
+        """
+        Searches the notes and titles of the movies for the words input by
+        the user and lists the best matches first.
+        """
+        words = input_util.input_search_notes()
+
+        result = self.get_storage().search_notes(words)
+
+        if result[constant.RESULT]:
+            print_ranked_search(result[constant.PAYLOAD])
+        else:
+            print(result[constant.MESSAGE])
+
+        please_enter_to_continue()
+        select_options(self, call_menu())
+
+    def _command_group_movies(self):
+        """
+        Groups the movies by the key input by the user (year, decade or
+        rating band) and displays the count, mean, minimum, maximum and
+        median rating of every group.
+        """
+        key = input_util.input_group_movies()
+
+        result = self.get_storage().group_movies(key)
+
+        if result[constant.RESULT]:
+            print_movie_groups(result[constant.PAYLOAD], key)
+        else:
+            print(result[constant.MESSAGE])
+
+        please_enter_to_continue()
+        select_options(self, call_menu())
+
+    def _command_similar_movies(self):
+        """
+        Lists the movies closest in release year and rating to the movie
+        input by the user.
+        """
+        title = input_util.input_similar_movie()
+
+        result = self.get_storage().similar_movies(title)
+
+        if result[constant.RESULT]:
+            print_similar_movies(result[constant.PAYLOAD])
+        else:
+            print_movie_does_not_exist(title)
+
+        please_enter_to_continue()
+        select_options(self, call_menu())
+
     def _command_movie_sorted_by_rating(self):
         """
         Displays a list of movies sorted by their rating.
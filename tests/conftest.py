@@ -0,0 +1,80 @@
+import shutil
+
+import pytest
+
+from movie.storage.storage_csv import StorageCsv
+from movie.storage.storage_json import StorageJson
+from movie.storage.storage_jsonl import StorageJsonl
+from movie.utility import constant, data_util
+
+"""
+Shared fixtures of the test suite.
+
+Most tests run against a small catalog written to a temporary file:
+
+    - `catalog`: the movies; a test module overrides the fixture with the
+      movies it needs,
+    - `storage_format`: the file suffix, "json" unless a test parametrizes
+      it (e.g. `@pytest.mark.parametrize("storage_format", ["csv",
+      "json"])`); a compression suffix may follow, as in "csv.gz",
+    - `file_path`: the catalog written in that format,
+    - `storage`: the storage class of that format on the file.
+"""
+
+STORAGE_CLASSES = {"csv": StorageCsv, "json": StorageJson,
+                   "jsonl": StorageJsonl}
+
+
+@pytest.fixture(autouse=True, scope="session")
+def data_directory(tmp_path_factory):
+    """
+    Points the production and test catalogs at copies in a temporary
+    directory, so that no test writes sidecars, locks or change logs next
+    to the real catalogs in `movie/data`.
+    """
+    directory = tmp_path_factory.mktemp("data")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(constant, "PRODUCTION_FILE_PATH", directory)
+        for name in ("JSON_PRODUCTION_FILE_PATH", "CSV_PRODUCTION_FILE_PATH",
+                     "TEST_FILE_PATH"):
+            source = getattr(constant, name)
+            shutil.copy(source, directory / source.name)
+            monkeypatch.setattr(constant, name, directory / source.name)
+        yield directory
+
+
+@pytest.fixture()
+def catalog():
+    """
+    The movies written to the catalog file.
+    """
+    return {"Titanic": {"rating": 7.9, "year": 1997, "poster": "",
+                        "notes": "", "imdbid": "tt0120338"},
+            "Joker": {"rating": 8.4, "year": 2019, "poster": "",
+                      "notes": "", "imdbid": "tt7286456"}}
+
+
+@pytest.fixture()
+def storage_format():
+    """
+    The format of the catalog file, by its suffix.
+    """
+    return "json"
+
+
+@pytest.fixture()
+def file_path(tmp_path, catalog, storage_format):
+    """
+    Writes the catalog to a temporary file and returns its path.
+    """
+    file_path = tmp_path / f"catalog.{storage_format}"
+    data_util.write_data(catalog, file_path)
+    return file_path
+
+
+@pytest.fixture()
+def storage(file_path, storage_format):
+    """
+    Opens the catalog file with the storage class of its format.
+    """
+    return STORAGE_CLASSES[storage_format.split(".")[0]](file_path)
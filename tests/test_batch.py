@@ -0,0 +1,125 @@
+import pytest
+
+from movie.utility import constant, data_util
+from movie.utility.snapshot_util import CatalogOverlay, CatalogSnapshot
+
+"""
+Tests for the batch mutation API and the overlay it stages changes in.
+"""
+
+
+@pytest.fixture(params=["csv", "json"])
+def storage_format(request):
+    return request.param
+
+
+@pytest.fixture()
+def storage(storage):
+    storage.list_movies()
+    return storage
+
+
+@pytest.fixture()
+def writes(monkeypatch):
+    writes = []
+    for name in ("write_data", "append_data"):
+        function = getattr(data_util, name)
+        monkeypatch.setattr(data_util, name,
+                            lambda *arguments, function=function: (
+                                writes.append(arguments[-1])
+                                or function(*arguments)))
+    return writes
+
+
+def movie(title, imdbid, rating="5.0"):
+    return {"title": title, "year": "2000", "rating": rating,
+            "imdbid": imdbid}
+
+
+def test_add_movies_writes_once(storage, writes):
+    result = storage.add_movies([movie(f"Movie {index}", f"tt{index:07d}")
+                                 for index in range(20)])
+
+    assert result[constant.RESULT]
+    assert all(item[constant.RESULT] for item in result[constant.PAYLOAD])
+    assert len(writes) == 1
+    assert len(storage.list_movies()[constant.PAYLOAD]) == 22
+
+
+def test_per_item_results(storage):
+    result = storage.add_movies([movie("Venom", "tt1270797"),
+                                 movie("venom", "tt0000001"),
+                                 movie("The Joker", "tt7286456"),
+                                 movie("Bad", "tt0000002", rating="x")])
+
+    assert [item[constant.RESULT] for item in result[constant.PAYLOAD]] == [
+        True, False, False, False]
+    assert "1 of 4" in result[constant.MESSAGE]
+    assert set(storage.list_movies()[constant.PAYLOAD]) == {
+        "Titanic", "Joker", "Venom"}
+
+
+def test_update_and_delete_movies(storage, writes):
+    updated = storage.update_movies({"titanic": "8.0", "Venom": "9.0"})
+    deleted = storage.delete_movies(["JOKER", "Joker"])
+
+    assert [item[constant.RESULT] for item in updated[constant.PAYLOAD]] == [
+        True, False]
+    assert [item[constant.RESULT] for item in deleted[constant.PAYLOAD]] == [
+        True, False]
+    assert len(writes) == 2
+    payload = storage.list_movies()[constant.PAYLOAD]
+    assert list(payload) == ["Titanic"]
+    assert payload["Titanic"][constant.RATING_KEY] == 8.0
+
+
+def test_failed_write_keeps_the_catalog(storage, monkeypatch):
+    failure = {constant.RESULT: False, constant.MESSAGE: "disk full",
+               constant.PAYLOAD: ""}
+    monkeypatch.setattr(data_util, "write_data", lambda *arguments: failure)
+    monkeypatch.setattr(data_util, "append_data", lambda *arguments: failure)
+
+    result = storage.delete_movies(["Titanic"])
+
+    assert not result[constant.RESULT]
+    assert result[constant.MESSAGE] == "disk full"
+    assert "Titanic" in storage.list_movies()[constant.PAYLOAD]
+
+
+def test_overlay_does_not_touch_its_base(catalog):
+    base = CatalogSnapshot(catalog, 1)
+    overlay = CatalogOverlay(base)
+
+    overlay.remove("Titanic")
+    overlay.put("Venom", {**catalog["Joker"], "imdbid": "tt1270797"})
+
+    assert overlay.resolve_title("titanic") is None
+    assert overlay.resolve_title("VENOM") == "Venom"
+    assert overlay.find_imdbid("tt1270797") == "Venom"
+    assert overlay.find_imdbid("tt0120338") is None
+    assert list(base) == ["Titanic", "Joker"]
+    assert list(overlay.snapshot()) == ["Joker", "Venom"]
+
+
+def test_overlay_on_an_overlay(catalog):
+    base = CatalogSnapshot(catalog, 1)
+    pending = CatalogOverlay(base)
+    pending.put("Venom", {**catalog["Joker"], "imdbid": "tt1270797"})
+    pending.remove("Titanic")
+    overlay = CatalogOverlay(pending)
+
+    overlay.put("Titanic", catalog["Titanic"])
+    overlay.remove("Venom")
+    overlay.put("Alien", {**catalog["Joker"], "imdbid": "tt0078748"})
+
+    assert overlay.count() == 3
+    assert overlay.resolve_title("venom") is None
+    assert overlay.find_imdbid("tt0120338") == "Titanic"
+    assert list(pending.snapshot()) == ["Joker", "Venom"]
+    assert overlay.snapshot() == {"Titanic": catalog["Titanic"],
+                                  "Joker": catalog["Joker"],
+                                  "Alien": overlay.get("Alien")}
+
+    pending.apply(overlay)
+    assert pending.count() == 3
+    assert sorted(pending.snapshot()) == ["Alien", "Joker", "Titanic"]
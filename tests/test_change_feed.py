@@ -0,0 +1,132 @@
+import pytest
+
+from movie.storage.storage_json import StorageJson
+from movie.utility import change_util, constant, data_util
+
+"""
+Tests for the change events reported by the storage layer.
+"""
+
+
+def event_types(events):
+    return [(event[constant.EVENT_TYPE], event[constant.EVENT_TITLE])
+            for event in events]
+
+
+def test_typed_events_with_old_and_new_values(storage, catalog):
+    received = []
+    storage.subscribe(received.append)
+
+    storage.add_movie("Venom", "2018", "6.6", "", "", "tt1270797")
+    storage.update_movie("Joker", "9.0")
+    storage.delete_movie("Titanic")
+    storage.unsubscribe(received.append)
+    storage.delete_movie("Joker")
+
+    assert [event_types(events) for events in received] == [
+        [("added", "Venom")], [("rating_updated", "Joker")],
+        [("deleted", "Titanic")]]
+    assert received[1][0][constant.EVENT_OLD] == 8.4
+    assert received[1][0][constant.EVENT_NEW] == 9.0
+    assert received[2][0][constant.EVENT_OLD] == catalog["Titanic"]
+    assert [events[0][constant.EVENT_VERSION]
+            for events in received] == [1, 2, 3]
+
+
+def test_one_version_per_commit(storage):
+    storage.update_movies({"Titanic": "8.0", "Joker": "9.0"})
+
+    with storage.transaction():
+        storage.delete_movie("Titanic")
+        storage.add_movie("Venom", "2018", "6.6", "", "", "tt1270797")
+
+    events = storage.changes_since(0)[constant.PAYLOAD][constant.FEED_EVENTS]
+    assert [event[constant.EVENT_VERSION] for event in events] == [
+        1, 1, 2, 2]
+
+
+def test_resume_from_version_after_restart(storage):
+    storage.add_movie("Venom", "2018", "6.6", "", "", "tt1270797")
+    version = storage.changes_since(0)[constant.PAYLOAD][
+        constant.FEED_VERSION]
+    storage.delete_movie("Venom")
+
+    data_util.cached_data.clear()
+    feed = StorageJson(storage.get_file_path()).changes_since(version)[
+        constant.PAYLOAD]
+
+    assert event_types(feed[constant.FEED_EVENTS]) == [("deleted", "Venom")]
+    assert feed[constant.FEED_VERSION] == version + 1
+    assert not feed[constant.FEED_RESET]
+
+
+def test_trimmed_log_requires_rebuild(storage, monkeypatch):
+    monkeypatch.setattr(constant, "CHANGE_LOG_MAX_EVENTS", 1)
+    for rating in ("1.0", "2.0", "3.0", "4.0"):
+        storage.update_movie("Joker", rating)
+    for _ in range(3):
+        change_util.record_events(storage.get_file_path(), [
+            change_util.build_event(constant.EVENT_UPDATED, "Joker", {}, {})
+            for _ in range(200)])
+
+    assert storage.changes_since(1)[constant.PAYLOAD][constant.FEED_RESET]
+
+
+@pytest.mark.parametrize("storage_format", ["jsonl"])
+def test_cold_jsonl_update_reports_rating(storage):
+    storage.update_movie("Titanic", "8.5")
+
+    events = storage.changes_since(0)[constant.PAYLOAD][constant.FEED_EVENTS]
+    assert [(event[constant.EVENT_OLD], event[constant.EVENT_NEW])
+            for event in events] == [(7.9, 8.5)]
+
+
+def test_failing_subscriber_does_not_fail_the_commit(storage):
+    def fail(events):
+        raise RuntimeError("subscriber down")
+
+    received = []
+    storage.subscribe(fail)
+    storage.subscribe(received.append)
+
+    result = storage.add_movie("Venom", "2018", "6.6", "", "", "tt1270797")
+
+    assert result[constant.RESULT]
+    assert "Venom" in data_util.load_data(storage.get_file_path())[
+        constant.PAYLOAD]
+    assert event_types(received[0]) == [("added", "Venom")]
+
+
+def test_change_log_error_does_not_fail_the_commit(storage):
+    change_util.get_change_log_path(storage.get_file_path()).mkdir()
+    received = []
+    storage.subscribe(received.append)
+
+    result = storage.update_movie("Joker", "9.0")
+
+    assert result[constant.RESULT]
+    assert data_util.load_data(storage.get_file_path())[constant.PAYLOAD][
+        "Joker"]["rating"] == 9.0
+    assert event_types(received[0]) == [("rating_updated", "Joker")]
+    assert received[0][0][constant.EVENT_VERSION] is None
+
+
+def test_interrupted_append_to_the_log_is_ignored(storage):
+    storage.update_movie("Joker", "9.0")
+    log_path = change_util.get_change_log_path(storage.get_file_path())
+    with open(log_path, "a") as handle:
+        handle.write('{"version": 2, "type": "add')
+    assert storage.changes_since(0)[constant.PAYLOAD][
+               constant.FEED_VERSION] == 1
+
+    received = []
+    storage.subscribe(received.append)
+    storage.delete_movie("Titanic")
+    storage.add_movie("Venom", "2018", "6.6", "", "", "tt1270797")
+
+    feed = storage.changes_since(0)[constant.PAYLOAD]
+    assert [event[constant.EVENT_VERSION]
+            for event in feed[constant.FEED_EVENTS]] == [1, 2, 3]
+    assert [events[0][constant.EVENT_VERSION]
+            for events in received] == [2, 3]
+    assert log_path.read_text().count("\n") == 3
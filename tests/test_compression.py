@@ -0,0 +1,59 @@
+import pytest
+
+from movie.data import movie_storage
+from movie.utility import constant, data_util, index_util, stats_util
+
+"""
+Tests for reading and writing compressed catalogs.
+"""
+
+MAGIC = {".gz": b"\x1f\x8b", ".xz": b"\xfd7zXZ", ".bz2": b"BZh"}
+
+
+@pytest.fixture()
+def catalog():
+    return {"Titanic": {"rating": 7.9, "year": 1997,
+                        "poster": "https://m.media-amazon.com/images/M/a.jpg",
+                        "notes": "A ship", "imdbid": "tt0120338"},
+            "Jaws": {"rating": 8.1, "year": 1975,
+                     "poster": "https://m.media-amazon.com/images/M/b.jpg",
+                     "notes": "", "imdbid": "tt0073195"}}
+
+
+@pytest.mark.parametrize("storage_format", [
+    f"{name}.{suffix}" for name in ("csv", "json", "jsonl")
+    for suffix in ("gz", "xz", "bz2")])
+def test_round_trip(file_path, catalog):
+    assert file_path.read_bytes().startswith(MAGIC[file_path.suffix])
+    assert data_util.load_data(file_path)[constant.PAYLOAD] == catalog
+    assert stats_util.file_stats(file_path)[constant.STATS_COUNT] == 2
+
+
+@pytest.mark.parametrize("storage_format", ["csv.gz", "jsonl.xz"])
+def test_storage_rewrites_compressed_catalogs(storage, file_path):
+    storage.add_movie("Alien", "1979", "8.5", "", "", "tt0078748")
+    storage.update_movie("Jaws", "9.0")
+    storage.delete_movie("Titanic")
+
+    payload = data_util.load_data(file_path)[constant.PAYLOAD]
+    assert sorted(payload) == ["Alien", "Jaws"]
+    assert payload["Jaws"]["rating"] == 9.0
+    assert not index_util.is_indexable(file_path)
+    assert not movie_storage.tail_movies(0, None, file_path)[
+        constant.RESULT]
+
+
+def test_compression_level_is_configurable(tmp_path, monkeypatch):
+    movies = {f"Movie {index}": {"rating": 5.0, "year": 2000,
+                                 "poster": "https://m.media-amazon.com/"
+                                           f"images/M/{index}.jpg"}
+              for index in range(2000)}
+    sizes = {}
+    for level in (0, 9):
+        monkeypatch.setattr(constant, "COMPRESSION_LEVEL", level)
+        file_path = tmp_path / f"level{level}.json.gz"
+        data_util.write_data(movies, file_path)
+        sizes[level] = file_path.stat().st_size
+        assert data_util.load_data(file_path)[constant.PAYLOAD] == movies
+
+    assert sizes[9] * 5 < sizes[0]
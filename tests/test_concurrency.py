@@ -0,0 +1,87 @@
+import json
+import threading
+import time
+
+from movie.storage.storage_json import StorageJson
+from movie.utility import constant, data_util
+
+"""
+Stress tests for sharing one storage instance across many threads.
+
+Writers add, update and delete their own movies while readers list, sort,
+filter and compute statistics over the same catalog. The test fails on any
+exception raised inside a worker (e.g. "dictionary changed size during
+iteration") or if the catalog on disk disagrees with the cached catalog.
+
+Run with `pytest -s` to see the measured throughput.
+"""
+
+WRITERS = 4
+READERS = 8
+OPERATIONS = 50
+
+seed = {
+    "Titanic": {"rating": 7.9, "year": 1997, "poster": "", "notes": "",
+                "imdbid": "tt0120338"},
+    "Spider Man": {"rating": 9.0, "year": 2009, "poster": "", "notes": "",
+                   "imdbid": "tt0145487"}
+}
+
+
+def test_storage_shared_across_threads(tmp_path):
+    file_path = tmp_path / "stress_data.json"
+    file_path.write_text(json.dumps(seed))
+    storage = StorageJson(file_path)
+
+    errors = []
+    operations = []
+
+    def writer(number):
+        try:
+            for index in range(OPERATIONS):
+                title = f"Writer {number} Movie {index}"
+                storage.add_movie(title, "2000", "5.0", "", "",
+                                  f"tt{number}{index:03d}")
+                storage.update_movie(title, "6.0")
+                if index % 2:
+                    storage.delete_movie(title)
+                operations.append(3)
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            for _ in range(OPERATIONS):
+                storage.list_movies()
+                storage.stats_movie()
+                storage.search_movie_sorted_by_rating(constant.RATING_KEY)
+                storage.search_filter_movies(0, 1900, 2100)
+                operations.append(4)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(number,))
+               for number in range(WRITERS)]
+    threads += [threading.Thread(target=reader) for _ in range(READERS)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{sum(operations)} storage operations in {elapsed:.3f}s "
+          f"({sum(operations) / elapsed:.0f} ops/s)")
+
+    assert errors == []
+
+    payload = storage.list_movies()[constant.PAYLOAD]
+    expected = set(seed) | {f"Writer {number} Movie {index}"
+                            for number in range(WRITERS)
+                            for index in range(0, OPERATIONS, 2)}
+    assert set(payload) == expected
+    assert all(payload[title][constant.RATING_KEY] == 6.0
+               for title in expected - set(seed))
+
+    assert data_util.load_data(file_path)[constant.PAYLOAD] == payload
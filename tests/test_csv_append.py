@@ -0,0 +1,89 @@
+import csv
+import os
+
+import pytest
+
+from movie.storage.storage_csv import StorageCsv
+from movie.utility import constant, data_util
+
+"""
+Tests for the append-only fast path of `add_movie` on CSV storage.
+"""
+
+
+@pytest.fixture()
+def storage_format():
+    return "csv"
+
+
+def fetch_cold(file_path):
+    data_util.cached_data.pop(file_path, None)
+    data_util.get_sidecar_path(file_path).unlink(missing_ok=True)
+    return data_util.fetch_data(file_path)[constant.PAYLOAD]
+
+
+def test_add_appends_a_row(storage, file_path):
+    storage.list_movies()
+    inode = os.stat(file_path).st_ino
+    before = file_path.read_bytes()
+
+    storage.add_movie("Spider Man", "2009", "9.0", "", "", "tt0145487")
+
+    assert os.stat(file_path).st_ino == inode
+    assert file_path.read_bytes().startswith(before)
+    assert list(fetch_cold(file_path)) == ["Titanic", "Joker", "Spider Man"]
+
+
+def test_update_rewrites_the_file(storage, file_path):
+    storage.list_movies()
+    inode = os.stat(file_path).st_ino
+
+    storage.update_movie("Titanic", "8.5")
+
+    assert os.stat(file_path).st_ino != inode
+    assert fetch_cold(file_path)["Titanic"][constant.RATING_KEY] == 8.5
+
+
+def test_legacy_header_is_rewritten(tmp_path):
+    file_path = tmp_path / "legacy_data.csv"
+    with open(file_path, "w", newline="") as handle:
+        csv_writer = csv.writer(handle)
+        csv_writer.writerow([constant.TITLE_KEY, constant.RATING_KEY,
+                             constant.YEAR_KEY, constant.POSTER_KEY])
+        csv_writer.writerow(["Titanic", "7.9", "1997", ""])
+    storage = StorageCsv(file_path)
+    storage.list_movies()
+
+    storage.add_movie("Spider Man", "2009", "9.0", "", "notes", "tt0145487")
+
+    with open(file_path, newline="") as handle:
+        assert next(csv.reader(handle))[-1] == constant.IMDBID_KEY
+    assert fetch_cold(file_path)["Spider Man"][constant.NOTES_KEY] == "notes"
+
+
+def test_fsync_policy_never_skips_fsync(storage, file_path, monkeypatch):
+    storage.list_movies()
+    calls = []
+    monkeypatch.setattr(constant, "FSYNC_POLICY", constant.FSYNC_NEVER)
+    monkeypatch.setattr(os, "fsync", calls.append)
+
+    storage.add_movie("Spider Man", "2009", "9.0", "", "", "tt0145487")
+
+    assert calls == []
+    assert "Spider Man" in fetch_cold(file_path)
+
+
+def test_appends_leave_the_snapshot_until_it_is_read(storage, file_path):
+    snapshot = storage.list_movies()[constant.PAYLOAD]
+
+    storage.add_movie("Spider Man", "2009", "9.0", "", "", "tt0145487")
+    storage.add_movie("Venom", "2018", "6.6", "", "", "tt1270797")
+    duplicate = storage.add_movie("VENOM", "2018", "6.6", "", "", "")
+
+    assert not duplicate[constant.RESULT]
+    assert data_util.cached_data[file_path][constant.PAYLOAD] is snapshot
+    assert list(snapshot) == ["Titanic", "Joker"]
+    current = storage.list_movies()[constant.PAYLOAD]
+    assert list(current) == ["Titanic", "Joker", "Spider Man", "Venom"]
+    assert current.find_imdbid("tt1270797") == "Venom"
+    assert storage.list_movies()[constant.PAYLOAD] is current
@@ -0,0 +1,48 @@
+import csv
+
+import pytest
+
+from movie.utility import constant, data_util
+
+"""
+Tests for the positional CSV row decoder used by `load_data`.
+"""
+
+
+@pytest.fixture()
+def catalog():
+    return {
+        "Titanic": {"rating": 7.9, "year": 1997, "poster": "titanic.jpg",
+                    "notes": "classic", "imdbid": "tt0120338"},
+        "Spider Man": {"rating": 9.0, "year": 2009, "poster": "spider.jpg",
+                       "notes": "classic", "imdbid": "tt0145487"}
+    }
+
+
+@pytest.fixture()
+def storage_format():
+    return "csv"
+
+
+def test_round_trip_keeps_all_columns(file_path, catalog):
+    assert data_util.load_data(file_path)[constant.PAYLOAD] == catalog
+
+
+def test_columns_resolved_from_header(tmp_path):
+    file_path = tmp_path / "decode_data.csv"
+    with open(file_path, "w", newline="") as handle:
+        csv_writer = csv.writer(handle)
+        csv_writer.writerow([constant.POSTER_KEY, constant.YEAR_KEY,
+                             constant.TITLE_KEY, constant.RATING_KEY])
+        csv_writer.writerow(["joker.jpg", "2019", "Joker", "8.4"])
+        csv_writer.writerow([])
+
+    assert data_util.load_data(file_path)[constant.PAYLOAD] == {
+        "Joker": {"rating": 8.4, "year": 2019, "poster": "joker.jpg"}}
+
+
+def test_repeated_values_are_shared(file_path):
+    payload = data_util.load_data(file_path)[constant.PAYLOAD]
+
+    titanic, spider_man = payload["Titanic"], payload["Spider Man"]
+    assert titanic[constant.NOTES_KEY] is spider_man[constant.NOTES_KEY]
@@ -0,0 +1,87 @@
+import json
+import multiprocessing
+import os
+import stat
+
+from movie.storage.storage_json import StorageJson
+from movie.utility import constant, data_util
+
+"""
+Tests for sharing one catalog file between several processes.
+
+Each worker process holds its own cache of the catalog. Advisory file
+locking, atomic replacement and version stamps must make sure that no
+process overwrites the movies added by another one.
+"""
+
+PROCESSES = 4
+MOVIES_PER_PROCESS = 15
+
+
+def add_movies(file_path, number):
+    storage = StorageJson(file_path)
+    storage.list_movies()  # warm the cache so it goes stale
+    for index in range(MOVIES_PER_PROCESS):
+        storage.add_movie(f"Process {number} Movie {index}", "2000", "5.0",
+                          "", "", f"tt{number}{index}")
+
+
+def test_processes_do_not_lose_updates(tmp_path):
+    file_path = tmp_path / "shared_data.json"
+    file_path.write_text(json.dumps({}))
+
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=add_movies, args=(file_path, number))
+                 for number in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in processes)
+
+    payload = data_util.load_data(file_path)[constant.PAYLOAD]
+    assert len(payload) == PROCESSES * MOVIES_PER_PROCESS
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_stale_cache_is_reloaded(tmp_path):
+    file_path = tmp_path / "stale_data.json"
+    file_path.write_text(json.dumps({}))
+    storage = StorageJson(file_path)
+
+    assert storage.list_movies()[constant.PAYLOAD] == {}
+
+    # Another process replaces the catalog behind our back.
+    data_util.write_data({"Titanic": {"rating": 7.9, "year": 1997}},
+                         file_path)
+
+    assert list(storage.list_movies()[constant.PAYLOAD]) == ["Titanic"]
+
+
+def test_stale_cache_of_a_reused_inode_is_reloaded(tmp_path):
+    file_path = tmp_path / "stale_data.json"
+    file_path.write_text(json.dumps({"Titanic": {"rating": 7.9,
+                                                 "year": 1997}}))
+    storage = StorageJson(file_path)
+    assert list(storage.list_movies()[constant.PAYLOAD]) == ["Titanic"]
+
+    # A rewrite that keeps the inode, the size and the modification time.
+    file_stat = os.stat(file_path)
+    with open(file_path, "r+") as handle:
+        handle.write(json.dumps({"Avatars": {"rating": 7.9, "year": 1997}}))
+    os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+
+    assert list(storage.list_movies()[constant.PAYLOAD]) == ["Avatars"]
+
+
+def test_written_files_get_the_usual_permissions(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_util, "process_umask", 0o027)
+    file_path = tmp_path / "mode_data.json"
+
+    data_util.write_data({}, file_path)
+    assert stat.S_IMODE(os.stat(file_path).st_mode) == 0o640
+
+    os.chmod(file_path, 0o604)
+    data_util.write_data({}, file_path)
+    assert stat.S_IMODE(os.stat(file_path).st_mode) == 0o604
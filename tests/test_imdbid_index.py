@@ -0,0 +1,87 @@
+import pytest
+
+from movie.data import movie_storage
+from movie.utility import constant, data_util
+from movie.utility.snapshot_util import CatalogOverlay, CatalogSnapshot
+
+"""
+Tests for the IMDb ID index used to look up and de-duplicate movies.
+"""
+
+
+def test_index_follows_evolve(catalog):
+    snapshot = CatalogSnapshot(catalog, 1)
+    assert snapshot.find_imdbid("tt7286456") == "Joker"
+
+    snapshot = snapshot.evolve(
+        {"Venom": {**catalog["Joker"], "imdbid": "tt1270797"},
+         "Titanic": {**catalog["Titanic"], "imdbid": "tt0000001"}},
+        ("Joker",))
+
+    assert snapshot.find_imdbid("tt7286456") is None
+    assert snapshot.find_imdbid("tt0120338") is None
+    assert snapshot.find_imdbid("tt0000001") == "Titanic"
+    assert snapshot.find_imdbid("tt1270797") == "Venom"
+
+
+def test_duplicate_imdbid_survives_removal_of_the_indexed_movie(catalog):
+    snapshot = CatalogSnapshot(
+        {**catalog, "Titanic (1997)": catalog["Titanic"],
+         "TITANIC": catalog["Titanic"]}, 1)
+    assert snapshot.find_imdbid("tt0120338") == "Titanic"
+
+    snapshot = snapshot.evolve(deletions=("Titanic",))
+    assert snapshot.find_imdbid("tt0120338") == "Titanic (1997)"
+    assert snapshot.resolve_title("titanic") == "TITANIC"
+
+    snapshot = snapshot.evolve(
+        {"Titanic (1997)": {**catalog["Titanic"], "imdbid": "tt0000001"}})
+    assert snapshot.find_imdbid("tt0120338") == "TITANIC"
+    assert snapshot.find_imdbid("tt0000001") == "Titanic (1997)"
+
+    snapshot = snapshot.evolve(deletions=("TITANIC",))
+    assert snapshot.find_imdbid("tt0120338") is None
+    assert snapshot.resolve_title("titanic") is None
+
+
+def test_overlay_finds_a_surviving_duplicate(catalog):
+    snapshot = CatalogSnapshot(
+        {**catalog, "Titanic (1997)": catalog["Titanic"]}, 1)
+    overlay = CatalogOverlay(snapshot)
+
+    overlay.remove("Titanic")
+    assert overlay.find_imdbid("tt0120338") == "Titanic (1997)"
+
+    overlay.put("Venom", {**catalog["Joker"], "imdbid": "tt1270797"})
+    overlay.put("Venom 2", {**catalog["Joker"], "imdbid": "tt1270797"})
+    overlay.remove("Venom 2")
+    assert overlay.find_imdbid("tt1270797") == "Venom"
+
+
+def test_duplicate_imdbid_is_rejected_before_writing(storage):
+    storage.list_movies()
+    before = storage.get_file_path().read_bytes()
+
+    result = storage.add_movie("The Joker", "2019", "8.4", "", "",
+                               "tt7286456")
+
+    assert not result[constant.RESULT]
+    assert "Joker" in result[constant.MESSAGE]
+    assert storage.get_file_path().read_bytes() == before
+
+
+def test_find_movie_by_imdbid(storage, catalog):
+    result = storage.find_movie_by_imdbid("tt0120338")
+
+    assert result[constant.RESULT]
+    assert result[constant.PAYLOAD] == {"Titanic": catalog["Titanic"]}
+    assert not storage.find_movie_by_imdbid("tt0000000")[constant.RESULT]
+
+
+@pytest.mark.parametrize("storage_format", ["csv"])
+def test_find_by_imdbid_cold_csv(file_path, catalog, monkeypatch):
+    monkeypatch.setattr(data_util, "load_data", None)
+
+    result = movie_storage.find_movie_by_imdbid("tt7286456", file_path)
+
+    assert result[constant.PAYLOAD] == {"Joker": catalog["Joker"]}
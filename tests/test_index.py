@@ -0,0 +1,178 @@
+import csv
+import json
+import threading
+
+import pytest
+
+from movie.data import movie_storage
+from movie.utility import constant, data_util, index_util, lock_util
+
+"""
+Tests for the title and IMDb ID index used for point lookups.
+"""
+
+
+@pytest.fixture()
+def catalog():
+    return {"Titanic": {"rating": 7.9, "year": 1997, "poster": "",
+                        "notes": "a \"classic\",\nover two lines",
+                        "imdbid": "tt0120338"},
+            "Spider Man": {"rating": 9.0, "year": 2009, "poster": "",
+                           "notes": "", "imdbid": "tt0145487"}}
+
+
+@pytest.fixture(params=["csv", "jsonl"])
+def storage_format(request):
+    return request.param
+
+
+def refuse_to_load(file_path, progress=None):
+    raise AssertionError("The catalog was loaded instead of indexed.")
+
+
+@pytest.fixture()
+def file_path(file_path, monkeypatch):
+    monkeypatch.setattr(data_util, "load_data", refuse_to_load)
+    return file_path
+
+
+def read_header(file_path):
+    return index_util.read_index(index_util.get_index_path(file_path))
+
+
+def test_find_title_without_loading(file_path, catalog):
+    assert movie_storage.find_movie("Titanic", file_path)[
+               constant.PAYLOAD] == catalog["Titanic"]
+    assert movie_storage.find_movie("Venom", file_path)[
+               constant.PAYLOAD] is None
+    assert file_path not in data_util.cached_data
+
+
+def test_storage_lookups_do_not_parse_the_catalog(storage, file_path,
+                                                  catalog):
+    assert storage.find_movie("titanic")[constant.RESULT]
+    assert storage.find_movie_by_imdbid("tt0145487")[constant.PAYLOAD] == {
+        "Spider Man": catalog["Spider Man"]}
+    assert not storage.find_movie("Venom")[constant.RESULT]
+    assert file_path not in data_util.cached_data
+    assert data_util.get_load_status(file_path)[
+               constant.LOAD_STATE] == constant.LOAD_PENDING
+
+
+def test_lookup_waits_for_a_writer(file_path):
+    found = []
+    lookup = threading.Thread(target=lambda: found.append(
+        index_util.find_title(file_path, "Titanic")))
+
+    with lock_util.file_locked(file_path):
+        lookup.start()
+        lookup.join(0.2)
+        assert lookup.is_alive()
+        # The lock is reentrant, so the writer can look up titles itself.
+        assert "Titanic" in index_util.find_title(file_path, "Titanic")
+
+    lookup.join()
+    assert "Titanic" in found[0]
+
+
+def test_find_title_is_case_insensitive(file_path, catalog):
+    assert index_util.find_title(file_path, "spider MAN") == {
+        "Spider Man": catalog["Spider Man"]}
+
+
+def test_find_imdbid(file_path, catalog):
+    assert index_util.find_imdbid(file_path, "tt0145487") == {
+        "Spider Man": catalog["Spider Man"]}
+    assert index_util.find_imdbid(file_path, "tt0000000") == {}
+
+
+def test_appends_are_indexed_incrementally(file_path, catalog):
+    index_util.refresh_index(file_path)
+    _, indexed, _, sorted_count, delta_count = read_header(file_path)
+
+    if "csv" in file_path.name:
+        with open(file_path, "a", newline="") as handle:
+            csv.writer(handle).writerow(
+                data_util.encode_csv_row("Venom", catalog["Spider Man"]))
+    else:
+        data_util.append_changes(file_path, {"Venom": catalog["Spider Man"]})
+
+    assert "Venom" in index_util.find_title(file_path, "Venom")
+    _, now_indexed, _, now_sorted, now_delta = read_header(file_path)
+    assert now_indexed == file_path.stat().st_size > indexed
+    assert (now_sorted, now_delta) == (sorted_count, delta_count + 2)
+
+
+def test_rewrite_rebuilds_index(file_path, catalog):
+    index_util.refresh_index(file_path)
+
+    data_util.write_data({"Venom": catalog["Spider Man"]}, file_path)
+
+    assert index_util.find_title(file_path, "Titanic") == {}
+    assert "Venom" in index_util.find_title(file_path, "Venom")
+
+
+def test_stale_index_of_a_reused_inode_is_rebuilt(file_path, catalog):
+    index_util.refresh_index(file_path)
+    index_path = index_util.get_index_path(file_path)
+    stale_index = index_path.read_bytes()
+    inode = file_path.stat().st_ino
+    rewritten = {"Zzzzz": catalog["Titanic"], "Yyyyyy": catalog["Titanic"],
+                 "Xxxxxx": catalog["Titanic"]}
+
+    # Rewrite until the catalog is given back its first inode.
+    for attempt in range(200):
+        data_util.write_data(rewritten, file_path)
+        if file_path.stat().st_ino == inode:
+            break
+    else:
+        pytest.skip("The filesystem did not reuse the inode.")
+
+    assert not index_path.exists()
+    index_path.write_bytes(stale_index)
+    assert "Zzzzz" in index_util.find_title(file_path, "Zzzzz")
+    assert index_util.find_title(file_path, "Titanic") == {}
+
+
+def test_delta_is_merged(file_path, monkeypatch):
+    monkeypatch.setattr(constant, "INDEX_DELTA_MIN_ENTRIES", 0)
+
+    index_util.refresh_index(file_path)
+
+    _, _, _, sorted_count, delta_count = read_header(file_path)
+    assert (sorted_count, delta_count) == (4, 0)
+    assert "Titanic" in index_util.find_title(file_path, "Titanic")
+
+
+@pytest.mark.parametrize("storage_format", ["jsonl"])
+def test_jsonl_overrides_and_tombstones(file_path, catalog):
+    data_util.append_data(file_path, [
+        json.dumps({"title": "Titanic", **catalog["Titanic"],
+                    "rating": 8.5}) + "\n",
+        json.dumps({"title": "Spider Man", "deleted": True}) + "\n"])
+
+    assert index_util.find_title(file_path, "Titanic")["Titanic"][
+               constant.RATING_KEY] == 8.5
+    assert index_util.find_title(file_path, "Spider Man") == {}
+    assert index_util.find_imdbid(file_path, "tt0145487") == {}
+
+
+@pytest.mark.parametrize("storage_format", ["jsonl"])
+def test_cold_jsonl_update_appends(file_path):
+    result = movie_storage.update_movie("Titanic", "8.5", file_path)
+
+    assert result[constant.RESULT]
+    assert json.loads(file_path.read_text().splitlines()[-1])[
+               constant.RATING_KEY] == 8.5
+
+
+@pytest.mark.parametrize("storage_format", ["jsonl"])
+def test_cold_jsonl_update_rejects_invalid_rating(file_path):
+    contents = file_path.read_bytes()
+
+    result = movie_storage.update_movie("titanic", "abc", file_path)
+
+    assert not result[constant.RESULT]
+    assert result[constant.MESSAGE] == ("The rating of the movie Titanic "
+                                        "is not valid.")
+    assert file_path.read_bytes() == contents
@@ -0,0 +1,65 @@
+import io
+import json
+import tracemalloc
+
+import pytest
+
+from movie.utility import constant, data_util, json_stream_util
+
+"""
+Tests for the streaming JSON writer and reader used for JSON catalogs.
+"""
+
+catalog = {
+    "Titanic": {"rating": 7.9, "year": 1997, "notes": "été \"1\""},
+    "Spider Man": {"rating": 9.0, "year": 2009, "notes": "a,b}{"},
+    "Venom": {"rating": 6.6, "year": 2018, "tags": [1, 2.5, None, True]}
+}
+
+
+def test_writer_matches_json_dumps():
+    handle = io.StringIO()
+    json_stream_util.write_json_object(catalog, handle)
+
+    assert handle.getvalue() == json.dumps(catalog)
+
+
+def test_writer_handles_empty_catalog():
+    handle = io.StringIO()
+    json_stream_util.write_json_object({}, handle)
+
+    assert handle.getvalue() == "{}"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1 << 16])
+def test_reader_matches_json_loads(chunk_size, monkeypatch):
+    monkeypatch.setattr(json_stream_util, "READ_CHUNK_SIZE", chunk_size)
+    text = json.dumps(catalog, indent=2)
+
+    payload = json_stream_util.read_json_object(io.StringIO(text))
+
+    assert list(payload.items()) == list(json.loads(text).items())
+
+
+@pytest.mark.parametrize("text", ["", "[1]", '{"a": 1,}', '{"a" 1}',
+                                  '{"a": 1} x', '{"a": 1', '{1: 2}'])
+def test_reader_rejects_invalid_json(text, monkeypatch):
+    monkeypatch.setattr(json_stream_util, "READ_CHUNK_SIZE", 2)
+
+    with pytest.raises(json.JSONDecodeError):
+        json_stream_util.read_json_object(io.StringIO(text))
+
+
+def test_write_memory_bounded_by_record(tmp_path):
+    file_path = tmp_path / "stream_data.json"
+    details = {f"Movie {index}": {"rating": 5.0, "year": 2000,
+                                  "poster": "x" * 100}
+               for index in range(20_000)}
+
+    tracemalloc.start()
+    data_util.write_data(details, file_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak < file_path.stat().st_size / 4
+    assert data_util.load_data(file_path)[constant.PAYLOAD] == details
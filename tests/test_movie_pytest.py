@@ -99,10 +99,18 @@ class TestMovie:
         result = movie_service.service_add_movie(title, str(year),
                                                  str(rating), "Temp File",
                                                  "notes",
-                                                 "IMDBid",
+                                                 f"IMDBid {title}",
                                                  constant.TEST_FILE_PATH)
         assert result["result"] == expected_output
 
+    def test_add_movie_duplicate_imdbid(self, resource):
+        result = movie_service.service_add_movie("The Jerome", "2025",
+                                                 "9.9", "Temp File",
+                                                 "notes",
+                                                 "IMDBid Movie Jerome",
+                                                 constant.TEST_FILE_PATH)
+        assert result["result"] is False
+
     # 4. Update movie   *********************************
 
     @pytest.mark.parametrize("title, rating, expected_output",
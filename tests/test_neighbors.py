@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+from movie.utility import constant
+from movie.utility.neighbor_util import NeighborIndex, distance, \
+    get_features, similar_movies
+from movie.utility.snapshot_util import CatalogSnapshot
+
+"""
+Tests for the k-d tree behind the similar movies lookup.
+"""
+
+
+def build_catalog(rows, seed=2):
+    rng = random.Random(seed)
+    return {f"Movie {index}": {"rating": round(rng.uniform(1, 10), 1),
+                               "year": rng.randint(1950, 2020),
+                               "poster": "", "notes": "", "imdbid": ""}
+            for index in range(rows)}
+
+
+def brute_force(snapshot, title, count=None, radius=None):
+    target = get_features(snapshot[title])
+    found = sorted((distance(target, get_features(entry)), other)
+                   for other, entry in snapshot.items() if other != title)
+    if radius is not None:
+        found = [pair for pair in found if pair[0] <= radius]
+    return [(other, gap) for gap, other in found[:count]]
+
+
+def neighbors(results):
+    return [(title, gap) for title, entry, gap in results]
+
+
+def assert_nearest(snapshot, title, count):
+    # Movies at the same distance may be returned in any order.
+    results = neighbors(similar_movies(snapshot, title, count))
+    expected = brute_force(snapshot, title, count)
+    assert [gap for other, gap in results] == [gap for other, gap in expected]
+    target = get_features(snapshot[title])
+    for other, gap in results:
+        assert other != title
+        assert distance(target, get_features(snapshot[other])) == gap
+
+
+@pytest.mark.parametrize("count", [1, 5, 40])
+def test_nearest_matches_brute_force(count):
+    snapshot = CatalogSnapshot(build_catalog(500), 1)
+    for title in random.Random(count).sample(list(snapshot), 20):
+        assert_nearest(snapshot, title, count)
+
+
+@pytest.mark.parametrize("radius", [0.0, 0.3, 1.5])
+def test_radius_matches_brute_force(radius):
+    snapshot = CatalogSnapshot(build_catalog(500), 1)
+    for title in random.Random(7).sample(list(snapshot), 20):
+        assert neighbors(similar_movies(snapshot, title, radius=radius)) == \
+            brute_force(snapshot, title, radius=radius)
+
+
+def test_tree_is_patched_and_rebuilt_after_writes(monkeypatch):
+    monkeypatch.setattr(constant, "NEIGHBOR_REBUILD_MIN", 10)
+    rng = random.Random(4)
+    snapshot = CatalogSnapshot(build_catalog(100), 1)
+    similar_movies(snapshot, "Movie 0", 5)
+    tree = snapshot.derive("neighbors", NeighborIndex).tree
+
+    shared = []
+    for _ in range(8):
+        changes = {f"Movie {rng.randint(1, 150)}": {
+            "rating": round(rng.uniform(1, 10), 1),
+            "year": rng.randint(1950, 2020)}}
+        deletions = tuple(title for title in rng.sample(list(snapshot), 1)
+                          if title not in changes and title != "Movie 0")
+        snapshot = snapshot.evolve(changes, deletions)
+
+        shared.append(snapshot.derive("neighbors", NeighborIndex).tree
+                      is tree)
+        assert_nearest(snapshot, "Movie 0", 10)
+        assert neighbors(similar_movies(snapshot, "Movie 0",
+                                        radius=1.0)) == \
+            brute_force(snapshot, "Movie 0", radius=1.0)
+    assert shared[0] and not shared[-1]
+
+
+@pytest.fixture()
+def catalog(catalog):
+    return {**catalog, "Jaws": {"rating": 8.1, "year": 1975, "poster": "",
+                                "notes": "", "imdbid": "tt0073195"}}
+
+
+@pytest.mark.parametrize("storage_format", ["csv", "json"])
+def test_storage_similar_movies(storage):
+    result = storage.similar_movies("titanic", 1)
+    assert [title for title, entry, gap in result[constant.PAYLOAD]] == [
+        "Jaws"]
+
+    storage.add_movie("Good Will Hunting", "1997", "8.3", "", "",
+                      "tt0119217")
+    result = storage.similar_movies("Titanic", radius=0.5)
+    assert [(title, round(gap, 2))
+            for title, entry, gap in result[constant.PAYLOAD]] == [
+        ("Good Will Hunting", 0.4)]
+
+    assert not storage.similar_movies("Alien")[constant.RESULT]
@@ -0,0 +1,62 @@
+import csv
+
+import pytest
+
+from movie.utility import constant, data_util, parallel_util
+
+"""
+Tests for the multi-core CSV loader: it must return exactly what the serial
+loader returns, also for fields with quoted newlines, commas and quotes.
+"""
+
+ROWS = 500
+
+
+@pytest.fixture()
+def file_path(tmp_path):
+    file_path = tmp_path / "parallel_data.csv"
+    with open(file_path, "w", newline="") as handle:
+        csv_writer = csv.writer(handle)
+        csv_writer.writerow([constant.TITLE_KEY, constant.RATING_KEY,
+                             constant.YEAR_KEY, constant.POSTER_KEY])
+        for index in range(ROWS):
+            title = [f"Movie {index}",
+                     f"Movie, {index}\nThe \"Sequel\"",
+                     f"\"Quoted\"\n\n{index}",
+                     "Movie 7"][index % 4]
+            csv_writer.writerow([title, index % 10, 1900 + index,
+                                 f"poster\n{index}"])
+    return file_path
+
+
+def serial_payload(file_path):
+    return data_util.load_data(file_path)[constant.PAYLOAD]
+
+
+@pytest.mark.parametrize("chunks", [1, 2, 3, 7, 64, 5000])
+def test_chunks_match_serial_loader(file_path, chunks):
+    boundaries = parallel_util.find_chunk_boundaries(file_path, chunks)
+    fieldnames = [constant.TITLE_KEY, constant.RATING_KEY,
+                  constant.YEAR_KEY, constant.POSTER_KEY]
+
+    payload = {}
+    for start, end in zip(boundaries, boundaries[1:]):
+        payload.update(parallel_util.parse_chunk(file_path, start, end,
+                                                 fieldnames))
+
+    assert boundaries == sorted(set(boundaries))
+    assert list(payload.items()) == list(serial_payload(file_path).items())
+
+
+def test_parallel_loader_matches_serial_loader(file_path):
+    result = parallel_util.load_csv_parallel(file_path, workers=3)
+
+    assert result[constant.RESULT]
+    assert (list(result[constant.PAYLOAD].items())
+            == list(serial_payload(file_path).items()))
+
+
+def test_parallel_loader_reports_missing_file(tmp_path):
+    result = parallel_util.load_csv_parallel(tmp_path / "missing.csv")
+
+    assert not result[constant.RESULT]
@@ -0,0 +1,94 @@
+import csv
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from movie.storage.storage_csv import StorageCsv
+from movie.utility import constant
+
+"""
+Tests for loading the catalog in the background at startup.
+"""
+
+ROWS = 20_000
+
+
+def write_catalog(file_path):
+    with open(file_path, "w", newline="") as handle:
+        csv_writer = csv.writer(handle)
+        csv_writer.writerow([constant.TITLE_KEY, constant.RATING_KEY,
+                             constant.YEAR_KEY, constant.POSTER_KEY])
+        for index in range(ROWS):
+            csv_writer.writerow([f"Movie {index}", 5.0, 2000, ""])
+
+
+def wait_until_loaded(storage, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = storage.get_load_status()[constant.PAYLOAD]
+        if status[constant.LOAD_STATE] == constant.LOAD_LOADED:
+            return status
+        time.sleep(0.01)
+    raise TimeoutError("The catalog was not loaded in the background.")
+
+
+def test_storage_loads_in_background(tmp_path):
+    file_path = tmp_path / "prefetch_data.csv"
+    write_catalog(file_path)
+
+    storage = StorageCsv(file_path)
+    assert storage.get_load_status()[constant.PAYLOAD][
+               constant.LOAD_STATE] == constant.LOAD_PENDING
+    storage.prefetch()
+    status = wait_until_loaded(storage)
+
+    assert status[constant.LOAD_ROWS] == ROWS
+    assert status[constant.LOAD_BYTES_READ] == file_path.stat().st_size
+    assert status[constant.LOAD_BYTES_TOTAL] == file_path.stat().st_size
+    assert status[constant.LOAD_DURATION] > 0
+
+
+def test_first_command_waits_for_background_load(tmp_path):
+    file_path = tmp_path / "prefetch_data.csv"
+    write_catalog(file_path)
+
+    storage = StorageCsv(file_path)
+    storage.prefetch()
+    result = storage.list_movies()
+    status = storage.get_load_status()[constant.PAYLOAD]
+
+    assert len(result[constant.PAYLOAD]) == ROWS
+    assert status[constant.LOAD_STATE] == constant.LOAD_LOADED
+
+    # The catalog is parsed once, by the background thread.
+    storage.list_movies()
+    assert storage.get_load_status()[constant.PAYLOAD] == status
+
+
+def test_exit_during_prefetch_leaves_no_temporary_file(tmp_path):
+    file_path = tmp_path / "prefetch_data.csv"
+    write_catalog(file_path)
+    # Exit while the sidecar of the background load is being written.
+    script = f"""
+import tempfile, time
+from pathlib import Path
+from movie.storage.storage_csv import StorageCsv
+
+mkstemp = tempfile.mkstemp
+def slow_mkstemp(*args, **kwargs):
+    created = mkstemp(*args, **kwargs)
+    time.sleep(0.5)
+    return created
+tempfile.mkstemp = slow_mkstemp
+
+directory = Path({str(tmp_path)!r})
+StorageCsv(directory / "prefetch_data.csv").prefetch()
+while not list(directory.glob("*.tmp")):
+    time.sleep(0.001)
+"""
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=60,
+                   cwd=Path(__file__).parent.parent)
+
+    assert not list(tmp_path.glob("*.tmp"))
+    assert (tmp_path / "prefetch_data.csv.snapshot").exists()
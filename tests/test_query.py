@@ -0,0 +1,165 @@
+import random
+
+import pytest
+
+from movie.utility import constant
+from movie.utility.query_util import MovieQuery, SortedIndex
+from movie.utility.snapshot_util import CatalogSnapshot
+
+"""
+Tests for the composable query API and its planner.
+"""
+
+
+@pytest.fixture()
+def catalog():
+    return {"Titanic": {"rating": 7.9, "year": 1997, "poster": "",
+                        "notes": "Ship meets iceberg", "imdbid": "tt0120338"},
+            "Joker": {"rating": 8.4, "year": 2019, "poster": "",
+                      "notes": "", "imdbid": "tt7286456"},
+            "Jaws": {"rating": 8.1, "year": 1975, "poster": "",
+                     "notes": "A shark and a boat", "imdbid": "tt0073195"},
+            "Venom": {"rating": 6.6, "year": 2018, "poster": "",
+                      "notes": "", "imdbid": "tt1270797"},
+            "Jurassic Park": {"rating": 8.2, "year": 1993, "poster": "",
+                              "notes": "Dinosaurs", "imdbid": "tt0107290"}}
+
+
+def titles(results):
+    return [title for title, entry in results]
+
+
+@pytest.fixture()
+def snapshot(catalog):
+    return CatalogSnapshot(catalog, 1)
+
+
+def test_predicates_combine(snapshot):
+    query = MovieQuery().title_prefix("j").rating_between(8.2)
+    assert titles(query.execute(snapshot)) == ["Joker", "Jurassic Park"]
+
+    query = MovieQuery().year_between(1990, 2000).notes_contains("DINO")
+    assert titles(query.execute(snapshot)) == ["Jurassic Park"]
+
+    query = MovieQuery().title_contains("o").rating_between(maximum=8)
+    assert titles(query.execute(snapshot)) == ["Venom"]
+
+    assert titles(MovieQuery().title_equals("  jaws ").execute(
+        snapshot)) == ["Jaws"]
+    assert MovieQuery().title_equals("Alien").execute(snapshot) == []
+
+
+def test_results_keep_catalog_order_without_order_by(snapshot):
+    query = MovieQuery().rating_between(8)
+    assert query.explain(snapshot)[constant.PLAN_ACCESS] == "rating index"
+    assert titles(query.execute(snapshot)) == ["Joker", "Jaws",
+                                               "Jurassic Park"]
+
+
+def test_order_by_several_keys_and_page(snapshot):
+    query = (MovieQuery().order_by(constant.YEAR_KEY, descending=True)
+             .order_by(constant.TITLE_KEY))
+    assert titles(query.execute(snapshot)) == ["Joker", "Venom", "Titanic",
+                                               "Jurassic Park", "Jaws"]
+
+    assert titles(query.offset(1).limit(2).execute(snapshot)) == [
+        "Venom", "Titanic"]
+
+    with pytest.raises(ValueError):
+        MovieQuery().order_by(constant.POSTER_KEY)
+
+
+def test_planner_picks_most_selective_index(snapshot):
+    plan = (MovieQuery().rating_between(6).year_between(2019, 2019)
+            .explain(snapshot))
+    assert plan[constant.PLAN_ACCESS] == "year index"
+    assert plan[constant.PLAN_ESTIMATES] == {"full scan": 5,
+                                             "rating index": 5,
+                                             "year index": 1}
+    assert plan[constant.PLAN_ROWS] == 1
+    assert set(plan[constant.PLAN_TIMINGS]) == {"plan", "filter", "sort"}
+
+    plan = MovieQuery().title_equals("joker").explain(snapshot)
+    assert plan[constant.PLAN_ACCESS] == "title index"
+
+    plan = MovieQuery().notes_contains("shark").explain(snapshot)
+    assert plan[constant.PLAN_ACCESS] == "full scan"
+
+
+def test_planner_reads_only_the_chosen_index(snapshot, monkeypatch):
+    found = []
+    find = SortedIndex.find
+
+    def find_and_record(index, minimum, maximum):
+        found.append((minimum, maximum))
+        return find(index, minimum, maximum)
+
+    monkeypatch.setattr(SortedIndex, "find", find_and_record)
+
+    plan = (MovieQuery().title_prefix("j").rating_between(6)
+            .year_between(2019, 2019).explain(snapshot))
+
+    assert plan[constant.PLAN_ESTIMATES] == {"full scan": 5,
+                                             "title prefix index": 3,
+                                             "rating index": 5,
+                                             "year index": 1}
+    assert found == [(2019, 2019)]
+
+
+def test_indexes_match_a_scan_on_random_queries():
+    rng = random.Random(7)
+    snapshot = CatalogSnapshot(
+        {f"Movie {index}": {"rating": rng.randint(10, 100) / 10,
+                            "year": rng.randint(1950, 2020),
+                            "poster": "", "notes": ""}
+         for index in range(500)}, 1)
+
+    for _ in range(50):
+        minimum = rng.randint(10, 100) / 10
+        start = rng.randint(1950, 2020)
+        prefix = f"movie {rng.randint(1, 9)}"
+        query = (MovieQuery().rating_between(minimum, minimum + 2)
+                 .year_between(start, start + 10).title_prefix(prefix))
+
+        expected = [title for title, entry in snapshot.items()
+                    if minimum <= entry["rating"] <= minimum + 2
+                    and start <= entry["year"] <= start + 10
+                    and title.lower().startswith(prefix)]
+        assert titles(query.execute(snapshot)) == expected
+
+
+def test_storage_wrappers_use_queries(storage, catalog):
+    result = storage.search_movie_sorted_by_rating(constant.RATING_KEY)
+    assert list(result[constant.PAYLOAD]) == ["Joker", "Jurassic Park",
+                                              "Jaws", "Titanic", "Venom"]
+
+    result = storage.search_filter_movies(8, 1990, 2020)
+    assert result[constant.PAYLOAD] == [{"Joker": catalog["Joker"]},
+                                        {"Jurassic Park":
+                                         catalog["Jurassic Park"]}]
+
+    result = storage.query_movies(MovieQuery().title_prefix("ju"))
+    assert titles(result[constant.PAYLOAD]) == ["Jurassic Park"]
+
+    storage.add_movie("Jumanji", "1995", "7.1", "", "", "tt0113497")
+    result = storage.explain_query(MovieQuery().title_prefix("ju"))
+    assert result[constant.PAYLOAD][constant.PLAN_ROWS] == 2
+
+
+def test_indexes_are_carried_over_to_evolved_snapshots(snapshot, catalog):
+    query = MovieQuery().rating_between(8).title_prefix("j")
+    query.execute(snapshot)
+
+    evolved = snapshot.evolve(
+        {"Jumanji": {"rating": 8.0, "year": 1995, "poster": "", "notes": ""},
+         "Jaws": {**catalog["Jaws"], "rating": 5.0}},
+        ("Joker",))
+    rebuilt = CatalogSnapshot(dict(evolved), evolved.version)
+
+    for query in (MovieQuery().rating_between(8),
+                  MovieQuery().title_prefix("j"),
+                  MovieQuery().rating_between(5, 8).order_by(
+                      constant.RATING_KEY)):
+        assert query.execute(evolved) == query.execute(rebuilt)
+    assert titles(MovieQuery().title_prefix("j").execute(evolved)) == [
+        "Jaws", "Jurassic Park", "Jumanji"]
@@ -0,0 +1,83 @@
+import pytest
+
+from movie.movie_services import movie_service
+from movie.utility import constant
+from movie.utility.cache_util import QueryCache
+from movie.utility.snapshot_util import CatalogSnapshot
+
+"""
+Tests for the query result cache of the movie service.
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_query_cache():
+    movie_service.query_cache.clear()
+    yield
+    movie_service.query_cache.clear()
+
+
+def counts(storage):
+    stats = storage.query_cache_stats()[constant.PAYLOAD]
+    return stats[constant.CACHE_HITS], stats[constant.CACHE_MISSES]
+
+
+@pytest.mark.parametrize("storage_format", ["csv", "json"])
+def test_repeated_queries_are_served_from_cache(storage):
+    first = storage.search_filter_movies(7.0, 1970, 2000)
+    assert counts(storage) == (0, 1)
+    assert storage.search_filter_movies(7.0, 1970, 2000) is first
+    assert counts(storage) == (1, 1)
+
+    storage.search_movie_sorted_by_rating(constant.RATING_KEY)
+    storage.search_movie_sorted_by_rating(constant.RATING_KEY)
+    storage.search_movie("an")
+    storage.search_movie("an")
+    storage.search_notes("joker")
+    storage.search_notes("joker")
+    assert counts(storage) == (4, 4)
+
+
+def test_writes_invalidate_cached_results(storage):
+    before = storage.search_movie_sorted_by_year(constant.YEAR_KEY)
+    storage.add_movie("Alien", "1979", "8.5", "", "", "")
+    after = storage.search_movie_sorted_by_year(constant.YEAR_KEY)
+    assert after is not before
+    assert "Alien" in after[constant.PAYLOAD]
+    assert "Alien" not in before[constant.PAYLOAD]
+    assert counts(storage) == (0, 2)
+
+
+def test_transactions_bypass_the_cache(storage):
+    storage.search_movie("a")
+    with storage.transaction():
+        storage.add_movie("Alien", "1979", "8.5", "", "", "")
+        titles = [next(iter(movie)) for movie in
+                  storage.search_movie("a")[constant.PAYLOAD]]
+        assert "Alien" in titles
+    assert counts(storage) == (0, 1)
+
+
+def test_least_recently_used_results_are_evicted(catalog):
+    cache = QueryCache(2)
+    snapshot = CatalogSnapshot(catalog, 1)
+    cache.store("scope", ("a",), snapshot, "A")
+    cache.store("scope", ("b",), snapshot, "B")
+    assert cache.lookup("scope", ("a",), snapshot) == "A"
+    cache.store("scope", ("c",), snapshot, "C")
+
+    assert cache.lookup("scope", ("b",), snapshot) is None
+    assert cache.lookup("scope", ("a",), snapshot) == "A"
+    assert cache.lookup("scope", ("c",), snapshot) == "C"
+    assert cache.stats()[constant.CACHE_ENTRIES] == 2
+
+
+def test_snapshots_are_told_apart_by_identity(catalog):
+    cache = QueryCache(8)
+    first = CatalogSnapshot(catalog, 1)
+    cache.store("scope", ("a",), first, "A")
+    cache.store("other", ("a",), first, "other A")
+
+    reloaded = CatalogSnapshot(catalog, 1)
+    assert cache.lookup("scope", ("a",), reloaded) is None
+    assert cache.lookup("other", ("a",), first) == "other A"
@@ -0,0 +1,109 @@
+import random
+
+import pytest
+
+from movie.utility import constant
+from movie.utility.search_util import InvertedIndex, search_movies, tokenize
+from movie.utility.snapshot_util import CatalogSnapshot
+
+"""
+Tests for the ranked full-text search over notes and titles.
+"""
+
+
+@pytest.fixture()
+def catalog():
+    return {"Titanic": {"rating": 7.9, "year": 1997, "poster": "",
+                        "notes": "A ship hits an iceberg", "imdbid": ""},
+            "Jaws": {"rating": 8.1, "year": 1975, "poster": "",
+                     "notes": "A shark, a boat, a bigger boat", "imdbid": ""},
+            "The Boat": {"rating": 8.4, "year": 1981, "poster": "",
+                         "notes": "Submarine war film", "imdbid": ""},
+            "Venom": {"rating": 6.6, "year": 2018, "poster": "",
+                      "notes": "", "imdbid": ""}}
+
+
+def titles(results):
+    return [result[0] for result in results]
+
+
+def test_tokenize_normalizes_words():
+    assert tokenize("Ｓhip,  ICEBERG!") == ["ship", "iceberg"]
+    assert tokenize(None) == []
+
+
+def test_results_are_ranked(catalog):
+    snapshot = CatalogSnapshot(catalog, 1)
+
+    results = search_movies(snapshot, "boat", 10)
+    assert titles(results) == ["Jaws", "The Boat"]
+    assert results[0][2] > results[1][2] > 0
+
+    assert titles(search_movies(snapshot, "boat", 10, titles=False)) == [
+        "Jaws"]
+    assert titles(search_movies(snapshot, "ship shark", 1)) in (
+        ["Titanic"], ["Jaws"])
+    assert search_movies(snapshot, "dinosaur", 10) == []
+
+
+def test_index_is_carried_over_to_evolved_snapshots():
+    rng = random.Random(3)
+    words = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta"]
+
+    def notes():
+        return " ".join(rng.choice(words) for _ in range(rng.randint(0, 6)))
+
+    snapshot = CatalogSnapshot({f"Movie {index}": {"notes": notes()}
+                                for index in range(50)}, 1)
+    search_movies(snapshot, "alpha", 5)
+
+    for _ in range(20):
+        changes = {f"Movie {rng.randint(0, 80)}": {"notes": notes()}
+                   for _ in range(3)}
+        deletions = tuple(title for title in rng.sample(list(snapshot), 2)
+                          if title not in changes)
+        snapshot = snapshot.evolve(changes, deletions)
+
+        rebuilt = InvertedIndex(snapshot)
+        index = snapshot.derive("fulltext titles", InvertedIndex)
+        assert index.postings == rebuilt.postings
+        assert index.lengths == rebuilt.lengths
+        assert index.total_length == rebuilt.total_length
+
+
+@pytest.mark.parametrize("storage_format", ["csv", "json"])
+def test_storage_search_notes(storage):
+    assert titles(storage.search_notes("iceberg")[constant.PAYLOAD]) == [
+        "Titanic"]
+
+    storage.add_movie("Alien", "1979", "8.5", "", "Iceberg of a film", "")
+    storage.delete_movie("Titanic")
+    assert titles(storage.search_notes("iceberg")[constant.PAYLOAD]) == [
+        "Alien"]
+
+    result = storage.search_notes("dinosaur")
+    assert not result[constant.RESULT]
+
+
+def test_top_k_matches_scoring_every_movie():
+    rng = random.Random(5)
+    words = [f"w{index}" for index in range(30)]
+    snapshot = CatalogSnapshot(
+        {f"Movie {index}": {"notes": " ".join(
+            rng.choices(words, [1 / (rank + 1) for rank in range(30)],
+                        k=rng.randint(1, 8)))}
+         for index in range(300)}, 1)
+    index = InvertedIndex(snapshot, titles=False)
+
+    for _ in range(30):
+        query = rng.sample(words, 3)
+        scores = {}
+        for word in query:
+            for title, score in (index.impacts(word) or ({}, []))[1]:
+                scores[title] = scores.get(title, 0.0) + score
+        expected = sorted(scores.values(), reverse=True)[:5]
+
+        results = index.search(" ".join(query), 5)
+        assert [score for title, score in results] == pytest.approx(expected)
+        for title, score in results:
+            assert scores[title] == pytest.approx(score)
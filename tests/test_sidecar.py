@@ -0,0 +1,98 @@
+import json
+import pickle
+
+import pytest
+
+from movie.utility import constant, data_util
+from movie.utility.poster_util import decode_poster, encode_poster
+from movie.utility.snapshot_util import CatalogOverlay
+
+"""
+Tests for the pickled snapshot sidecar written next to a catalog file.
+"""
+
+
+def fetch_cold(file_path):
+    data_util.cached_data.pop(file_path, None)
+    return data_util.fetch_data(file_path)
+
+
+def refuse_to_parse(file_path, progress=None):
+    raise AssertionError("The catalog was parsed instead of the sidecar.")
+
+
+def test_sidecar_written_after_load(file_path):
+    data_util.fetch_data(file_path)
+
+    assert data_util.get_sidecar_path(file_path).exists()
+
+
+def test_warm_load_uses_sidecar(file_path, catalog, monkeypatch):
+    data_util.fetch_data(file_path)
+    monkeypatch.setattr(data_util, "load_data", refuse_to_parse)
+
+    assert fetch_cold(file_path)[constant.PAYLOAD] == catalog
+
+
+def test_stale_sidecar_is_ignored(file_path):
+    data_util.fetch_data(file_path)
+    file_path.write_text(json.dumps({"Venom": {"rating": 6.6,
+                                               "year": 2018}}))
+
+    assert list(fetch_cold(file_path)[constant.PAYLOAD]) == ["Venom"]
+
+
+def test_corrupt_sidecar_is_ignored(file_path, catalog):
+    data_util.get_sidecar_path(file_path).write_bytes(b"not a pickle")
+
+    assert fetch_cold(file_path)[constant.PAYLOAD] == catalog
+
+
+def test_sidecar_follows_writes(file_path, monkeypatch):
+    overlay = CatalogOverlay(data_util.fetch_data(file_path)[
+                                 constant.PAYLOAD])
+    overlay.remove("Titanic")
+    data_util.publish_data(overlay, file_path)
+    monkeypatch.setattr(data_util, "load_data", refuse_to_parse)
+
+    assert list(fetch_cold(file_path)[constant.PAYLOAD]) == ["Joker"]
+
+
+@pytest.mark.parametrize("poster", [
+    "https://m.media-amazon.com/images/M/MV5BMjA@._V1_SX300.jpg",
+    "https://ia.media-imdb.com/images/M/MV5BMjA.png",
+    "https://example.com/poster._V1_SX300.jpg",
+    "https://m.media-amazon.com/images/M/", "N/A", ""])
+def test_poster_encoding_is_lossless(poster):
+    assert decode_poster(*encode_poster(poster)) == poster
+
+
+def test_sidecar_stores_posters_without_prefix_and_suffix(tmp_path,
+                                                          monkeypatch):
+    posters = {"Titanic": {"rating": 7.9, "year": 1997,
+                           "poster": "https://m.media-amazon.com/images/M/"
+                                     "MV5BMDdm._V1_SX300.jpg"},
+               "Jaws": {"rating": 8.1, "year": 1975, "poster": "N/A"},
+               "Venom": {"rating": 6.6, "year": 2018}}
+    file_path = tmp_path / "poster_data.json"
+    file_path.write_text(json.dumps(posters))
+    data_util.fetch_data(file_path)
+
+    with open(data_util.get_sidecar_path(file_path), "rb") as handle:
+        _, _, payload = pickle.load(handle)
+    assert payload["Titanic"]["poster"] == "MV5BMDdm"
+
+    monkeypatch.setattr(data_util, "load_data", refuse_to_parse)
+    loaded = fetch_cold(file_path)[constant.PAYLOAD]
+    assert loaded == posters
+    assert list(loaded["Titanic"]) == list(posters["Titanic"])
+
+
+def test_sidecar_of_previous_layout_is_ignored(file_path, catalog):
+    data_util.fetch_data(file_path)
+    signature = data_util.get_file_signature(file_path)
+    with open(data_util.get_sidecar_path(file_path), "wb") as handle:
+        pickle.dump((signature, {"Venom": {"rating": 6.6, "year": 2018}}),
+                    handle)
+
+    assert fetch_cold(file_path)[constant.PAYLOAD] == catalog
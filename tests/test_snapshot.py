@@ -0,0 +1,54 @@
+import gc
+import weakref
+
+import pytest
+
+from movie.utility import constant
+
+"""
+Tests for the copy-on-write catalog snapshots handed out to readers.
+"""
+
+
+def test_readers_keep_their_version(storage):
+    before = storage.list_movies()[constant.PAYLOAD]
+
+    storage.add_movie("Spider Man", "2009", "9.0", "", "", "tt0145487")
+    storage.update_movie("Titanic", "8.5")
+
+    after = storage.list_movies()[constant.PAYLOAD]
+
+    assert list(before) == ["Titanic", "Joker"]
+    assert before["Titanic"][constant.RATING_KEY] == 7.9
+    assert after["Titanic"][constant.RATING_KEY] == 8.5
+    assert after.version == before.version + 2
+
+
+def test_unchanged_entries_are_shared(storage):
+    before = storage.list_movies()[constant.PAYLOAD]
+
+    storage.add_movie("Spider Man", "2009", "9.0", "", "", "tt0145487")
+
+    after = storage.list_movies()[constant.PAYLOAD]
+    assert after["Titanic"] is before["Titanic"]
+
+
+def test_snapshot_is_read_only(storage):
+    snapshot = storage.list_movies()[constant.PAYLOAD]
+
+    with pytest.raises(TypeError):
+        snapshot["Venom"] = {}
+    with pytest.raises(TypeError):
+        del snapshot["Titanic"]
+
+
+def test_old_versions_are_released(storage):
+    snapshot = storage.list_movies()[constant.PAYLOAD]
+    reference = weakref.ref(snapshot)
+
+    storage.add_movie("Spider Man", "2009", "9.0", "", "", "tt0145487")
+    assert reference() is snapshot
+
+    del snapshot
+    gc.collect()
+    assert reference() is None
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+"""
+Cold-start guards for the command-line application.
+
+`python -X importtime` reports the cumulative import time of every module.
+Starting the application must not load the network stack or modules only
+needed by single commands, and must stay within a fixed time budget.
+"""
+
+PROJECT_DIRECTORY = Path(__file__).parent.parent
+
+IMPORT_BUDGET_US = 150_000
+
+DEFERRED_MODULES = ["requests", "dotenv", "json", "csv", "statistics",
+                    "tempfile", "random"]
+
+
+def get_import_times(module: str) -> dict:
+    result = subprocess.run([sys.executable, "-X", "importtime",
+                             "-c", f"import {module}"],
+                            cwd=PROJECT_DIRECTORY, capture_output=True,
+                            text=True, check=True)
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+@pytest.mark.parametrize("module", ["main", "movie_app"])
+def test_startup_defers_heavy_modules(module):
+    import_times = get_import_times(module)
+
+    assert module in import_times
+    assert [deferred for deferred in DEFERRED_MODULES
+            if deferred in import_times] == []
+
+
+def test_startup_within_budget():
+    import_times = get_import_times("main")
+
+    print(f"\nimport main: {import_times['main'] / 1000:.1f} ms")
+    assert import_times["main"] < IMPORT_BUDGET_US
+
+
+def test_api_key_is_memoized(monkeypatch):
+    pytest.importorskip("dotenv")
+    from movie.utility import api_util
+
+    api_util.get_key.cache_clear()
+    monkeypatch.setenv("key", "first")
+    assert api_util.get_key() == "first"
+
+    monkeypatch.setenv("key", "second")
+    assert api_util.get_key() == "first"
+    api_util.get_key.cache_clear()
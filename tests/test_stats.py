@@ -0,0 +1,151 @@
+import random
+import statistics
+
+import pytest
+
+from movie.storage.storage_json import StorageJson
+from movie.utility import constant
+from movie.utility.snapshot_util import CatalogSnapshot
+from movie.utility.stats_util import YearBuckets, catalog_stats, \
+    file_stats, group_movies
+
+"""
+Tests for the single-pass extended statistics.
+"""
+
+
+def build_catalog(rows, seed=1):
+    rng = random.Random(seed)
+    return {f"Movie {index}": {"rating": round(rng.uniform(1, 10), 1),
+                               "year": rng.randint(1990, 1999),
+                               "poster": "", "notes": "", "imdbid": ""}
+            for index in range(rows)}
+
+
+@pytest.fixture()
+def catalog():
+    return build_catalog(300)
+
+
+@pytest.mark.parametrize("rows", [1, 2, 7, 500])
+def test_report_matches_statistics_module(rows):
+    catalog = build_catalog(rows)
+    ratings = [entry["rating"] for entry in catalog.values()]
+    report = catalog_stats(catalog)
+
+    assert report[constant.STATS_COUNT] == rows
+    assert report[constant.STATS_MEAN] == statistics.mean(ratings)
+    assert report[constant.STATS_MEDIAN] == statistics.median(ratings)
+    assert report[constant.STATS_MIN] == min(ratings)
+    assert report[constant.STATS_MAX] == max(ratings)
+    assert report[constant.BEST_MOVIE] == [
+        title for title, entry in catalog.items()
+        if entry["rating"] == max(ratings)]
+    if rows > 1:
+        assert report[constant.STATS_STD_DEV] == pytest.approx(
+            statistics.stdev(ratings))
+        cuts = statistics.quantiles(ratings, n=20, method="inclusive")
+        for percent, rating in report[constant.STATS_PERCENTILES].items():
+            assert rating == pytest.approx(cuts[percent // 5 - 1])
+    else:
+        assert report[constant.STATS_VARIANCE] is None
+
+    histogram = report[constant.STATS_HISTOGRAM]
+    assert len(histogram) == constant.STATS_HISTOGRAM_BUCKETS
+    assert sum(count for low, high, count in histogram) == rows
+    assert all(sum(1 for rating in ratings
+                   if low <= rating < high or rating == high == 10) == count
+               for low, high, count in histogram)
+    assert report[constant.STATS_YEARS] == {
+        year: sum(1 for entry in catalog.values() if entry["year"] == year)
+        for year in sorted({entry["year"] for entry in catalog.values()})}
+
+
+def test_empty_catalog():
+    report = catalog_stats({})
+    assert report[constant.STATS_COUNT] == 0
+    assert report[constant.STATS_MEAN] is None
+    assert report[constant.STATS_MEDIAN] is None
+    assert report[constant.BEST_MOVIE] == []
+
+
+@pytest.mark.parametrize("storage_format", ["csv", "json", "jsonl"])
+def test_streamed_file_matches_catalog(storage, file_path, catalog):
+    assert file_stats(file_path) == catalog_stats(catalog)
+
+    result = storage.stats_movie()
+    assert result[constant.PAYLOAD][5] == catalog_stats(catalog)
+    assert result[constant.PAYLOAD][0] == statistics.mean(
+        entry["rating"] for entry in catalog.values())
+    assert storage.stats_file()[constant.PAYLOAD] == catalog_stats(catalog)
+
+
+def test_stats_file_reports_missing_file(tmp_path):
+    result = StorageJson(tmp_path / "missing.json").stats_file()
+    assert not result[constant.RESULT]
+
+
+def group_by_scan(catalog, key):
+    groups = {}
+    for entry in catalog.values():
+        if key == constant.GROUP_YEAR:
+            group = entry["year"]
+        elif key == constant.GROUP_DECADE:
+            group = entry["year"] // 10 * 10
+        else:
+            group = float(min(int(entry["rating"]), 9))
+        groups.setdefault(group, []).append(entry["rating"])
+    return {group: {constant.STATS_COUNT: len(ratings),
+                    constant.STATS_MEAN: statistics.mean(ratings),
+                    constant.STATS_MIN: min(ratings),
+                    constant.STATS_MAX: max(ratings),
+                    constant.STATS_MEDIAN: statistics.median(ratings)}
+            for group, ratings in sorted(groups.items())}
+
+
+@pytest.mark.parametrize("key", constant.GROUP_KEYS)
+def test_group_movies_matches_a_scan(key):
+    catalog = build_catalog(400)
+    for index, entry in enumerate(catalog.values()):
+        entry["year"] = 1950 + index % 60
+    assert group_movies(catalog, key) == group_by_scan(catalog, key)
+
+
+def test_year_buckets_are_carried_over_to_evolved_snapshots():
+    rng = random.Random(9)
+    catalog = build_catalog(200)
+    snapshot = CatalogSnapshot(catalog, 1)
+    group_movies(snapshot, constant.GROUP_DECADE)
+
+    for _ in range(20):
+        changes = {f"Movie {rng.randint(0, 250)}": {
+            "rating": round(rng.uniform(1, 10), 1),
+            "year": rng.randint(1990, 2005)} for _ in range(3)}
+        deletions = tuple(title for title in rng.sample(list(snapshot), 2)
+                          if title not in changes)
+        snapshot = snapshot.evolve(changes, deletions)
+
+        assert snapshot.derive("year buckets", None) == YearBuckets(snapshot)
+        for key in constant.GROUP_KEYS:
+            assert group_movies(snapshot, key) == group_by_scan(snapshot, key)
+
+
+def test_storage_group_movies(storage, catalog):
+    result = storage.group_movies(constant.GROUP_YEAR,
+                                  (constant.STATS_COUNT,))
+    assert result[constant.PAYLOAD] == {
+        year: {constant.STATS_COUNT: counts[constant.STATS_COUNT]}
+        for year, counts in group_by_scan(catalog,
+                                          constant.GROUP_YEAR).items()}
+
+    storage.add_movie("Alien", "1979", "8.5", "", "", "tt0078748")
+    groups = storage.group_movies(constant.GROUP_DECADE)[constant.PAYLOAD]
+    assert groups[1970] == {constant.STATS_COUNT: 1, constant.STATS_MEAN: 8.5,
+                            constant.STATS_MIN: 8.5, constant.STATS_MAX: 8.5,
+                            constant.STATS_MEDIAN: 8.5}
+    assert storage.stats_movie()[constant.PAYLOAD][5][
+        constant.STATS_DECADES] == groups
+
+    assert not storage.group_movies("genre")[constant.RESULT]
+    assert not storage.group_movies(constant.GROUP_YEAR,
+                                    ("mode",))[constant.RESULT]
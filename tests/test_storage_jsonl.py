@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from movie.utility import constant, data_util
+
+"""
+Tests for the append-only JSON Lines storage backend.
+"""
+
+
+@pytest.fixture()
+def catalog(catalog):
+    return {"Titanic": catalog["Titanic"]}
+
+
+@pytest.fixture()
+def storage_format():
+    return "jsonl"
+
+
+def read_lines(file_path):
+    return [json.loads(line) for line in file_path.read_text().splitlines()]
+
+
+def fetch_cold(file_path):
+    data_util.cached_data.pop(file_path, None)
+    data_util.get_sidecar_path(file_path).unlink(missing_ok=True)
+    return data_util.fetch_data(file_path)[constant.PAYLOAD]
+
+
+def test_mutations_append_one_line_each(storage, file_path):
+
+    storage.add_movie("Spider Man", "2009", "9.0", "", "", "tt0145487")
+    storage.update_movie("Titanic", "8.5")
+    storage.delete_movie("Spider Man")
+
+    lines = read_lines(file_path)
+    assert len(lines) == 4
+    assert lines[1]["title"] == "Spider Man"
+    assert lines[2] == {"title": "Titanic", "rating": 8.5, "year": 1997,
+                        "poster": "", "notes": "", "imdbid": "tt0120338"}
+    assert lines[3] == {"title": "Spider Man", "deleted": True}
+
+
+def test_replay_applies_overrides_and_tombstones(storage, file_path):
+    storage.add_movie("Spider Man", "2009", "9.0", "", "", "tt0145487")
+    storage.update_movie("Titanic", "8.5")
+    storage.delete_movie("Spider Man")
+
+    payload = fetch_cold(file_path)
+
+    assert list(payload) == ["Titanic"]
+    assert payload["Titanic"][constant.RATING_KEY] == 8.5
+
+
+def test_interrupted_append_is_ignored(file_path):
+    with open(file_path, "a") as handle:
+        handle.write('{"title": "Venom", "rat')
+
+    assert list(fetch_cold(file_path)) == ["Titanic"]
+
+
+def test_compaction_rewrites_live_movies(storage, file_path, monkeypatch):
+    monkeypatch.setattr(constant, "JSONL_COMPACTION_MIN_LINES", 4)
+    storage.list_movies()
+
+    for rating in ("1.0", "2.0", "3.0", "4.0"):
+        storage.update_movie("Titanic", rating)
+
+    lines = read_lines(file_path)
+    assert len(lines) < 5
+    assert lines[-1]["rating"] == 4.0
+    assert fetch_cold(file_path)["Titanic"][constant.RATING_KEY] == 4.0
+
+
+def test_tail_returns_only_new_changes(storage, file_path):
+    first = storage.tail_movies()[constant.PAYLOAD]
+
+    storage.add_movie("Spider Man", "2009", "9.0", "", "", "tt0145487")
+    storage.delete_movie("Titanic")
+    second = storage.tail_movies(first[constant.TAIL_OFFSET],
+                                 first[constant.TAIL_FILE_ID])[
+        constant.PAYLOAD]
+
+    assert [title for title, _ in first[constant.TAIL_CHANGES]] == [
+        "Titanic"]
+    assert second[constant.TAIL_CHANGES][0][0] == "Spider Man"
+    assert second[constant.TAIL_CHANGES][1] == ("Titanic", None)
+    assert not second[constant.TAIL_RESET]
+
+
+def test_tail_skips_incomplete_line(file_path):
+    with open(file_path, "a") as handle:
+        handle.write('{"title": "Venom"')
+
+    tail = data_util.tail_data(file_path)[constant.PAYLOAD]
+
+    assert len(tail[constant.TAIL_CHANGES]) == 1
+    assert tail[constant.TAIL_OFFSET] == file_path.read_text().index("{", 1)
+
+
+def test_tail_restarts_after_compaction(storage, file_path, monkeypatch):
+    monkeypatch.setattr(constant, "JSONL_COMPACTION_MIN_LINES", 2)
+    storage.list_movies()
+    storage.add_movie("Spider Man", "2009", "9.0", "", "", "tt0145487")
+    first = storage.tail_movies()[constant.PAYLOAD]
+
+    for rating in ("8.4", "8.5", "8.6"):
+        storage.update_movie("Titanic", rating)
+    second = storage.tail_movies(first[constant.TAIL_OFFSET],
+                                 first[constant.TAIL_FILE_ID])[
+        constant.PAYLOAD]
+
+    assert second[constant.TAIL_RESET]
+    assert dict(second[constant.TAIL_CHANGES])["Titanic"][
+        constant.RATING_KEY] == 8.6
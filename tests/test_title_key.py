@@ -0,0 +1,62 @@
+import pytest
+
+from movie.data import movie_storage
+from movie.utility import constant, misc_util
+from movie.utility.snapshot_util import CatalogSnapshot
+
+"""
+Tests for looking movies up by their normalized title.
+"""
+
+
+@pytest.fixture()
+def catalog():
+    return {"Finding Nemo": {"rating": 8.2, "year": 2003, "poster": "",
+                             "notes": "", "imdbid": "tt0266543"},
+            "Titanic": {"rating": 7.9, "year": 1997, "poster": "",
+                        "notes": "", "imdbid": "tt0120338"}}
+
+
+@pytest.mark.parametrize("title", ["finding nemo", "  FINDING\tnemo ",
+                                   "Ｆｉｎｄｉｎｇ Ｎｅｍｏ"])
+def test_normalize_title(title):
+    assert misc_util.normalize_title(title) == "finding nemo"
+
+
+def test_every_method_uses_the_normalized_title(storage):
+    assert storage.find_movie("finding nemo")[constant.RESULT]
+    assert storage.update_movie("FINDING  NEMO", "9.0")[constant.RESULT]
+    assert storage.list_movies()[constant.PAYLOAD]["Finding Nemo"][
+               constant.RATING_KEY] == 9.0
+    assert len(storage.search_movie("NEMO")[constant.PAYLOAD]) == 1
+    assert storage.delete_movie("finding nemo")[constant.RESULT]
+    assert list(storage.list_movies()[constant.PAYLOAD]) == ["Titanic"]
+
+
+def test_unknown_title_fails_without_key_error(storage):
+    assert not storage.update_movie("Venom", "9.0")[constant.RESULT]
+    assert not storage.delete_movie("Venom")[constant.RESULT]
+    assert not storage.find_movie("Venom")[constant.RESULT]
+
+
+def test_same_normalized_title_is_rejected(storage):
+    result = storage.add_movie("titanic", "1997", "7.9", "", "", "")
+
+    assert not result[constant.RESULT]
+    assert len(storage.list_movies()[constant.PAYLOAD]) == 2
+
+
+def test_title_index_follows_evolve(catalog):
+    snapshot = CatalogSnapshot(catalog, 1)
+    assert snapshot.resolve_title("TITANIC") == "Titanic"
+
+    snapshot = snapshot.evolve({"Venom": catalog["Titanic"]}, ("Titanic",))
+
+    assert snapshot.resolve_title("titanic") is None
+    assert snapshot.resolve_title("venom") == "Venom"
+
+
+@pytest.mark.parametrize("storage_format", ["csv"])
+def test_cold_lookup_uses_the_normalized_title(file_path, catalog):
+    assert movie_storage.find_movie(" finding NEMO", file_path)[
+               constant.PAYLOAD] == catalog["Finding Nemo"]
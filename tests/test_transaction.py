@@ -0,0 +1,128 @@
+import json
+import threading
+
+import pytest
+
+from movie.utility import constant, data_util
+from movie.utility.snapshot_util import CatalogSnapshot
+
+"""
+Tests for grouping changes into transactions.
+"""
+
+
+@pytest.fixture()
+def storage(storage):
+    storage.list_movies()
+    return storage
+
+
+def stored(storage):
+    return json.loads(storage.get_file_path().read_text())
+
+
+def test_commit_writes_once(storage, catalog, monkeypatch):
+    writes = []
+    write_data = data_util.write_data
+    monkeypatch.setattr(data_util, "write_data", lambda details, file_path: (
+            writes.append(file_path) or write_data(details, file_path)))
+
+    with storage.transaction() as transaction:
+        storage.delete_movie("Titanic")
+        storage.update_movie("joker", "9.0")
+        storage.add_movie("Venom", "2018", "6.6", "", "", "tt1270797")
+        assert stored(storage) == catalog
+
+    assert transaction.result[constant.RESULT]
+    assert len(writes) == 1
+    assert list(stored(storage)) == ["Joker", "Venom"]
+    assert stored(storage)["Joker"][constant.RATING_KEY] == 9.0
+
+
+def test_reads_see_own_changes(storage):
+    with storage.transaction():
+        storage.add_movie("Venom", "2018", "6.6", "", "", "tt1270797")
+        storage.delete_movie("Titanic")
+
+        assert storage.find_movie("venom")[constant.RESULT]
+        assert not storage.find_movie("Titanic")[constant.RESULT]
+        assert list(storage.list_movies()[constant.PAYLOAD]) == [
+            "Joker", "Venom"]
+        assert not storage.add_movie("VENOM", "2018", "6.6", "", "",
+                                     "")[constant.RESULT]
+
+
+def test_exception_rolls_back(storage, catalog):
+    before = storage.list_movies()[constant.PAYLOAD]
+
+    with pytest.raises(RuntimeError):
+        with storage.transaction() as transaction:
+            storage.delete_movie("Titanic")
+            raise RuntimeError()
+
+    assert transaction.result[constant.RESULT]
+    assert stored(storage) == catalog
+    assert storage.list_movies()[constant.PAYLOAD] is before
+
+
+def test_discard_rolls_back(storage, catalog):
+    with storage.transaction() as transaction:
+        storage.delete_movie("Titanic")
+        transaction.discard()
+
+    assert stored(storage) == catalog
+
+
+def test_other_threads_read_the_previous_version(storage):
+    seen = []
+
+    with storage.transaction():
+        storage.delete_movie("Titanic")
+        reader = threading.Thread(target=lambda: seen.append(
+            list(storage.list_movies()[constant.PAYLOAD])))
+        reader.start()
+        reader.join()
+
+    assert seen == [["Titanic", "Joker"]]
+
+
+def test_nested_transaction_joins(storage, catalog):
+    with storage.transaction() as outer:
+        with storage.transaction() as inner:
+            storage.delete_movie("Titanic")
+        assert inner is outer
+        assert stored(storage) == catalog
+
+    assert list(stored(storage)) == ["Joker"]
+
+
+def test_failed_commit_raises(storage, catalog, monkeypatch):
+    monkeypatch.setattr(data_util, "write_data", lambda details, file_path: (
+        {constant.RESULT: False, constant.MESSAGE: "disk full",
+         constant.PAYLOAD: ""}))
+
+    with pytest.raises(OSError, match="disk full"):
+        with storage.transaction() as transaction:
+            storage.delete_movie("Titanic")
+
+    assert not transaction.result[constant.RESULT]
+    assert stored(storage) == catalog
+    assert "Titanic" in storage.list_movies()[constant.PAYLOAD]
+
+
+@pytest.mark.parametrize("storage_format", ["jsonl"])
+def test_transaction_does_not_copy_the_catalog(storage, file_path,
+                                               monkeypatch):
+    snapshot = storage.list_movies()[constant.PAYLOAD]
+    storage.add_movie("Alien", "1979", "8.5", "", "", "tt0078748")
+    monkeypatch.setattr(CatalogSnapshot, "evolve", None)
+
+    with storage.transaction() as transaction:
+        storage.delete_movie("Titanic")
+        storage.add_movie("Venom", "2018", "6.6", "", "", "tt1270797")
+
+    assert transaction.result[constant.RESULT]
+    assert data_util.cached_data[file_path][constant.PAYLOAD] is snapshot
+    monkeypatch.undo()
+    assert list(storage.list_movies()[constant.PAYLOAD]) == [
+        "Joker", "Alien", "Venom"]